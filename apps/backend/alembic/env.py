@@ -12,7 +12,7 @@ load_dotenv()
 
 # Importar os models para autogenerate
 from adapters.database import Base
-from adapters.database.models import UserModel  # noqa: F401
+from adapters.database.models import UserModel, UserSignupDailyModel  # noqa: F401
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,42 @@
+"""add_user_signup_daily_rollup
+
+Revision ID: 3f9a1c7e5b20
+Revises: d2d7ce985f39
+Create Date: 2026-10-18 09:12:41.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c7e5b20'
+down_revision: Union[str, Sequence[str], None] = 'd2d7ce985f39'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the daily signup rollup and backfill it from users."""
+    op.create_table(
+        'user_signup_daily',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('role', sa.String(length=50), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('day', 'role'),
+    )
+    op.execute(
+        """
+        INSERT INTO user_signup_daily (day, role, count)
+        SELECT date(created_at), role, count(*)
+        FROM users
+        GROUP BY date(created_at), role
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop the daily signup rollup."""
+    op.drop_table('user_signup_daily')
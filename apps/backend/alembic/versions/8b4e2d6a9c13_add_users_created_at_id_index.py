@@ -0,0 +1,29 @@
+"""add_users_created_at_id_index
+
+Revision ID: 8b4e2d6a9c13
+Revises: 3f9a1c7e5b20
+Create Date: 2026-10-18 10:04:17.553920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b4e2d6a9c13'
+down_revision: Union[str, Sequence[str], None] = '3f9a1c7e5b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the (created_at, id) index used by keyset pagination."""
+    op.create_index(
+        'ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Drop the keyset pagination index."""
+    op.drop_index('ix_users_created_at_id', table_name='users')
@@ -0,0 +1,37 @@
+"""add_users_list_filter_indexes
+
+Revision ID: a6e2f9b4c318
+Revises: f1c8d3a5b742
+Create Date: 2026-10-18 18:05:44.120836
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6e2f9b4c318'
+down_revision: Union[str, Sequence[str], None] = 'f1c8d3a5b742'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    'ix_users_role_created_at_id': ['role', 'created_at', 'id'],
+    'ix_users_name_id': ['name', 'id'],
+    'ix_users_role_name_id': ['role', 'name', 'id'],
+    'ix_users_role_email': ['role', 'email'],
+    'ix_users_birth_date': ['birth_date'],
+}
+
+
+def upgrade() -> None:
+    """Add the indexes behind the list filters and sort orders."""
+    for name, columns in INDEXES.items():
+        op.create_index(name, 'users', columns, unique=False)
+
+
+def downgrade() -> None:
+    """Drop the list filter and sort indexes."""
+    for name in INDEXES:
+        op.drop_index(name, table_name='users')
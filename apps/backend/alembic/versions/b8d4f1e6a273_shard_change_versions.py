@@ -0,0 +1,46 @@
+"""shard_change_versions
+
+Revision ID: b8d4f1e6a273
+Revises: a6e2f9b4c318
+Create Date: 2026-10-18 20:12:09.318274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d4f1e6a273'
+down_revision: Union[str, Sequence[str], None] = 'a6e2f9b4c318'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Split each change counter into shards; the current value stays in shard 0."""
+    op.add_column(
+        'change_versions',
+        sa.Column('shard', sa.SmallInteger(), nullable=False, server_default='0'),
+    )
+    op.drop_constraint('change_versions_pkey', 'change_versions', type_='primary')
+    op.create_primary_key('change_versions_pkey', 'change_versions', ['name', 'shard'])
+
+
+def downgrade() -> None:
+    """Fold the shards back into a single row per counter."""
+    op.execute(
+        "INSERT INTO change_versions (name, shard, version) "
+        "SELECT DISTINCT name, 0, 0 FROM change_versions "
+        "ON CONFLICT (name, shard) DO NOTHING"
+    )
+    op.execute(
+        "UPDATE change_versions AS c SET version = ("
+        "SELECT SUM(s.version) FROM change_versions AS s WHERE s.name = c.name"
+        ") WHERE c.shard = 0"
+    )
+    op.execute("DELETE FROM change_versions WHERE shard <> 0")
+    op.drop_constraint('change_versions_pkey', 'change_versions', type_='primary')
+    op.create_primary_key('change_versions_pkey', 'change_versions', ['name'])
+    op.drop_column('change_versions', 'shard')
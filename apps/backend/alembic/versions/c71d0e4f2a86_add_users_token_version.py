@@ -0,0 +1,31 @@
+"""add_users_token_version
+
+Revision ID: c71d0e4f2a86
+Revises: 8b4e2d6a9c13
+Create Date: 2026-10-18 11:21:53.019472
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71d0e4f2a86'
+down_revision: Union[str, Sequence[str], None] = '8b4e2d6a9c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the token version used to revoke claims-carrying access tokens."""
+    op.add_column(
+        'users',
+        sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+
+def downgrade() -> None:
+    """Drop the token version column."""
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,34 @@
+"""add_change_versions
+
+Revision ID: e4b7a2c9d851
+Revises: c71d0e4f2a86
+Create Date: 2026-10-18 16:02:37.514209
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b7a2c9d851'
+down_revision: Union[str, Sequence[str], None] = 'c71d0e4f2a86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the per-table change counter used by list ETags."""
+    op.create_table(
+        'change_versions',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('name'),
+    )
+    op.execute("INSERT INTO change_versions (name, version) VALUES ('users', 0)")
+
+
+def downgrade() -> None:
+    """Drop the change counter."""
+    op.drop_table('change_versions')
@@ -0,0 +1,55 @@
+"""add_users_search_trigram_indexes
+
+Revision ID: f1c8d3a5b742
+Revises: e4b7a2c9d851
+Create Date: 2026-10-18 17:21:08.307415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c8d3a5b742'
+down_revision: Union[str, Sequence[str], None] = 'e4b7a2c9d851'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ('name', 'email')
+
+
+def upgrade() -> None:
+    """Add pg_trgm GIN indexes on name and email for user search.
+
+    PostgreSQL only; built concurrently so the users table stays writable.
+    """
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    with op.get_context().autocommit_block():
+        for column in COLUMNS:
+            op.create_index(
+                f'ix_users_{column}_trgm',
+                'users',
+                [column],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Drop the search indexes (the pg_trgm extension is kept)."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    with op.get_context().autocommit_block():
+        for column in COLUMNS:
+            op.drop_index(
+                f'ix_users_{column}_trgm',
+                table_name='users',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,136 @@
+"""Vazão do stack síncrono vs. assíncrono sob alta concorrência.
+
+Sobe a API com uvicorn numa thread, uma vez com as rotas sync (threadpool)
+e outra com ASYNC_API, e dispara muitas requisições concorrentes de
+GET /api/users/{id} a partir de um único event loop:
+
+    PYTHONPATH=src python benchmarks/bench_async_stack.py --sqlite /tmp/bench.db
+
+Sem --sqlite, usa o DATABASE_URL (e ASYNC_DATABASE_URL) configurado.
+"""
+
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+
+import httpx
+import uvicorn
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from adapters import Base, get_async_db, get_db
+from api.main import create_app
+
+
+def _use_sqlite(app, path: str, pool_size: int) -> None:
+    # Mesmo tamanho de pool nos dois engines, para comparar só o modelo de I/O
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        pool_size=pool_size,
+    )
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    async_session_factory = async_sessionmaker(
+        create_async_engine(f"sqlite+aiosqlite:///{path}", pool_size=pool_size),
+        expire_on_commit=False,
+    )
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with async_session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+
+
+async def _load(base_url: str, args) -> None:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, timeout=60, limits=limits
+    ) as client:
+        credentials = {"email": "bench@example.com", "password": "benchpass123"}
+        await client.post(
+            "/api/auth/register",
+            json={"name": "Bench", "role": "admin", **credentials},
+        )
+        tokens = (await client.post("/api/auth/login", json=credentials)).json()
+        headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+        path = f"/api/users/{tokens['user']['id']}"
+
+        latencies: list[float] = []
+        errors = 0
+        deadline = time.perf_counter() + args.duration
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path, headers=headers)
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                if response.status_code != 200:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{len(latencies) / elapsed:8.0f} req/s  "
+        f"p50={statistics.median(latencies) * 1000:7.1f} ms  "
+        f"p99={p99 * 1000:7.1f} ms  erros={errors}"
+    )
+
+
+def _run(async_api: bool, port: int, args) -> None:
+    app = create_app(async_api=async_api)
+    if args.sqlite:
+        _use_sqlite(app, args.sqlite, args.pool_size)
+    server = uvicorn.Server(
+        uvicorn.Config(app, port=port, log_level="warning", access_log=False)
+    )
+    server_thread = threading.Thread(target=server.run, daemon=True)
+    server_thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    label = "async" if async_api else "sync"
+    print(f"{label:>6} ({args.concurrency} clientes): ", end="", flush=True)
+    asyncio.run(_load(f"http://127.0.0.1:{port}", args))
+    server.should_exit = True
+    server_thread.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--sqlite", metavar="PATH")
+    parser.add_argument("--pool-size", type=int, default=40)
+    args = parser.parse_args()
+
+    _run(False, args.port, args)
+    _run(True, args.port + 1, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Resolução de uma lista de ids: um GET por id vs. POST /api/users/batch-get.
+
+Popula a tabela com usuários sintéticos, sobe a API com uvicorn numa thread
+e resolve repetidamente listas de ids aleatórios das duas formas, medindo o
+tempo por lista e por usuário:
+
+    PYTHONPATH=src python benchmarks/bench_batch_get.py --sqlite /tmp/batch.db
+
+Sem --sqlite, usa o DATABASE_URL configurado (as tabelas são recriadas).
+"""
+
+import argparse
+import random
+import statistics
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+import uvicorn
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from adapters import Base, UserModel, engine, get_db
+from api.main import app
+
+
+def _database(path: str | None):
+    if not path:
+        return engine
+    bind = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=bind)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    return bind
+
+
+def _populate(bind, rows: int) -> list[str]:
+    Base.metadata.drop_all(bind=bind)
+    Base.metadata.create_all(bind=bind)
+    start = datetime(2020, 1, 1)
+    ids = [uuid.uuid4() for _ in range(rows)]
+    with bind.begin() as conn:
+        conn.execute(
+            insert(UserModel),
+            [
+                {
+                    "id": user_id,
+                    "name": f"User {i}",
+                    "email": f"user{i}@example.com",
+                    "password_hash": "x" * 60,
+                    "role": "user",
+                    "created_at": start + timedelta(seconds=i),
+                    "token_version": 0,
+                }
+                for i, user_id in enumerate(ids)
+            ],
+        )
+    return [str(user_id) for user_id in ids]
+
+
+def _report(label: str, timings: list[float], size: int) -> None:
+    median = statistics.median(timings)
+    print(
+        f"{label:>10} ({size} ids): {median * 1000:8.1f} ms/lista  "
+        f"{median / size * 1e6:8.0f} µs/usuário"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8769)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--sqlite", metavar="PATH")
+    args = parser.parse_args()
+
+    ids = _populate(_database(args.sqlite), args.rows)
+    server = uvicorn.Server(
+        uvicorn.Config(app, port=args.port, log_level="warning", access_log=False)
+    )
+    server_thread = threading.Thread(target=server.run, daemon=True)
+    server_thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    with httpx.Client(base_url=f"http://127.0.0.1:{args.port}", timeout=60) as c:
+        credentials = {"email": "admin@example.com", "password": "adminpass123"}
+        c.post("/api/auth/register", json={"name": "A", "role": "admin", **credentials})
+        token = c.post("/api/auth/login", json=credentials).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        per_id: list[float] = []
+        batch: list[float] = []
+        for _ in range(args.rounds):
+            # Amostras disjuntas: o cache de entidades não favorece nenhum lado
+            sample = random.sample(ids, args.size * 2)
+            started = time.perf_counter()
+            for user_id in sample[args.size :]:
+                c.get(f"/api/users/{user_id}", headers=headers).raise_for_status()
+            per_id.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            response = c.post(
+                "/api/users/batch-get",
+                json={"ids": sample[: args.size]},
+                headers=headers,
+            )
+            assert len(response.json()["users"]) == args.size
+            batch.append(time.perf_counter() - started)
+
+    _report("por id", per_id, args.size)
+    _report("batch-get", batch, args.size)
+    print(f"{'ganho':>10}: {statistics.median(per_id) / statistics.median(batch):.1f}x")
+
+    server.should_exit = True
+    server_thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Importação de usuários: POST /api/users um a um vs. POST /api/users/bulk.
+
+Sobe a API com uvicorn numa thread e cadastra o mesmo volume de usuários
+pelos dois caminhos. Use um custo baixo de bcrypt para isolar o custo de
+banco e de requisição, ou o custo real para ver o hashing em paralelo:
+
+    PASSWORD_HASH_BCRYPT_ROUNDS=4 PYTHONPATH=src \\
+        python benchmarks/bench_bulk_import.py --sqlite /tmp/bench.db
+
+Sem --sqlite, usa o DATABASE_URL configurado (as tabelas são recriadas).
+"""
+
+import argparse
+import json
+import threading
+import time
+
+import httpx
+import uvicorn
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from adapters import Base, engine, get_db, settings
+from api.main import app
+
+
+def _reset_database(path: str | None) -> None:
+    bind = engine
+    if path:
+        bind = create_engine(
+            f"sqlite:///{path}", connect_args={"check_same_thread": False}
+        )
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=bind)
+
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+    Base.metadata.drop_all(bind=bind)
+    Base.metadata.create_all(bind=bind)
+
+
+def _user(prefix: str, i: int) -> dict:
+    return {
+        "name": f"User {i}",
+        "email": f"{prefix}{i}@example.com",
+        "password": "benchpass123",
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--sqlite", metavar="PATH")
+    args = parser.parse_args()
+
+    _reset_database(args.sqlite)
+    server = uvicorn.Server(
+        uvicorn.Config(app, port=args.port, log_level="warning", access_log=False)
+    )
+    server_thread = threading.Thread(target=server.run, daemon=True)
+    server_thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    with httpx.Client(base_url=f"http://127.0.0.1:{args.port}", timeout=600) as c:
+        credentials = {"email": "admin@example.com", "password": "adminpass123"}
+        c.post("/api/auth/register", json={"name": "A", "role": "admin", **credentials})
+        token = c.post("/api/auth/login", json=credentials).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        started = time.perf_counter()
+        for i in range(args.users):
+            c.post("/api/users", json=_user("single", i), headers=headers)
+        single = time.perf_counter() - started
+
+        body = "\n".join(json.dumps(_user("bulk", i)) for i in range(args.users))
+        started = time.perf_counter()
+        response = c.post(
+            "/api/users/bulk",
+            content=body,
+            headers={**headers, "Content-Type": "application/x-ndjson"},
+        )
+        bulk = time.perf_counter() - started
+        summary = json.loads(response.text.splitlines()[-1])["summary"]
+
+    print(
+        f"bcrypt_rounds={settings.password_hash_bcrypt_rounds} "
+        f"executor={settings.password_hash_executor} "
+        f"batch={settings.bulk_import_batch_size}"
+    )
+    print(f"{'um a um':>8}: {args.users / single:8.0f} usuários/s ({single:.1f} s)")
+    print(f"{'bulk':>8}: {args.users / bulk:8.0f} usuários/s ({bulk:.1f} s) {summary}")
+    server.should_exit = True
+    server_thread.join()
+
+
+if __name__ == "__main__":
+    main()
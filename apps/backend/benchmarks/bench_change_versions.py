@@ -0,0 +1,114 @@
+"""Vazão de escritas concorrentes em `users` conforme o contador das listagens.
+
+Cada escrita incrementa o contador `change_versions` (o ETag de GET
+/api/users) na própria transação. Aqui N processos, cada um com sua conexão,
+alteram usuários distintos via `PostgreSQLUserAdapter.update` durante alguns
+segundos, em três configurações:
+
+1. sem contador (`bump_version` desligado), a linha de base;
+2. contador numa única linha, como era: toda escrita espera o commit da
+   anterior para travar a mesma linha;
+3. contador dividido em `SHARDS` linhas, somadas na leitura.
+
+    DATABASE_URL=postgresql://... PYTHONPATH=src python \\
+        benchmarks/bench_change_versions.py --writers 1,8,32
+
+As tabelas são recriadas. O efeito só aparece no PostgreSQL: o SQLite
+serializa todas as escritas de qualquer forma.
+"""
+
+import argparse
+import multiprocessing
+import statistics
+import time
+from datetime import date
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import sessionmaker
+
+from adapters import Base, PostgreSQLUserAdapter, UserModel, engine
+from adapters.database import change_versions, postgresql_user_adapter
+from domain import User
+
+MODES = ("sem contador", "1 linha", f"{change_versions.SHARDS} linhas")
+
+
+def _create_schema(bind) -> None:
+    Base.metadata.drop_all(bind=bind)
+    try:
+        with bind.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        Base.metadata.create_all(bind=bind)
+    except SQLAlchemyError:
+        # Sem pg_trgm: os índices de busca não entram nas escritas medidas
+        indexes = UserModel.__table__.indexes
+        trgm = {index for index in indexes if index.name.endswith("_trgm")}
+        indexes -= trgm
+        Base.metadata.create_all(bind=bind)
+        indexes |= trgm
+
+
+def _writer(mode: str, user_id, seconds: float, results) -> None:
+    if mode == MODES[0]:
+        postgresql_user_adapter.bump_version = lambda db, name=None: None
+    elif mode == MODES[1]:
+        change_versions.SHARDS = 1
+    bind = create_engine(engine.url, pool_size=1)
+    latencies = []
+    with sessionmaker(bind=bind)() as db:
+        adapter = PostgreSQLUserAdapter(db)
+        stop = time.perf_counter() + seconds
+        day = 1
+        while time.perf_counter() < stop:
+            day = day % 28 + 1
+            started = time.perf_counter()
+            adapter.update(user_id, birth_date=date(1990, 1, day))
+            latencies.append(time.perf_counter() - started)
+    bind.dispose()
+    results.put(latencies)
+
+
+def _run(mode: str, user_ids: list, seconds: float) -> tuple[float, float]:
+    results = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=_writer, args=(mode, user_id, seconds, results))
+        for user_id in user_ids
+    ]
+    for worker in workers:
+        worker.start()
+    latencies = [value for _ in workers for value in results.get()]
+    for worker in workers:
+        worker.join()
+    p99 = statistics.quantiles(latencies, n=100)[98] if len(latencies) > 1 else 0.0
+    return len(latencies) / seconds, p99
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", default="1,8,32")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    counts = [int(count) for count in args.writers.split(",")]
+    _create_schema(engine)
+    with sessionmaker(bind=engine)() as db:
+        adapter = PostgreSQLUserAdapter(db)
+        user_ids = [
+            adapter.save(
+                User(name=f"W{i}", email=f"w{i}@example.com", password_hash="x")
+            ).id
+            for i in range(max(counts))
+        ]
+
+    for count in counts:
+        for mode in MODES:
+            per_second, p99 = _run(mode, user_ids[:count], args.seconds)
+            print(
+                f"{count:>3} processos, {mode:>13}: {per_second:8,.0f} escritas/s  "
+                f"p99={p99 * 1000:6.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Exportação em streaming de uma tabela grande de usuários.
+
+Popula a tabela com usuários sintéticos, sobe a API com uvicorn numa thread
+e baixa GET /api/users/export inteiro, medindo vazão e o pico de memória
+(RSS) do processo. Com --paged, compara com a paginação por cursor de
+GET /api/users:
+
+    PYTHONPATH=src python benchmarks/bench_export.py --sqlite /tmp/export.db
+
+Sem --sqlite, usa o DATABASE_URL configurado (as tabelas são recriadas).
+"""
+
+import argparse
+import resource
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+import uvicorn
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from adapters import Base, UserModel, engine, get_db
+from api.main import app
+
+
+def _database(path: str | None):
+    if not path:
+        return engine
+    bind = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=bind)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    return bind
+
+
+def _populate(bind, rows: int) -> None:
+    Base.metadata.drop_all(bind=bind)
+    Base.metadata.create_all(bind=bind)
+    start = datetime(2020, 1, 1)
+    with bind.begin() as conn:
+        for offset in range(0, rows, 10_000):
+            conn.execute(
+                insert(UserModel),
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        "name": f"User {i}",
+                        "email": f"user{i}@example.com",
+                        "password_hash": "x" * 60,
+                        "role": "user",
+                        "created_at": start + timedelta(seconds=i),
+                        "token_version": 0,
+                    }
+                    for i in range(offset, min(rows, offset + 10_000))
+                ],
+            )
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8768)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--sqlite", metavar="PATH")
+    parser.add_argument("--paged", action="store_true")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    _populate(_database(args.sqlite), args.rows)
+    print(f"{args.rows} usuários inseridos em {time.perf_counter() - started:.1f} s")
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, port=args.port, log_level="warning", access_log=False)
+    )
+    server_thread = threading.Thread(target=server.run, daemon=True)
+    server_thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    with httpx.Client(base_url=f"http://127.0.0.1:{args.port}", timeout=600) as c:
+        credentials = {"email": "admin@example.com", "password": "adminpass123"}
+        c.post("/api/auth/register", json={"name": "A", "role": "admin", **credentials})
+        token = c.post("/api/auth/login", json=credentials).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        for export_format in ("ndjson", "csv"):
+            rss_before = _peak_rss_mb()
+            started = time.perf_counter()
+            lines = size = 0
+            with c.stream(
+                "GET",
+                "/api/users/export",
+                params={"format": export_format},
+                headers=headers,
+            ) as response:
+                for chunk in response.iter_bytes():
+                    lines += chunk.count(b"\n")
+                    size += len(chunk)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{'export ' + export_format:>14}: {lines / elapsed:9.0f} linhas/s  "
+                f"{size / elapsed / 2**20:6.1f} MiB/s  "
+                f"pico de RSS +{_peak_rss_mb() - rss_before:.0f} MiB "
+                f"(total {_peak_rss_mb():.0f} MiB)"
+            )
+
+        if args.paged:
+            rss_before = _peak_rss_mb()
+            started = time.perf_counter()
+            users = 0
+            params = {"limit": 1000, "count": "estimate"}
+            while True:
+                page = c.get("/api/users", params=params, headers=headers).json()
+                users += len(page["users"])
+                if page["next_cursor"] is None:
+                    break
+                params["cursor"] = page["next_cursor"]
+            elapsed = time.perf_counter() - started
+            print(
+                f"{'paginado':>14}: {users / elapsed:9.0f} linhas/s  "
+                f"pico de RSS +{_peak_rss_mb() - rss_before:.0f} MiB"
+            )
+
+    server.should_exit = True
+    server_thread.join()
+
+
+if __name__ == "__main__":
+    main()
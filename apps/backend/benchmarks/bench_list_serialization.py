@@ -0,0 +1,151 @@
+"""Custo de serialização da listagem de usuários.
+
+Mede duas coisas sobre uma página de usuários:
+
+1. a montagem e serialização da página isoladamente: schema validado
+   (EmailStr por usuário) + dump para dict + json.dumps, como o FastAPI faz
+   com o response_model, vs. `model_construct` + serializer do pydantic-core;
+2. a vazão de GET /api/users?limit=N ponta a ponta, com uvicorn numa thread.
+
+    PYTHONPATH=src python benchmarks/bench_list_serialization.py --sqlite /tmp/list.db
+
+Sem --sqlite, usa o DATABASE_URL configurado (as tabelas são recriadas).
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+import timeit
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+import pydantic_core
+import uvicorn
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from adapters import Base, UserModel, engine, get_db
+from api.main import app
+from api.schemas import UserListResponse, UserResponse, UserRoleEnum
+
+
+def _database(path: str | None):
+    if not path:
+        return engine
+    bind = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=bind)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    return bind
+
+
+def _rows(count: int) -> list[dict]:
+    start = datetime(2020, 1, 1)
+    return [
+        {
+            "id": uuid.uuid4(),
+            "name": f"User {i}",
+            "email": f"user{i}@example.com",
+            "password_hash": "x" * 60,
+            "role": "user",
+            "created_at": start + timedelta(seconds=i),
+            "updated_at": start + timedelta(days=1, seconds=i),
+            "token_version": 0,
+        }
+        for i in range(count)
+    ]
+
+
+def _serialization(rows: list[dict], number: int) -> None:
+    fields = [
+        {
+            "id": row["id"],
+            "name": row["name"],
+            "email": row["email"],
+            "role": UserRoleEnum(row["role"]),
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+        for row in rows
+    ]
+
+    def validated() -> bytes:
+        page = UserListResponse(
+            users=[UserResponse(**user) for user in fields], total=len(fields)
+        )
+        content = page.model_dump(mode="json")
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def trusted() -> bytes:
+        page = UserListResponse.model_construct(
+            users=[UserResponse.model_construct(**user) for user in fields],
+            total=len(fields),
+            next_cursor=None,
+        )
+        return pydantic_core.to_json(page)
+
+    assert json.loads(validated()) == json.loads(trusted())
+    for label, fn in (("validado", validated), ("confiável", trusted)):
+        seconds = min(timeit.repeat(fn, number=number, repeat=5)) / number
+        print(f"{label:>10}: {seconds * 1e6:8.0f} µs/página ({len(rows)} usuários)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8770)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--sqlite", metavar="PATH")
+    args = parser.parse_args()
+
+    rows = _rows(args.limit)
+    _serialization(rows, number=200)
+
+    bind = _database(args.sqlite)
+    Base.metadata.drop_all(bind=bind)
+    Base.metadata.create_all(bind=bind)
+    with bind.begin() as conn:
+        conn.execute(insert(UserModel), rows)
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, port=args.port, log_level="warning", access_log=False)
+    )
+    server_thread = threading.Thread(target=server.run, daemon=True)
+    server_thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    with httpx.Client(base_url=f"http://127.0.0.1:{args.port}", timeout=60) as c:
+        credentials = {"email": "admin@example.com", "password": "adminpass123"}
+        c.post("/api/auth/register", json={"name": "A", "role": "admin", **credentials})
+        token = c.post("/api/auth/login", json=credentials).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        params = {"limit": args.limit}
+
+        latencies: list[float] = []
+        deadline = time.perf_counter() + args.duration
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            c.get("/api/users", params=params, headers=headers).raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    print(
+        f"{'GET /api/users':>10}: {len(latencies) / sum(latencies):8.0f} req/s  "
+        f"p50={statistics.median(latencies) * 1000:.2f} ms (limit={args.limit})"
+    )
+    server.should_exit = True
+    server_thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Custo por requisição das métricas embutidas.
+
+Compara, no mesmo processo e sem rede:
+
+* uma app ASGI trivial com e sem o MetricsMiddleware;
+* um `SELECT 1` no SQLite com e sem os listeners de cursor;
+* a renderização de /metrics com o registro já populado.
+
+    PYTHONPATH=src python benchmarks/bench_metrics_overhead.py
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import Engine, create_engine, event, text
+
+from adapters.database import instrumentation
+from adapters.metrics import metrics_registry
+from api.metrics import MetricsMiddleware
+
+
+class _Route:
+    path_format = "/api/users/{user_id}"
+
+
+async def _plain_app(_scope, _receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _noop_send(_message):
+    return None
+
+
+def _bench_middleware(iterations: int) -> tuple[float, float]:
+    scope = {"type": "http", "method": "GET", "route": _Route()}
+    instrumented = MetricsMiddleware(_plain_app)
+
+    async def run(app) -> float:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await app(scope, None, _noop_send)
+        return (time.perf_counter() - started) / iterations
+
+    return asyncio.run(run(_plain_app)), asyncio.run(run(instrumented))
+
+
+def _bench_statements(iterations: int) -> tuple[float, float]:
+    engine = create_engine("sqlite://")
+    statement = text("SELECT 1")
+
+    def run() -> float:
+        with engine.connect() as conn:
+            started = time.perf_counter()
+            for _ in range(iterations):
+                conn.execute(statement)
+            return (time.perf_counter() - started) / iterations
+
+    instrumentation.instrument_statements()
+    with_listeners = run()
+    event.remove(
+        Engine, "before_cursor_execute", instrumentation._before_cursor_execute
+    )
+    event.remove(Engine, "after_cursor_execute", instrumentation._after_cursor_execute)
+    event.remove(Engine, "handle_error", instrumentation._handle_error)
+    without_listeners = run()
+    instrumentation.instrument_statements()
+    return without_listeners, with_listeners
+
+
+def _bench_render(iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        metrics_registry.render()
+    return (time.perf_counter() - started) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50_000)
+    args = parser.parse_args()
+
+    plain, instrumented = _bench_middleware(args.iterations)
+    print(
+        f"{'middleware':>12}: sem={plain * 1e6:6.2f} us  "
+        f"com={instrumented * 1e6:6.2f} us  "
+        f"custo={(instrumented - plain) * 1e6:6.2f} us/req"
+    )
+    plain, instrumented = _bench_statements(args.iterations)
+    print(
+        f"{'SELECT 1':>12}: sem={plain * 1e6:6.2f} us  "
+        f"com={instrumented * 1e6:6.2f} us  "
+        f"custo={(instrumented - plain) * 1e6:6.2f} us/query"
+    )
+    print(f"{'/metrics':>12}: {_bench_render(1_000) * 1e6:8.1f} us por renderização")
+
+
+if __name__ == "__main__":
+    main()
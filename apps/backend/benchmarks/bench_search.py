@@ -0,0 +1,111 @@
+"""Latência da busca de usuários por nome/email numa tabela grande.
+
+Popula a tabela com milhões de usuários sintéticos e mede a primeira página
+e uma página seguinte (pelo cursor) de `UserService.search_users` para
+termos de prefixo, de trecho e, no PostgreSQL, com erro de digitação:
+
+    PYTHONPATH=src python benchmarks/bench_search.py --sqlite /tmp/search.db
+
+Sem --sqlite, usa o DATABASE_URL configurado (as tabelas são recriadas). Os
+índices GIN de trigramas só existem no PostgreSQL (rode `alembic upgrade
+head` antes, para criar a extensão pg_trgm); no SQLite a busca usa o LIKE de
+fallback e varre a tabela, o que serve de linha de base.
+"""
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from adapters import Base, PostgreSQLUserAdapter, UserModel, engine
+from application import UserService
+
+FIRST_NAMES = ("Ana", "Bruno", "Carla", "Diego", "Elisa", "Fábio", "Gabriela")
+LAST_NAMES = ("Silva", "Souza", "Oliveira", "Pereira", "Lima", "Carvalho", "Ramos")
+CHUNK = 50_000
+
+
+def _populate(bind, rows: int) -> None:
+    Base.metadata.drop_all(bind=bind)
+    if bind.dialect.name == "postgresql":
+        with bind.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    Base.metadata.create_all(bind=bind)
+    rng = random.Random(42)
+    start = datetime(2020, 1, 1)
+    for offset in range(0, rows, CHUNK):
+        batch = []
+        for i in range(offset, min(offset + CHUNK, rows)):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            batch.append(
+                {
+                    "id": uuid.uuid4(),
+                    "name": f"{first} {last} {i}",
+                    "email": f"{first.lower()}.{last.lower()}{i}@example.com",
+                    "password_hash": "x" * 60,
+                    "role": "user",
+                    "created_at": start + timedelta(seconds=i),
+                    "token_version": 0,
+                }
+            )
+        with bind.begin() as conn:
+            conn.execute(insert(UserModel), batch)
+    if bind.dialect.name == "postgresql":
+        with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM ANALYZE users"))
+
+
+def _measure(service: UserService, query: str, rounds: int) -> tuple[float, float]:
+    first: list[float] = []
+    second: list[float] = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        page = service.search_users(query, limit=20)
+        first.append(time.perf_counter() - started)
+        if page.next_cursor:
+            started = time.perf_counter()
+            service.search_users(query, limit=20, cursor=page.next_cursor)
+            second.append(time.perf_counter() - started)
+    return statistics.median(first), statistics.median(second) if second else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--sqlite", metavar="PATH")
+    args = parser.parse_args()
+
+    bind = create_engine(f"sqlite:///{args.sqlite}") if args.sqlite else engine
+    started = time.perf_counter()
+    _populate(bind, args.rows)
+    print(f"{'carga':>22}: {time.perf_counter() - started:8.1f} s ({args.rows} linhas)")
+
+    queries = {
+        "prefixo (nome)": "Gabriela Ramos 19",
+        "prefixo (email)": "elisa.lima12",
+        "trecho": "arvalho12",
+    }
+    if bind.dialect.name == "postgresql":
+        queries["erro de digitação"] = "Gabriella Ramos 19"
+
+    db = sessionmaker(bind=bind)()
+    try:
+        service = UserService(PostgreSQLUserAdapter(db))
+        for label, query in queries.items():
+            first, second = _measure(service, query, args.rounds)
+            print(
+                f"{label:>22}: {first * 1000:8.1f} ms/1ª página  "
+                f"{second * 1000:8.1f} ms/página seguinte ({query!r})"
+            )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Mede o custo de verify_token com e sem o cache de tokens verificados.
+
+Simula uma sessão de navegador reutilizando o mesmo access token em todas
+as requisições, que é o caso comum no hot path de autenticação.
+"""
+
+import argparse
+import timeit
+from uuid import uuid4
+
+from application import AuthService
+from application.services.token_cache import VerifiedTokenCache
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    # verify_token não acessa a persistência
+    uncached = AuthService(None, token_cache=None)  # type: ignore[arg-type]
+    cached = AuthService(None, token_cache=VerifiedTokenCache())  # type: ignore[arg-type]
+    token = uncached.create_access_token(uuid4())
+
+    for name, service in (("sem cache", uncached), ("com cache", cached)):
+        service.verify_token(token)  # aquece o cache
+        seconds = timeit.timeit(
+            lambda s=service: s.verify_token(token), number=args.iterations
+        )
+        print(f"{name:>10}: {seconds / args.iterations * 1e6:8.2f} µs/req")
+
+
+if __name__ == "__main__":
+    main()
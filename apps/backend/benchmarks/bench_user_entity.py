@@ -0,0 +1,120 @@
+"""Memória e custo de conversão da entidade User em lotes grandes.
+
+Lê 100k linhas de `users` (SQLite em memória, via Core, como o
+`stream_all` da exportação) e mede:
+
+1. bytes por User retido (tracemalloc), com `__slots__` vs. um User
+   equivalente com `__dict__`, como era a entidade;
+2. conversões por segundo linha -> User (`user_to_domain`: linha
+   desempacotada por posição e role buscada em `ROLES`) vs. a conversão
+   anterior (coluna a coluna pelo nome, `UserRole(valor)` e User com
+   `__dict__`), e User -> valores do INSERT (`user_to_row`).
+
+    PYTHONPATH=src python benchmarks/bench_user_entity.py --rows 100000
+"""
+
+import argparse
+import time
+import tracemalloc
+import uuid
+from dataclasses import field, fields, make_dataclass
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, insert, select
+
+from adapters import Base, UserModel
+from adapters.database.user_statements import user_to_domain, user_to_row, users
+from domain import User, UserRole
+
+# O User de antes: mesmos campos, sem slots
+DictUser = make_dataclass(
+    "DictUser",
+    [
+        (f.name, f.type, field(default=f.default, default_factory=f.default_factory))
+        for f in fields(User)
+    ],
+)
+
+
+def dict_user_to_domain(row) -> DictUser:
+    return DictUser(
+        id=row.id,
+        name=row.name,
+        email=row.email,
+        password_hash=row.password_hash,
+        role=UserRole(row.role),
+        birth_date=row.birth_date,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        token_version=row.token_version,
+    )
+
+
+def _rows(count: int) -> list[dict]:
+    start = datetime(2020, 1, 1)
+    return [
+        {
+            "id": uuid.uuid4(),
+            "name": f"User {i}",
+            "email": f"user{i}@example.com",
+            "password_hash": "x" * 60,
+            "role": "user",
+            "birth_date": date(1990, 1, 1) + timedelta(days=i % 3650),
+            "created_at": start + timedelta(seconds=i),
+            "updated_at": None,
+            "token_version": 0,
+        }
+        for i in range(count)
+    ]
+
+
+def _bytes_per_object(convert, rows) -> float:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    converted = [convert(row) for row in rows]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / len(converted)
+
+
+def _per_second(convert, items, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for item in items:
+            convert(item)
+        best = min(best, time.perf_counter() - started)
+    return len(items) / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    bind = create_engine("sqlite://")
+    Base.metadata.create_all(bind=bind)
+    with bind.begin() as conn:
+        conn.execute(insert(UserModel), _rows(args.rows))
+        rows = conn.execute(select(users)).all()
+
+    domain_users = [user_to_domain(row) for row in rows]
+    assert not hasattr(domain_users[0], "__dict__")
+    assert user_to_row(domain_users[0]) == rows[0]._asdict()
+
+    # Os bytes incluem o ponteiro de 8 bytes na lista
+    for label, convert in (
+        ("slots", user_to_domain),
+        ("__dict__", dict_user_to_domain),
+    ):
+        print(
+            f"{label:>10}: {_bytes_per_object(convert, rows):6.0f} bytes/usuário  "
+            f"{_per_second(convert, rows):10,.0f} linhas->User/s ({len(rows)} linhas)"
+        )
+    print(
+        f"{'INSERT':>10}: {_per_second(user_to_row, domain_users):10,.0f} User->linha/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
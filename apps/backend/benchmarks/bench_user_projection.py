@@ -0,0 +1,112 @@
+"""Custo por linha da leitura da listagem: ORM vs. projeção de colunas.
+
+Lê uma página de usuários (1.000 por padrão) dos dois jeitos e a serializa
+como a API faz:
+
+1. ORM: `select(UserModel)` hidratado no identity map, convertido em User e
+   em UserResponse (`model_construct`), como era a listagem;
+2. projeção: `list_user_views`, só as colunas expostas, lidas pelo Core
+   direto para `UserView` (dataclass com slots).
+
+Reporta µs por linha e o pico de memória (tracemalloc) de cada caminho.
+
+    PYTHONPATH=src python benchmarks/bench_user_projection.py --sqlite /tmp/projection.db
+
+Sem --sqlite, usa o DATABASE_URL configurado (as tabelas são recriadas).
+"""
+
+import argparse
+import timeit
+import tracemalloc
+import uuid
+from datetime import date, datetime, timedelta
+
+import pydantic_core
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from adapters import Base, UserModel, engine
+from adapters.database.user_statements import list_user_views, view_to_domain
+from api.routes import _user_to_response
+from domain import User, UserQuery, UserRole
+
+
+def _orm_to_domain(model: UserModel) -> User:
+    return User(
+        id=model.id,
+        name=model.name,
+        email=model.email,
+        password_hash=model.password_hash,
+        role=UserRole(model.role),
+        birth_date=model.birth_date,
+        created_at=model.created_at,
+        updated_at=model.updated_at,
+        token_version=model.token_version,
+    )
+
+
+def _rows(count: int) -> list[dict]:
+    start = datetime(2020, 1, 1)
+    return [
+        {
+            "id": uuid.uuid4(),
+            "name": f"User {i}",
+            "email": f"user{i}@example.com",
+            "password_hash": "x" * 60,
+            "role": "user",
+            "birth_date": date(1990, 1, 1) + timedelta(days=i % 3650),
+            "created_at": start + timedelta(seconds=i),
+            "updated_at": start + timedelta(days=1, seconds=i),
+            "token_version": 0,
+        }
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--sqlite", metavar="PATH")
+    args = parser.parse_args()
+
+    bind = engine
+    if args.sqlite:
+        bind = create_engine(f"sqlite:///{args.sqlite}")
+    Base.metadata.drop_all(bind=bind)
+    Base.metadata.create_all(bind=bind)
+    with bind.begin() as conn:
+        conn.execute(insert(UserModel), _rows(args.rows))
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=bind)
+    query = UserQuery()
+
+    def orm() -> bytes:
+        with session_factory() as db:
+            models = db.scalars(
+                select(UserModel)
+                .order_by(UserModel.created_at, UserModel.id)
+                .limit(args.rows)
+            )
+            users = [_user_to_response(_orm_to_domain(model)) for model in models]
+            return pydantic_core.to_json({"users": users})
+
+    def projection() -> bytes:
+        with session_factory() as db:
+            rows = db.execute(list_user_views(query).limit(args.rows))
+            return pydantic_core.to_json({"users": [view_to_domain(r) for r in rows]})
+
+    assert orm() == projection()
+    for label, fn in (("ORM", orm), ("projeção", projection)):
+        seconds = min(timeit.repeat(fn, number=args.number, repeat=5)) / args.number
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{label:>10}: {seconds * 1e6 / args.rows:6.2f} µs/linha  "
+            f"pico={peak / 1024:8.0f} KiB ({args.rows} linhas)"
+        )
+
+
+if __name__ == "__main__":
+    main()
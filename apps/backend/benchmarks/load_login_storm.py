@@ -0,0 +1,154 @@
+"""Teste de carga: latência do CRUD durante uma rajada de logins.
+
+Sobe a API com uvicorn numa thread, mede o p50/p99 de GET /api/users sem
+carga de login e depois com várias threads martelando /api/auth/login.
+Compare os executores de hashing rodando duas vezes, por exemplo:
+
+    PASSWORD_HASH_EXECUTOR=inline  PYTHONPATH=src python benchmarks/load_login_storm.py
+    PASSWORD_HASH_EXECUTOR=process PYTHONPATH=src python benchmarks/load_login_storm.py
+
+Usa o DATABASE_URL configurado; com --sqlite, usa um arquivo SQLite local.
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from collections import Counter
+
+import httpx
+import uvicorn
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from adapters import Base, get_db, settings
+from api.main import app
+
+
+def _use_sqlite(path: str) -> None:
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))] * 1000
+
+
+def _crud_worker(base_url, headers, stop, latencies):
+    with httpx.Client(base_url=base_url, headers=headers, timeout=30) as client:
+        while not stop.is_set():
+            started = time.perf_counter()
+            client.get("/api/users", params={"limit": 20})
+            latencies.append(time.perf_counter() - started)
+
+
+def _login_worker(base_url, stop, statuses):
+    credentials = {"email": "storm@example.com", "password": "stormpass123"}
+    with httpx.Client(base_url=base_url, timeout=30) as client:
+        while not stop.is_set():
+            try:
+                response = client.post("/api/auth/login", json=credentials)
+            except httpx.HTTPError as exc:
+                statuses[type(exc).__name__] += 1
+            else:
+                statuses[response.status_code] += 1
+
+
+def _phase(base_url, headers, args, storm: bool) -> None:
+    stop = threading.Event()
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    threads = [
+        threading.Thread(target=_crud_worker, args=(base_url, headers, stop, latencies))
+        for _ in range(args.crud_clients)
+    ]
+    if storm:
+        threads += [
+            threading.Thread(target=_login_worker, args=(base_url, stop, statuses))
+            for _ in range(args.login_clients)
+        ]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    label = "com rajada de login" if storm else "sem carga de login"
+    print(
+        f"{label:>20}: {len(latencies):6d} GETs  "
+        f"p50={statistics.median(latencies) * 1000:7.1f} ms  "
+        f"p99={_percentile(latencies, 0.99):7.1f} ms"
+    )
+    if storm:
+        print(f"{'logins':>20}: {dict(statuses)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--crud-clients", type=int, default=8)
+    parser.add_argument("--login-clients", type=int, default=64)
+    parser.add_argument("--sqlite", metavar="PATH")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        _use_sqlite(args.sqlite)
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, port=args.port, log_level="warning", access_log=False)
+    )
+    server_thread = threading.Thread(target=server.run, daemon=True)
+    server_thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    with httpx.Client(base_url=base_url, timeout=30) as client:
+        for email, password, role in (
+            ("admin@example.com", "adminpass123", "admin"),
+            ("storm@example.com", "stormpass123", "user"),
+        ):
+            client.post(
+                "/api/auth/register",
+                json={
+                    "name": email,
+                    "email": email,
+                    "password": password,
+                    "role": role,
+                },
+            )
+        token = client.post(
+            "/api/auth/login",
+            json={"email": "admin@example.com", "password": "adminpass123"},
+        ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    print(
+        f"executor={settings.password_hash_executor} "
+        f"workers={settings.password_hash_workers} "
+        f"max_pending={settings.password_hash_max_pending}"
+    )
+    _phase(base_url, headers, args, storm=False)
+    _phase(base_url, headers, args, storm=True)
+    server.should_exit = True
+    server_thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,53 @@
+from .cache import CachedUserPersistenceAdapter, UserEntityCache, user_entity_cache
 from .database import (
     Base,
     engine,
     SessionLocal,
     get_db,
+    read_replicas,
+    get_read_replicas,
+    async_engine,
+    AsyncSessionLocal,
+    get_async_db,
+    pool_metrics,
     settings,
+    QueryStats,
+    ReadReplicas,
+    track_queries,
+    instrument_statements,
+    pool_snapshots,
     UserModel,
+    UserSignupDailyModel,
+    ChangeVersionModel,
     PostgreSQLUserAdapter,
+    AsyncPostgreSQLUserAdapter,
+    backfill_signup_daily,
 )
 
 __all__ = [
+    "CachedUserPersistenceAdapter",
+    "UserEntityCache",
+    "user_entity_cache",
     "Base",
     "engine",
     "SessionLocal",
     "get_db",
+    "read_replicas",
+    "get_read_replicas",
+    "async_engine",
+    "AsyncSessionLocal",
+    "get_async_db",
+    "pool_metrics",
     "settings",
+    "QueryStats",
+    "ReadReplicas",
+    "track_queries",
+    "instrument_statements",
+    "pool_snapshots",
     "UserModel",
+    "UserSignupDailyModel",
+    "ChangeVersionModel",
     "PostgreSQLUserAdapter",
+    "AsyncPostgreSQLUserAdapter",
+    "backfill_signup_daily",
 ]
@@ -0,0 +1,11 @@
+from .user_cache import (
+    CachedUserPersistenceAdapter,
+    UserEntityCache,
+    user_entity_cache,
+)
+
+__all__ = [
+    "CachedUserPersistenceAdapter",
+    "UserEntityCache",
+    "user_entity_cache",
+]
@@ -0,0 +1,322 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from datetime import date, datetime
+from typing import Iterator, Optional
+from uuid import UUID
+
+from domain import (
+    CountStrategy,
+    SearchCursor,
+    User,
+    UserCursor,
+    UserMatch,
+    UserPersistencePort,
+    UserQuery,
+    UserRole,
+    UserSelection,
+    UserView,
+)
+
+from ..database.config import settings
+
+
+class UserEntityCache:
+    """Cache LRU em memória de entidades User, com TTL por entrada.
+
+    Guarda também ausências (cache negativo, com TTL próprio) para que buscas
+    repetidas por um id/email inexistente não voltem ao banco. O índice por
+    email aponta para o id e só vale se a entrada do id ainda tiver aquele
+    email, então um email antigo nunca devolve um usuário renomeado.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 10.0,
+        negative_ttl_seconds: float = 2.0,
+    ):
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._negative_ttl = negative_ttl_seconds
+        self._lock = threading.Lock()
+        self._by_id: OrderedDict[UUID, tuple[Optional[User], float]] = OrderedDict()
+        self._by_email: OrderedDict[str, tuple[Optional[UUID], float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _expires_at(self, found: bool) -> float:
+        return time.monotonic() + (self._ttl if found else self._negative_ttl)
+
+    def _store(self, entries: OrderedDict, key, value, expires_at: float) -> None:
+        entries[key] = (value, expires_at)
+        entries.move_to_end(key)
+        while len(entries) > self._max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def _lookup(self, entries: OrderedDict, key) -> tuple[bool, object]:
+        entry = entries.get(key)
+        if entry is None:
+            return False, None
+        if time.monotonic() >= entry[1]:
+            del entries[key]
+            return False, None
+        entries.move_to_end(key)
+        return True, entry[0]
+
+    def get_by_id(self, user_id: UUID) -> tuple[bool, Optional[User]]:
+        """Retorna (encontrado no cache, usuário ou None se ausente)."""
+        with self._lock:
+            found, user = self._lookup(self._by_id, user_id)
+            if found:
+                self.hits += 1
+                return True, replace(user) if isinstance(user, User) else None
+            self.misses += 1
+            return False, None
+
+    def get_by_email(self, email: str) -> tuple[bool, Optional[User]]:
+        """Retorna (encontrado no cache, usuário ou None se ausente)."""
+        with self._lock:
+            found, user_id = self._lookup(self._by_email, email)
+            if found and user_id is None:
+                self.hits += 1
+                return True, None
+            if found:
+                _, user = self._lookup(self._by_id, user_id)
+                if isinstance(user, User) and user.email == email:
+                    self.hits += 1
+                    return True, replace(user)
+            self.misses += 1
+            return False, None
+
+    def put(self, user: User) -> None:
+        with self._lock:
+            expires_at = self._expires_at(True)
+            self._store(self._by_id, user.id, replace(user), expires_at)
+            self._store(self._by_email, user.email, user.id, expires_at)
+
+    def put_missing_id(self, user_id: UUID) -> None:
+        with self._lock:
+            self._store(self._by_id, user_id, None, self._expires_at(False))
+
+    def put_missing_email(self, email: str) -> None:
+        with self._lock:
+            self._store(self._by_email, email, None, self._expires_at(False))
+
+    def set_password_hash(self, user_id: UUID, password_hash: str) -> None:
+        """Troca o hash da entrada em cache, mantendo o TTL que ela já tinha."""
+        with self._lock:
+            entry = self._by_id.get(user_id)
+            if entry is not None and isinstance(entry[0], User):
+                user = replace(entry[0], password_hash=password_hash)
+                self._by_id[user_id] = (user, entry[1])
+
+    def invalidate(self, user_id: UUID) -> None:
+        with self._lock:
+            self._by_id.pop(user_id, None)
+
+    def invalidate_email(self, email: str) -> None:
+        with self._lock:
+            self._by_email.pop(email, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_id.clear()
+            self._by_email.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._by_id),
+                "email_entries": len(self._by_email),
+                "max_entries": self._max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class CachedUserPersistenceAdapter(UserPersistencePort):
+    """Decorator do UserPersistencePort que consulta o cache antes do adapter.
+
+    Buscas por id/email passam pelo cache; escritas são delegadas e
+    atualizam o cache (write-through) ou invalidam a entrada.
+    """
+
+    def __init__(self, inner: UserPersistencePort, cache: UserEntityCache):
+        self._inner = inner
+        self._cache = cache
+
+    def save(self, user: User) -> User:
+        saved = self._inner.save(user)
+        self._cache.put(saved)
+        return saved
+
+    def save_many(self, users: list[User]) -> set[UUID]:
+        inserted = self._inner.save_many(users)
+        # Não aquece o cache com a importação; só derruba ausências cacheadas.
+        for user in users:
+            if user.id in inserted:
+                self._cache.invalidate_email(user.email)
+        return inserted
+
+    def find_by_id(self, user_id: UUID) -> Optional[User]:
+        found, user = self._cache.get_by_id(user_id)
+        if found:
+            return user
+        user = self._inner.find_by_id(user_id)
+        if user is None:
+            self._cache.put_missing_id(user_id)
+        else:
+            self._cache.put(user)
+        return user
+
+    def find_by_ids(self, user_ids: list[UUID]) -> list[User]:
+        users: list[User] = []
+        missing: list[UUID] = []
+        for user_id in user_ids:
+            found, user = self._cache.get_by_id(user_id)
+            if not found:
+                missing.append(user_id)
+            elif user is not None:
+                users.append(user)
+        if missing:
+            loaded = self._inner.find_by_ids(missing)
+            for user in loaded:
+                self._cache.put(user)
+            for user_id in set(missing) - {user.id for user in loaded}:
+                self._cache.put_missing_id(user_id)
+            users += loaded
+        return users
+
+    # O cache guarda entidades inteiras: as views saem delas, sem ir ao banco
+    def find_view_by_id(self, user_id: UUID) -> Optional[UserView]:
+        user = self.find_by_id(user_id)
+        return UserView.from_user(user) if user else None
+
+    def find_views_by_ids(self, user_ids: list[UUID]) -> list[UserView]:
+        return [UserView.from_user(user) for user in self.find_by_ids(user_ids)]
+
+    def find_by_email(self, email: str) -> Optional[User]:
+        found, user = self._cache.get_by_email(email)
+        if found:
+            return user
+        user = self._inner.find_by_email(email)
+        if user is None:
+            self._cache.put_missing_email(email)
+        else:
+            self._cache.put(user)
+        return user
+
+    def find_existing_emails(self, emails: list[str]) -> set[str]:
+        return self._inner.find_existing_emails(emails)
+
+    def find_all(
+        self, skip: int = 0, limit: int = 100, query: Optional[UserQuery] = None
+    ) -> list[User]:
+        return self._inner.find_all(skip=skip, limit=limit, query=query)
+
+    def find_after(
+        self,
+        cursor: Optional[UserCursor] = None,
+        limit: int = 100,
+        query: Optional[UserQuery] = None,
+    ) -> list[User]:
+        return self._inner.find_after(cursor, limit, query)
+
+    def find_all_views(
+        self, skip: int = 0, limit: int = 100, query: Optional[UserQuery] = None
+    ) -> list[UserView]:
+        return self._inner.find_all_views(skip=skip, limit=limit, query=query)
+
+    def find_views_after(
+        self,
+        cursor: Optional[UserCursor] = None,
+        limit: int = 100,
+        query: Optional[UserQuery] = None,
+    ) -> list[UserView]:
+        return self._inner.find_views_after(cursor, limit, query)
+
+    def search(
+        self, query: str, limit: int = 20, cursor: Optional[SearchCursor] = None
+    ) -> list[UserMatch]:
+        return self._inner.search(query, limit, cursor)
+
+    def stream_all(self, batch_size: int = 1000) -> Iterator[list[User]]:
+        return self._inner.stream_all(batch_size)
+
+    def count(
+        self,
+        strategy: CountStrategy = CountStrategy.EXACT,
+        query: Optional[UserQuery] = None,
+    ) -> int:
+        return self._inner.count(strategy, query)
+
+    def update(
+        self,
+        user_id: UUID,
+        name: Optional[str] = None,
+        email: Optional[str] = None,
+        birth_date: Optional[date] = None,
+        role: Optional[UserRole] = None,
+        expected_version: Optional[datetime] = None,
+    ) -> Optional[User]:
+        self._cache.invalidate(user_id)
+        updated = self._inner.update(
+            user_id,
+            name=name,
+            email=email,
+            birth_date=birth_date,
+            role=role,
+            expected_version=expected_version,
+        )
+        if updated is not None:
+            self._cache.put(updated)
+        return updated
+
+    def update_role_many(
+        self, selection: UserSelection, role: UserRole
+    ) -> dict[UUID, int]:
+        versions = self._inner.update_role_many(selection, role)
+        for user_id in versions:
+            self._cache.invalidate(user_id)
+        return versions
+
+    def update_password_hash(self, user_id: UUID, password_hash: str) -> None:
+        # Rehash no login: a entidade segue em cache, só com o hash novo
+        self._inner.update_password_hash(user_id, password_hash)
+        self._cache.set_password_hash(user_id, password_hash)
+
+    def get_change_version(self) -> int:
+        return self._inner.get_change_version()
+
+    def get_token_version(self, user_id: UUID) -> Optional[int]:
+        return self._inner.get_token_version(user_id)
+
+    def release_connection(self) -> None:
+        self._inner.release_connection()
+
+    def delete(
+        self, user_id: UUID, expected_version: Optional[datetime] = None
+    ) -> bool:
+        deleted = self._inner.delete(user_id, expected_version)
+        self._cache.invalidate(user_id)
+        return deleted
+
+    def delete_many(self, selection: UserSelection) -> list[UUID]:
+        deleted = self._inner.delete_many(selection)
+        for user_id in deleted:
+            self._cache.invalidate(user_id)
+        return deleted
+
+
+# Compartilhado entre requisições: os adapters são criados a cada request.
+user_entity_cache = UserEntityCache(
+    max_entries=settings.user_cache_max_entries,
+    ttl_seconds=settings.user_cache_ttl,
+    negative_ttl_seconds=settings.user_cache_negative_ttl,
+)
@@ -1,13 +1,47 @@
-from .config import Base, engine, SessionLocal, get_db, settings
-from .models import UserModel
+from .config import (
+    Base,
+    engine,
+    SessionLocal,
+    get_db,
+    async_engine,
+    AsyncSessionLocal,
+    get_async_db,
+    pool_metrics,
+    settings,
+)
+from .instrumentation import (
+    QueryStats,
+    instrument_statements,
+    pool_snapshots,
+    track_queries,
+)
+from .replicas import ReadReplicas, get_read_replicas, read_replicas
+from .models import ChangeVersionModel, UserModel, UserSignupDailyModel
 from .postgresql_user_adapter import PostgreSQLUserAdapter
+from .async_user_adapter import AsyncPostgreSQLUserAdapter
+from .signup_rollup import backfill_signup_daily
 
 __all__ = [
     "Base",
     "engine",
     "SessionLocal",
     "get_db",
+    "read_replicas",
+    "get_read_replicas",
+    "async_engine",
+    "AsyncSessionLocal",
+    "get_async_db",
+    "pool_metrics",
     "settings",
+    "QueryStats",
+    "ReadReplicas",
+    "track_queries",
+    "instrument_statements",
+    "pool_snapshots",
     "UserModel",
+    "UserSignupDailyModel",
+    "ChangeVersionModel",
     "PostgreSQLUserAdapter",
+    "AsyncPostgreSQLUserAdapter",
+    "backfill_signup_daily",
 ]
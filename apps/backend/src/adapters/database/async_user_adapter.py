@@ -0,0 +1,231 @@
+# pylint: disable=not-callable
+from collections import Counter
+from datetime import date, datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import Result, func, select, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from domain import (
+    AsyncUserPersistencePort,
+    CountStrategy,
+    User,
+    UserAlreadyExistsException,
+    UserCursor,
+    UserQuery,
+    UserRole,
+    UserVersionConflictException,
+    UserView,
+)
+
+from .change_versions import bump_version_async, get_version_async
+from .models import UserModel
+from .postgresql_user_adapter import user_count_cache
+from .signup_rollup import record_signups_async
+from .user_statements import (
+    count_users,
+    current_role,
+    delete_user,
+    insert_user,
+    is_email_conflict,
+    list_user_views,
+    list_users,
+    role_change_values,
+    select_users,
+    select_views,
+    update_user,
+    update_values,
+    user_exists,
+    user_to_domain,
+    view_to_domain,
+)
+
+
+class AsyncPostgreSQLUserAdapter(AsyncUserPersistencePort):
+    """Adapter PostgreSQL assíncrono (sqlalchemy.ext.asyncio + asyncpg).
+
+    Espelha o PostgreSQLUserAdapter e compartilha com ele o cache da
+    contagem, de modo que escritas por qualquer um dos dois o invalidam.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self._db = db
+
+    async def _first(self, *conditions) -> Optional[User]:
+        row = (await self._db.execute(select_users(*conditions).limit(1))).first()
+        return user_to_domain(row) if row else None
+
+    async def _execute_write(self, stmt, email: Optional[str]) -> Result:
+        try:
+            return await self._db.execute(stmt)
+        except IntegrityError as e:
+            await self._db.rollback()
+            if is_email_conflict(e):
+                raise UserAlreadyExistsException(email or "") from e
+            raise
+
+    async def save(self, user: User) -> User:
+        await self._execute_write(insert_user(user), user.email)
+        await record_signups_async(
+            self._db, Counter({(user.created_at.date(), user.role.value): 1})
+        )
+        await bump_version_async(self._db)
+        await self._db.commit()
+        user_count_cache.invalidate()
+        return user
+
+    async def find_by_email(self, email: str) -> Optional[User]:
+        return await self._first(UserModel.email == email)
+
+    async def find_by_id(self, user_id: UUID) -> Optional[User]:
+        return await self._first(UserModel.id == user_id)
+
+    async def find_all(
+        self, skip: int = 0, limit: int = 100, query: Optional[UserQuery] = None
+    ) -> list[User]:
+        result = await self._db.execute(
+            list_users(query or UserQuery()).offset(skip).limit(limit)
+        )
+        return [user_to_domain(row) for row in result]
+
+    async def find_after(
+        self,
+        cursor: Optional[UserCursor] = None,
+        limit: int = 100,
+        query: Optional[UserQuery] = None,
+    ) -> list[User]:
+        result = await self._db.execute(
+            list_users(query or UserQuery(), cursor).limit(limit)
+        )
+        return [user_to_domain(row) for row in result]
+
+    async def find_view_by_id(self, user_id: UUID) -> Optional[UserView]:
+        result = await self._db.execute(select_views(UserModel.id == user_id).limit(1))
+        row = result.first()
+        return view_to_domain(row) if row else None
+
+    async def find_all_views(
+        self, skip: int = 0, limit: int = 100, query: Optional[UserQuery] = None
+    ) -> list[UserView]:
+        result = await self._db.execute(
+            list_user_views(query or UserQuery()).offset(skip).limit(limit)
+        )
+        return [view_to_domain(row) for row in result]
+
+    async def find_views_after(
+        self,
+        cursor: Optional[UserCursor] = None,
+        limit: int = 100,
+        query: Optional[UserQuery] = None,
+    ) -> list[UserView]:
+        result = await self._db.execute(
+            list_user_views(query or UserQuery(), cursor).limit(limit)
+        )
+        return [view_to_domain(row) for row in result]
+
+    async def count(
+        self,
+        strategy: CountStrategy = CountStrategy.EXACT,
+        query: Optional[UserQuery] = None,
+    ) -> int:
+        if query is not None and query.filtered:
+            # Cada combinação de filtros tem o seu total: sem cache nem estimativa
+            return (await self._db.scalar(count_users(query))) or 0
+        if strategy == CountStrategy.ESTIMATE:
+            estimate = await self._estimated_count()
+            if estimate is not None:
+                return estimate  # pragma: no cover
+        return await user_count_cache.get_or_load_async(self._exact_count)
+
+    async def get_change_version(self) -> int:
+        return await get_version_async(self._db)
+
+    async def _exact_count(self) -> int:
+        return (await self._db.scalar(select(func.count(UserModel.id)))) or 0
+
+    async def _estimated_count(self) -> Optional[int]:
+        """Estimativa do planner; só existe no PostgreSQL."""
+        if self._db.get_bind().dialect.name != "postgresql":
+            return None
+        return await self._pg_estimated_count()  # pragma: no cover
+
+    async def _pg_estimated_count(self) -> Optional[int]:  # pragma: no cover
+        # reltuples é -1 enquanto a tabela nunca foi analisada (VACUUM/ANALYZE)
+        estimate = await self._db.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'users'::regclass")
+        )
+        return estimate if estimate is not None and estimate >= 0 else None
+
+    async def update(
+        self,
+        user_id: UUID,
+        name: Optional[str] = None,
+        email: Optional[str] = None,
+        birth_date: Optional[date] = None,
+        role: Optional[UserRole] = None,
+        expected_version: Optional[datetime] = None,
+    ) -> Optional[User]:
+        values = update_values(name=name, email=email, birth_date=birth_date)
+        if role is not None:
+            current = (await self._db.execute(current_role(user_id))).first()
+            if current is None:
+                return None
+            if expected_version is not None and current.version != expected_version:
+                await self._db.rollback()
+                raise UserVersionConflictException(str(user_id))
+            if current.role != role.value:
+                values.update(role_change_values(role))
+                day = current.created_at.date()
+                await record_signups_async(
+                    self._db, Counter({(day, current.role): -1, (day, role.value): 1})
+                )
+        result = await self._execute_write(
+            update_user(user_id, values, expected_version), email
+        )
+        row = result.first()
+        if row is None:
+            await self._db.rollback()
+            await self._raise_if_exists(user_id, expected_version)
+            return None
+        await bump_version_async(self._db)
+        await self._db.commit()
+        return user_to_domain(row)
+
+    async def _raise_if_exists(
+        self, user_id: UUID, expected_version: Optional[datetime]
+    ) -> None:
+        if expected_version is not None and await self._db.scalar(user_exists(user_id)):
+            raise UserVersionConflictException(str(user_id))
+
+    async def update_password_hash(self, user_id: UUID, password_hash: str) -> None:
+        await self._db.execute(
+            update(UserModel)
+            .where(UserModel.id == user_id)
+            .values(password_hash=password_hash)
+        )
+        await self._db.commit()
+
+    async def get_token_version(self, user_id: UUID) -> Optional[int]:
+        return await self._db.scalar(
+            select(UserModel.token_version).where(UserModel.id == user_id)
+        )
+
+    async def release_connection(self) -> None:
+        await self._db.commit()
+
+    async def delete(
+        self, user_id: UUID, expected_version: Optional[datetime] = None
+    ) -> bool:
+        row = (await self._db.execute(delete_user(user_id, expected_version))).first()
+        if row is None:
+            await self._raise_if_exists(user_id, expected_version)
+            return False
+        await record_signups_async(
+            self._db, Counter({(row.created_at.date(), row.role): -1})
+        )
+        await bump_version_async(self._db)
+        await self._db.commit()
+        user_count_cache.invalidate()
+        return True
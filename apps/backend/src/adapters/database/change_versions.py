@@ -0,0 +1,58 @@
+import random
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .models import ChangeVersionModel
+
+USERS = "users"
+
+# Linhas por contador. Cada escrita incrementa uma delas, sorteada, e a versão
+# é a soma: escritas concorrentes só disputam o lock de linha quando caem na
+# mesma parte, em vez de todas esperarem pela mesma linha até o commit.
+SHARDS = 16
+
+
+def _bump_upsert(dialect: str, name: str):
+    upsert_insert = pg_insert if dialect == "postgresql" else sqlite_insert
+    stmt = upsert_insert(ChangeVersionModel).values(
+        name=name, shard=random.randrange(SHARDS), version=1
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[ChangeVersionModel.name, ChangeVersionModel.shard],
+        set_={"version": ChangeVersionModel.version + 1},
+    )
+
+
+def _version_query(name: str):
+    return select(func.sum(ChangeVersionModel.version)).where(
+        ChangeVersionModel.name == name
+    )
+
+
+def bump_version(db: Session, name: str = USERS) -> None:
+    """Incrementa a versão da tabela numa única instrução.
+
+    Não faz commit: deve rodar na mesma transação da escrita, para que a
+    versão nova só fique visível junto com os dados novos. O lock fica numa
+    das `SHARDS` linhas do contador, não nele inteiro.
+    """
+    db.execute(_bump_upsert(db.get_bind().dialect.name, name))
+
+
+async def bump_version_async(db: AsyncSession, name: str = USERS) -> None:
+    """Versão de `bump_version` para a sessão assíncrona."""
+    await db.execute(_bump_upsert(db.get_bind().dialect.name, name))
+
+
+def get_version(db: Session, name: str = USERS) -> int:
+    """Versão atual da tabela (0 se ela nunca foi alterada)."""
+    # SUM de BIGINT é NUMERIC no PostgreSQL
+    return int(db.scalar(_version_query(name)) or 0)
+
+
+async def get_version_async(db: AsyncSession, name: str = USERS) -> int:
+    return int(await db.scalar(_version_query(name)) or 0)
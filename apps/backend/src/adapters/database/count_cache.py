@@ -0,0 +1,53 @@
+import threading
+import time
+from typing import Awaitable, Callable, Optional
+
+
+class CountCache:
+    """Cache de uma contagem com TTL curto, invalidado pelas escritas.
+
+    A geração é incrementada a cada invalidação; um valor carregado durante
+    uma escrita concorrente é descartado em vez de sobrescrever o cache.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._value: Optional[int] = None
+        self._expires_at = 0.0
+        self._generation = 0
+
+    def _lookup(self) -> tuple[Optional[int], int]:
+        """Retorna o valor em cache (se válido) e a geração atual."""
+        with self._lock:
+            if self._value is not None and time.monotonic() < self._expires_at:
+                return self._value, self._generation
+            return None, self._generation
+
+    def _store(self, generation: int, value: int) -> None:
+        with self._lock:
+            if generation == self._generation:
+                self._value = value
+                self._expires_at = time.monotonic() + self._ttl
+
+    def get_or_load(self, loader: Callable[[], int]) -> int:
+        cached, generation = self._lookup()
+        if cached is not None:
+            return cached
+        value = loader()
+        self._store(generation, value)
+        return value
+
+    async def get_or_load_async(self, loader: Callable[[], Awaitable[int]]) -> int:
+        """Igual a `get_or_load`, para loaders assíncronos."""
+        cached, generation = self._lookup()
+        if cached is not None:
+            return cached
+        value = await loader()
+        self._store(generation, value)
+        return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._value = None
+            self._generation += 1
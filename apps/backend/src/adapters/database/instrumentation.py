@@ -0,0 +1,143 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+from ..metrics import PoolMetrics, metrics_registry, render_histogram
+
+db_statements = metrics_registry.counter(
+    "db_statements_total", "Comandos SQL executados.", ["operation"]
+)
+db_statement_duration = metrics_registry.histogram(
+    "db_statement_duration_seconds",
+    "Duração dos comandos SQL no driver.",
+    ["operation"],
+)
+
+_OPERATIONS = frozenset(
+    {"SELECT", "INSERT", "UPDATE", "DELETE", "BEGIN", "COMMIT", "ROLLBACK"}
+)
+
+
+@dataclass
+class QueryStats:
+    """Comandos SQL executados e tempo acumulado no driver num escopo."""
+
+    queries: int = 0
+    seconds: float = 0.0
+
+
+# Escopo atual (em geral, a requisição). Threads do threadpool e greenlets do
+# SQLAlchemy async herdam o contexto, então todos somam no mesmo objeto.
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Conta os comandos SQL executados dentro do bloco, em qualquer engine."""
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def _operation(statement: str) -> str:
+    """Primeira palavra do comando, limitada a um conjunto fixo de labels."""
+    parts = statement[:16].split(None, 1)
+    verb = parts[0].upper() if parts else ""
+    return verb if verb in _OPERATIONS else "OTHER"
+
+
+def _before_cursor_execute(conn, _cursor, _statement, _params, _context, _many):
+    conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+
+def _record(conn, statement: str) -> None:
+    elapsed = time.perf_counter() - conn.info["metrics_started"].pop()
+    operation = _operation(statement)
+    db_statements.inc(operation)
+    db_statement_duration.observe(elapsed, operation)
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += elapsed
+
+
+def _after_cursor_execute(conn, _cursor, statement, _params, _context, _many):
+    _record(conn, statement)
+
+
+def _handle_error(exception_context) -> None:
+    # Comando que falhou no driver (ex.: violação de unicidade): o
+    # after_cursor_execute não roda, então o início empilhado sai aqui. Sem
+    # isso a pilha cresce na conexão do pool e as medições seguintes usam o
+    # início errado.
+    conn = exception_context.connection
+    if (
+        conn is not None
+        and exception_context.execution_context is not None
+        and conn.info.get("metrics_started")
+    ):
+        _record(conn, exception_context.statement or "")
+
+
+def instrument_statements() -> None:
+    """Mede todos os comandos SQL de todos os engines do processo."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+
+
+# Pools exportados no /metrics: nome do engine -> (pool atual, telemetria).
+_pools: dict[str, tuple[Callable[[], Pool], PoolMetrics]] = {}
+
+
+def watch_pool(engine_name: str, engine: Engine, metrics: PoolMetrics) -> None:
+    """Exporta a telemetria do pool do engine no /metrics (label `engine`)."""
+    # engine.pool muda após dispose(); lê o atual a cada coleta
+    _pools[engine_name] = (lambda: engine.pool, metrics)
+
+
+def pool_snapshots() -> dict[str, dict]:
+    """Telemetria atual de cada pool observado, pelo nome do engine."""
+    return {
+        name: metrics.snapshot(get_pool())
+        for name, (get_pool, metrics) in _pools.items()
+    }
+
+
+def _collect_pools() -> list[str]:
+    series = {
+        "db_pool_checked_out": ("gauge", "Conexões em uso."),
+        "db_pool_checkouts_total": ("counter", "Checkouts de conexão."),
+        "db_pool_timeouts_total": ("counter", "Timeouts esperando conexão."),
+    }
+    snapshots = pool_snapshots()
+    lines: list[str] = []
+    for metric, (kind, documentation) in series.items():
+        key = metric.removeprefix("db_pool_").removesuffix("_total")
+        lines += [f"# HELP {metric} {documentation}", f"# TYPE {metric} {kind}"]
+        lines += [
+            f'{metric}{{engine="{name}"}} {snapshot[key]}'
+            for name, snapshot in snapshots.items()
+        ]
+    lines += [
+        "# HELP db_pool_wait_seconds Espera para obter uma conexão do pool.",
+        "# TYPE db_pool_wait_seconds histogram",
+    ]
+    for name, (_get_pool, metrics) in _pools.items():
+        lines += render_histogram(
+            "db_pool_wait_seconds", ("engine",), (name,), metrics.wait_seconds
+        )
+    return lines
+
+
+metrics_registry.add_collector(_collect_pools)
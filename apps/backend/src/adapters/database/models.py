@@ -1,7 +1,7 @@
 from datetime import date, datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import String, DateTime, Date
+from sqlalchemy import BigInteger, String, DateTime, Date, Index, Integer, SmallInteger
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .config import Base
@@ -11,6 +11,26 @@ class UserModel(Base):
     """Modelo SQLAlchemy para a tabela de usuários."""
 
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # Filtros e ordenações da listagem (ver user_statements.list_users):
+        # a role, quando filtrada, vem antes da coluna ordenada
+        Index("ix_users_role_created_at_id", "role", "created_at", "id"),
+        Index("ix_users_name_id", "name", "id"),
+        Index("ix_users_role_name_id", "role", "name", "id"),
+        Index("ix_users_role_email", "role", "email"),
+        Index("ix_users_birth_date", "birth_date"),
+        # Busca por trecho e similaridade (pg_trgm); só existem no PostgreSQL
+        *(
+            Index(
+                f"ix_users_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            ).ddl_if(dialect="postgresql")
+            for column in ("name", "email")
+        ),
+    )
 
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
     name: Mapped[str] = mapped_column(String(255))
@@ -22,6 +42,33 @@ class UserModel(Base):
     updated_at: Mapped[datetime | None] = mapped_column(
         DateTime, default=None, onupdate=datetime.utcnow
     )
+    # Incrementado quando a role muda, invalidando access tokens com claims
+    token_version: Mapped[int] = mapped_column(Integer, default=0)
 
     def __repr__(self) -> str:
         return f"<User(id={self.id}, name={self.name}, email={self.email})>"
+
+
+class UserSignupDailyModel(Base):
+    """Rollup de cadastros por dia e role, mantido pelo fluxo de escrita."""
+
+    __tablename__ = "user_signup_daily"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    role: Mapped[str] = mapped_column(String(50), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class ChangeVersionModel(Base):
+    """Contador de alterações por tabela, incrementado a cada escrita.
+
+    Serve de versão barata para ETags de listagens: somar as poucas linhas
+    do contador em vez de agregar a tabela inteira. Cada contador é dividido
+    em `shard`s para que escritas concorrentes não travem a mesma linha.
+    """
+
+    __tablename__ = "change_versions"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    shard: Mapped[int] = mapped_column(SmallInteger, primary_key=True, default=0)
+    version: Mapped[int] = mapped_column(BigInteger, default=0)
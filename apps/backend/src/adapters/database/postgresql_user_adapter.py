@@ -1,11 +1,59 @@
-from typing import Optional
+# pylint: disable=not-callable
+from collections import Counter
+from datetime import date, datetime
+from typing import Iterator, Optional
 from uuid import UUID
 
+from sqlalchemy import Result, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from domain import User, UserPersistencePort, UserRole
+from domain import (
+    CountStrategy,
+    SearchCursor,
+    User,
+    UserAlreadyExistsException,
+    UserCursor,
+    UserMatch,
+    UserPersistencePort,
+    UserQuery,
+    UserRole,
+    UserSelection,
+    UserVersionConflictException,
+    UserView,
+)
 
+from .change_versions import bump_version, get_version
+from .config import settings
+from .count_cache import CountCache
 from .models import UserModel
+from .signup_rollup import record_signups
+from .user_statements import (
+    count_users,
+    current_role,
+    delete_many,
+    delete_user,
+    insert_user,
+    is_email_conflict,
+    list_user_views,
+    list_users,
+    role_change_values,
+    search_users,
+    select_users,
+    select_views,
+    update_role_many,
+    update_user,
+    update_values,
+    user_exists,
+    user_to_domain,
+    user_to_row,
+    view_to_domain,
+)
+
+# Compartilhado entre requisições: o adapter é criado a cada request.
+user_count_cache = CountCache(settings.user_count_cache_ttl)
 
 
 class PostgreSQLUserAdapter(UserPersistencePort):
@@ -14,67 +62,271 @@ class PostgreSQLUserAdapter(UserPersistencePort):
     def __init__(self, db: Session):
         self._db = db
 
-    def _to_domain(self, model: UserModel) -> User:
-        """Converte modelo SQLAlchemy para entidade de domínio."""
-        return User(
-            id=model.id,
-            name=model.name,
-            email=model.email,
-            password_hash=model.password_hash,
-            role=UserRole(model.role),
-            birth_date=model.birth_date,
-            created_at=model.created_at,
-            updated_at=model.updated_at,
-        )
+    def _execute_write(self, stmt, email: Optional[str]) -> Result:
+        """Executa a escrita; conflito no índice de email vira exceção de domínio."""
+        try:
+            return self._db.execute(stmt)
+        except IntegrityError as e:
+            self._db.rollback()
+            if is_email_conflict(e):
+                raise UserAlreadyExistsException(email or "") from e
+            raise
 
-    def _to_model(self, user: User) -> UserModel:
-        """Converte entidade de domínio para modelo SQLAlchemy."""
-        return UserModel(
-            id=user.id,
-            name=user.name,
-            email=user.email,
-            password_hash=user.password_hash,
-            role=user.role.value,
-            birth_date=user.birth_date,
-            created_at=user.created_at,
-            updated_at=user.updated_at,
+    def save(self, user: User) -> User:
+        self._execute_write(insert_user(user), user.email)
+        record_signups(
+            self._db, Counter({(user.created_at.date(), user.role.value): 1})
         )
+        bump_version(self._db)
+        self._db.commit()
+        user_count_cache.invalidate()
+        return user
 
-    def save(self, user: User) -> User:
-        model = self._to_model(user)
-        self._db.add(model)
+    def save_many(self, users: list[User]) -> set[UUID]:
+        if not users:
+            return set()
+        # Um único INSERT multi-linha; conflitos de email (inclusive de uma
+        # importação concorrente) são ignorados e ficam de fora do RETURNING.
+        dialect = self._db.get_bind().dialect.name
+        upsert_insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        stmt = (
+            upsert_insert(UserModel)
+            .values([user_to_row(user) for user in users])
+            .on_conflict_do_nothing(index_elements=[UserModel.email])
+            .returning(UserModel.id)
+        )
+        inserted = set(self._db.scalars(stmt))
+        record_signups(
+            self._db,
+            Counter(
+                (user.created_at.date(), user.role.value)
+                for user in users
+                if user.id in inserted
+            ),
+        )
+        if inserted:
+            bump_version(self._db)
         self._db.commit()
-        self._db.refresh(model)
-        return self._to_domain(model)
+        if inserted:
+            user_count_cache.invalidate()
+        return inserted
+
+    def _first(self, *conditions) -> Optional[User]:
+        row = self._db.execute(select_users(*conditions).limit(1)).first()
+        return user_to_domain(row) if row else None
 
     def find_by_email(self, email: str) -> Optional[User]:
-        model = self._db.query(UserModel).filter(UserModel.email == email).first()
-        return self._to_domain(model) if model else None
+        return self._first(UserModel.email == email)
 
     def find_by_id(self, user_id: UUID) -> Optional[User]:
-        model = self._db.query(UserModel).filter(UserModel.id == user_id).first()
-        return self._to_domain(model) if model else None
-
-    def find_all(self, skip: int = 0, limit: int = 100) -> list[User]:
-        models = self._db.query(UserModel).offset(skip).limit(limit).all()
-        return [self._to_domain(model) for model in models]
-
-    def update(self, user: User) -> User:
-        model = self._db.query(UserModel).filter(UserModel.id == user.id).first()
-        if model:
-            model.name = user.name
-            model.email = user.email
-            model.birth_date = user.birth_date
-            model.updated_at = user.updated_at
-            self._db.commit()
-            self._db.refresh(model)
-            return self._to_domain(model)
-        raise ValueError(f"User with id {user.id} not found")
-
-    def delete(self, user_id: UUID) -> bool:
-        model = self._db.query(UserModel).filter(UserModel.id == user_id).first()
-        if model:
-            self._db.delete(model)
-            self._db.commit()
-            return True
-        return False
+        return self._first(UserModel.id == user_id)
+
+    def find_by_ids(self, user_ids: list[UUID]) -> list[User]:
+        if not user_ids:
+            return []
+        rows = self._db.execute(select_users(UserModel.id.in_(user_ids)))
+        return [user_to_domain(row) for row in rows]
+
+    def find_view_by_id(self, user_id: UUID) -> Optional[UserView]:
+        row = self._db.execute(select_views(UserModel.id == user_id).limit(1)).first()
+        return view_to_domain(row) if row else None
+
+    def find_views_by_ids(self, user_ids: list[UUID]) -> list[UserView]:
+        if not user_ids:
+            return []
+        rows = self._db.execute(select_views(UserModel.id.in_(user_ids)))
+        return [view_to_domain(row) for row in rows]
+
+    def find_existing_emails(self, emails: list[str]) -> set[str]:
+        if not emails:
+            return set()
+        return set(
+            self._db.scalars(select(UserModel.email).where(UserModel.email.in_(emails)))
+        )
+
+    def find_all(
+        self, skip: int = 0, limit: int = 100, query: Optional[UserQuery] = None
+    ) -> list[User]:
+        statement = list_users(query or UserQuery()).offset(skip).limit(limit)
+        return [user_to_domain(row) for row in self._db.execute(statement)]
+
+    def find_after(
+        self,
+        cursor: Optional[UserCursor] = None,
+        limit: int = 100,
+        query: Optional[UserQuery] = None,
+    ) -> list[User]:
+        statement = list_users(query or UserQuery(), cursor).limit(limit)
+        return [user_to_domain(row) for row in self._db.execute(statement)]
+
+    def find_all_views(
+        self, skip: int = 0, limit: int = 100, query: Optional[UserQuery] = None
+    ) -> list[UserView]:
+        statement = list_user_views(query or UserQuery()).offset(skip).limit(limit)
+        return [view_to_domain(row) for row in self._db.execute(statement)]
+
+    def find_views_after(
+        self,
+        cursor: Optional[UserCursor] = None,
+        limit: int = 100,
+        query: Optional[UserQuery] = None,
+    ) -> list[UserView]:
+        statement = list_user_views(query or UserQuery(), cursor).limit(limit)
+        return [view_to_domain(row) for row in self._db.execute(statement)]
+
+    def search(
+        self, query: str, limit: int = 20, cursor: Optional[SearchCursor] = None
+    ) -> list[UserMatch]:
+        dialect = self._db.get_bind().dialect.name
+        rows = self._db.execute(search_users(dialect, query, limit, cursor))
+        return [UserMatch(user=user_to_domain(row), score=row.score) for row in rows]
+
+    def stream_all(self, batch_size: int = 1000) -> Iterator[list[User]]:
+        # Core em vez de ORM: as linhas não passam pelo identity map da Session,
+        # e yield_per liga o stream_results (cursor do lado do servidor).
+        result = self._db.execute(
+            select_users()
+            .order_by(UserModel.created_at, UserModel.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for rows in result.partitions():
+            yield [user_to_domain(row) for row in rows]
+
+    def count(
+        self,
+        strategy: CountStrategy = CountStrategy.EXACT,
+        query: Optional[UserQuery] = None,
+    ) -> int:
+        if query is not None and query.filtered:
+            # Cada combinação de filtros tem o seu total: sem cache nem estimativa
+            return self._db.scalar(count_users(query)) or 0
+        if strategy == CountStrategy.ESTIMATE:
+            estimate = self._estimated_count()
+            if estimate is not None:
+                return estimate  # pragma: no cover
+        return user_count_cache.get_or_load(
+            lambda: self._db.query(func.count(UserModel.id)).scalar() or 0
+        )
+
+    def get_change_version(self) -> int:
+        return get_version(self._db)
+
+    def _estimated_count(self) -> Optional[int]:
+        """Estimativa do planner; só existe no PostgreSQL."""
+        if self._db.get_bind().dialect.name != "postgresql":
+            return None
+        return self._pg_estimated_count()  # pragma: no cover
+
+    def _pg_estimated_count(self) -> Optional[int]:  # pragma: no cover
+        # reltuples é -1 enquanto a tabela nunca foi analisada (VACUUM/ANALYZE)
+        estimate = self._db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'users'::regclass")
+        ).scalar()
+        return estimate if estimate is not None and estimate >= 0 else None
+
+    def update(
+        self,
+        user_id: UUID,
+        name: Optional[str] = None,
+        email: Optional[str] = None,
+        birth_date: Optional[date] = None,
+        role: Optional[UserRole] = None,
+        expected_version: Optional[datetime] = None,
+    ) -> Optional[User]:
+        values = update_values(name=name, email=email, birth_date=birth_date)
+        if role is not None:
+            # A troca de role move o usuário de bucket no rollup, então só
+            # nela é preciso ler (e travar) a role atual antes do UPDATE.
+            current = self._db.execute(current_role(user_id)).first()
+            if current is None:
+                return None
+            if expected_version is not None and current.version != expected_version:
+                self._db.rollback()
+                raise UserVersionConflictException(str(user_id))
+            if current.role != role.value:
+                values.update(role_change_values(role))
+                day = current.created_at.date()
+                record_signups(
+                    self._db, Counter({(day, current.role): -1, (day, role.value): 1})
+                )
+        row = self._execute_write(
+            update_user(user_id, values, expected_version), email
+        ).first()
+        if row is None:
+            self._db.rollback()
+            self._raise_if_exists(user_id, expected_version)
+            return None
+        bump_version(self._db)
+        self._db.commit()
+        return user_to_domain(row)
+
+    def _raise_if_exists(
+        self, user_id: UUID, expected_version: Optional[datetime]
+    ) -> None:
+        """Escrita condicional sem efeito: usuário inexistente ou versão antiga."""
+        if expected_version is not None and self._db.scalar(user_exists(user_id)):
+            raise UserVersionConflictException(str(user_id))
+
+    def update_role_many(
+        self, selection: UserSelection, role: UserRole
+    ) -> dict[UUID, int]:
+        versions: dict[UUID, int] = {}
+        deltas: Counter = Counter()
+        for previous in UserRole:
+            if previous == role:
+                continue
+            rows = self._db.execute(update_role_many(selection, previous, role))
+            for row in rows:
+                versions[row.id] = row.token_version
+                day = row.created_at.date()
+                deltas[(day, previous.value)] -= 1
+                deltas[(day, role.value)] += 1
+        record_signups(self._db, deltas)
+        if versions:
+            bump_version(self._db)
+        self._db.commit()
+        return versions
+
+    def update_password_hash(self, user_id: UUID, password_hash: str) -> None:
+        self._db.execute(
+            update(UserModel)
+            .where(UserModel.id == user_id)
+            .values(password_hash=password_hash)
+        )
+        self._db.commit()
+
+    def get_token_version(self, user_id: UUID) -> Optional[int]:
+        return self._db.execute(
+            select(UserModel.token_version).where(UserModel.id == user_id)
+        ).scalar_one_or_none()
+
+    def release_connection(self) -> None:
+        # Sem escritas pendentes o commit só encerra a transação de leitura;
+        # a Session pega outra conexão do pool no próximo acesso.
+        self._db.commit()
+
+    def delete(
+        self, user_id: UUID, expected_version: Optional[datetime] = None
+    ) -> bool:
+        row = self._db.execute(delete_user(user_id, expected_version)).first()
+        if row is None:
+            self._raise_if_exists(user_id, expected_version)
+            return False
+        record_signups(self._db, Counter({(row.created_at.date(), row.role): -1}))
+        bump_version(self._db)
+        self._db.commit()
+        user_count_cache.invalidate()
+        return True
+
+    def delete_many(self, selection: UserSelection) -> list[UUID]:
+        rows = self._db.execute(delete_many(selection)).all()
+        deltas: Counter = Counter()
+        for row in rows:
+            deltas[(row.created_at.date(), row.role)] -= 1
+        record_signups(self._db, deltas)
+        if rows:
+            bump_version(self._db)
+        self._db.commit()
+        if rows:
+            user_count_cache.invalidate()
+        return [row.id for row in rows]
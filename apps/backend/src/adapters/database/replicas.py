@@ -0,0 +1,129 @@
+import itertools
+import math
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional, Sequence
+
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+
+from ..metrics import InstrumentedQueuePool, instrument_pool
+from .change_versions import get_version
+from .config import SessionLocal, _pool_options, settings
+from .instrumentation import watch_pool
+
+
+class ReadReplicas:
+    """Réplicas de leitura, escolhidas em rodízio entre as que estão em dia.
+
+    O atraso (lag) de cada réplica é medido pelo contador `change_versions`,
+    que toda escrita incrementa, sem depender de funções do PostgreSQL: a
+    cada `check_interval` segundos, amostra a versão do primário e a de cada
+    réplica. O lag de uma réplica é há quanto tempo o primário já tinha uma
+    versão que ela ainda não tem. Réplicas com lag acima de `max_lag`, ou
+    inacessíveis, ficam de fora até a próxima verificação; sem nenhuma em
+    dia, `session()` retorna None e a leitura vai ao primário.
+    """
+
+    def __init__(
+        self,
+        primary: sessionmaker,
+        replicas: Sequence[sessionmaker],
+        max_lag: float = 2.0,
+        check_interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._primary = primary
+        self._replicas = list(replicas)
+        self._max_lag = max_lag
+        self._check_interval = check_interval
+        self._clock = clock
+        # (instante, versão do primário), da mais antiga para a mais nova
+        self._samples: deque[tuple[float, int]] = deque()
+        self._in_sync: list[sessionmaker] = []
+        self._checked_at: Optional[float] = None
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+
+    def session(self) -> Optional[Session]:
+        """Sessão numa réplica em dia, ou None para ler do primário."""
+        if not self._replicas:
+            return None
+        in_sync = self._refresh()
+        if not in_sync:
+            return None
+        db = in_sync[next(self._turn) % len(in_sync)]()
+        db.info["replica"] = True
+        return db
+
+    def _refresh(self) -> list[sessionmaker]:
+        """Revalida as réplicas, no máximo uma vez por `check_interval`."""
+        now = self._clock()
+        if (
+            self._checked_at is not None
+            and now - self._checked_at < self._check_interval
+        ):
+            return self._in_sync
+        # Uma thread revalida; as demais seguem com o resultado anterior
+        # pylint: disable-next=consider-using-with
+        if not self._lock.acquire(blocking=False):
+            return self._in_sync
+        try:
+            self._checked_at = now
+            self._samples.append((now, _version(self._primary)))
+            # Basta uma amostra com mais de max_lag segundos: ficar atrás
+            # dela já tira a réplica do rodízio
+            while len(self._samples) > 1 and now - self._samples[1][0] >= self._max_lag:
+                self._samples.popleft()
+            self._in_sync = [
+                replica
+                for replica in self._replicas
+                if self._lag(replica, now) <= self._max_lag
+            ]
+            return self._in_sync
+        finally:
+            self._lock.release()
+
+    def _lag(self, replica: sessionmaker, now: float) -> float:
+        try:
+            version = _version(replica)
+        except SQLAlchemyError:
+            return math.inf
+        for index, (sampled_at, primary_version) in enumerate(self._samples):
+            if primary_version > version:
+                # Atrás até da amostra mais antiga: não se sabe há quanto tempo
+                return now - sampled_at if index else math.inf
+        return 0.0
+
+
+def _version(factory: sessionmaker) -> int:
+    with factory() as db:
+        return get_version(db)
+
+
+def _read_engine(index: int, url: str) -> Engine:  # pragma: no cover
+    """Engine (e pool) da réplica, exportado no /metrics como replicaN."""
+    read_engine = create_engine(url, echo=False, **_pool_options(InstrumentedQueuePool))
+    watch_pool(f"replica{index}", read_engine, instrument_pool(read_engine))
+    return read_engine
+
+
+read_engines = [
+    _read_engine(index, url) for index, url in enumerate(settings.database_read_urls)
+]
+read_replicas = ReadReplicas(
+    SessionLocal,
+    [
+        sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+        for read_engine in read_engines
+    ],
+    max_lag=settings.replica_max_lag,
+    check_interval=settings.replica_check_interval,
+)
+
+
+def get_read_replicas() -> ReadReplicas:
+    """Dependency para obter as réplicas de leitura (ver `get_request_db`)."""
+    return read_replicas
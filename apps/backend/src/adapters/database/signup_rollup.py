@@ -0,0 +1,105 @@
+# pylint: disable=not-callable
+from collections import Counter
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .models import UserModel, UserSignupDailyModel
+
+SignupKey = tuple[date, str]
+
+
+def _signups_upsert(dialect: str, deltas: Counter[SignupKey]):
+    """Monta o upsert do rollup, ou None se não há deltas a aplicar."""
+    values = [
+        {"day": day, "role": role, "count": delta}
+        for (day, role), delta in deltas.items()
+        if delta
+    ]
+    if not values:
+        return None
+    upsert_insert = pg_insert if dialect == "postgresql" else sqlite_insert
+    stmt = upsert_insert(UserSignupDailyModel).values(values)
+    return stmt.on_conflict_do_update(
+        index_elements=[UserSignupDailyModel.day, UserSignupDailyModel.role],
+        set_={"count": UserSignupDailyModel.count + stmt.excluded.count},
+    )
+
+
+def record_signups(db: Session, deltas: Counter[SignupKey]) -> None:
+    """Aplica incrementos (ou decrementos) ao rollup diário numa única instrução.
+
+    Não faz commit: deve rodar na mesma transação da escrita em `users`.
+    """
+    stmt = _signups_upsert(db.get_bind().dialect.name, deltas)
+    if stmt is not None:
+        db.execute(stmt)
+
+
+async def record_signups_async(db: AsyncSession, deltas: Counter[SignupKey]) -> None:
+    """Versão de `record_signups` para a sessão assíncrona."""
+    stmt = _signups_upsert(db.get_bind().dialect.name, deltas)
+    if stmt is not None:
+        await db.execute(stmt)
+
+
+def backfill_signup_daily(db: Session) -> int:
+    """Reconstrói o rollup a partir da tabela `users`.
+
+    Retorna o número de linhas (dia, role) gravadas.
+    """
+    day = func.date(UserModel.created_at)
+    db.execute(delete(UserSignupDailyModel))
+    db.execute(
+        insert(UserSignupDailyModel).from_select(
+            ["day", "role", "count"],
+            select(day, UserModel.role, func.count(UserModel.id)).group_by(
+                day, UserModel.role
+            ),
+        )
+    )
+    db.commit()
+    return db.query(func.count()).select_from(UserSignupDailyModel).scalar() or 0
+
+
+def signup_totals(db: Session, since: date) -> tuple[int, dict[date, int]]:
+    """Retorna o total de cadastros e a contagem diária a partir de `since`.
+
+    Dias anteriores a `since` caem no bucket NULL, de modo que a soma de
+    todos os buckets é o total geral.
+    """
+    bucket = case(
+        (UserSignupDailyModel.day >= since, UserSignupDailyModel.day),
+        else_=None,
+    ).label("signup_day")
+    rows = db.execute(
+        select(bucket, func.sum(UserSignupDailyModel.count)).group_by("signup_day")
+    ).all()
+
+    total = 0
+    per_day: dict[date, int] = {}
+    for day, count in rows:
+        total += count or 0
+        if day is not None:
+            per_day[day] = count or 0
+    return total, per_day
+
+
+def signups_by_day(
+    db: Session, start: date, end: date, role: Optional[str] = None
+) -> dict[date, int]:
+    """Retorna a contagem de cadastros por dia no intervalo [start, end]."""
+    query = (
+        select(UserSignupDailyModel.day, func.sum(UserSignupDailyModel.count))
+        .where(UserSignupDailyModel.day >= start)
+        .where(UserSignupDailyModel.day <= end)
+        .group_by(UserSignupDailyModel.day)
+    )
+    if role is not None:
+        query = query.where(UserSignupDailyModel.role == role)
+    return {day: count or 0 for day, count in db.execute(query).all()}
@@ -0,0 +1,393 @@
+"""Comandos de escrita em `users`, compartilhados pelos adapters sync e async.
+
+Cada escrita é um único INSERT/UPDATE/DELETE; o que o adapter precisa da
+linha volta no RETURNING, e a unicidade do email fica a cargo do índice
+`ix_users_email` em vez de um SELECT antes da escrita.
+"""
+
+from datetime import date, datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import (
+    Float,
+    and_,
+    case,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
+
+from domain import (
+    SearchCursor,
+    User,
+    UserCursor,
+    UserQuery,
+    UserRole,
+    UserSelection,
+    UserSortField,
+    UserView,
+)
+
+from .models import UserModel
+
+users = UserModel.__table__
+EMAIL_INDEX = "ix_users_email"
+# Role a partir do valor gravado. `UserRole(valor)` passa pelo
+# EnumMeta.__call__ e custa quase tanto quanto montar o User inteiro.
+ROLES = {role.value: role for role in UserRole}
+
+
+def user_to_domain(row) -> User:
+    """Converte uma linha de `users` (colunas na ordem da tabela) em User.
+
+    Desempacota a linha por posição: ler coluna a coluna pelo nome
+    (`row.name`) custa mais que montar o User. Colunas extras ao final, como
+    o `score` da busca, são ignoradas. Os argumentos seguem a ordem dos
+    campos de User.
+    """
+    (
+        user_id,
+        name,
+        email,
+        password_hash,
+        role,
+        birth_date,
+        created_at,
+        updated_at,
+        token_version,
+        *_,
+    ) = row
+    return User(
+        name,
+        email,
+        password_hash,
+        ROLES[role],
+        user_id,
+        birth_date,
+        created_at,
+        updated_at,
+        token_version,
+    )
+
+
+def select_users(*conditions):
+    """SELECT de todas as colunas de `users`, na ordem de `user_to_domain`."""
+    return select(users).where(*conditions)
+
+
+def user_to_row(user: User) -> dict:
+    """Converte entidade de domínio para os valores de um INSERT em `users`."""
+    return {
+        "id": user.id,
+        "name": user.name,
+        "email": user.email,
+        "password_hash": user.password_hash,
+        "role": user.role.value,
+        "birth_date": user.birth_date,
+        "created_at": user.created_at,
+        "updated_at": user.updated_at,
+        "token_version": user.token_version,
+    }
+
+
+def insert_user(user: User):
+    return insert(users).values(user_to_row(user))
+
+
+def update_values(
+    name: Optional[str] = None,
+    email: Optional[str] = None,
+    birth_date: Optional[date] = None,
+) -> dict:
+    """Valores do UPDATE para os campos informados (None = não altera).
+
+    Nome e email vão nas claims do access token: se algum deles muda de
+    fato, a versão de token é incrementada no mesmo UPDATE (o lado direito
+    do SET lê os valores antigos), e os tokens com os dados velhos caem.
+    """
+    values: dict = {"updated_at": datetime.utcnow()}
+    claimed = []
+    if name is not None:
+        values["name"] = name
+        claimed.append(users.c.name.is_distinct_from(name))
+    if email is not None:
+        values["email"] = email
+        claimed.append(users.c.email.is_distinct_from(email))
+    if birth_date is not None:
+        values["birth_date"] = birth_date
+    if claimed:
+        values["token_version"] = case(
+            (or_(*claimed), users.c.token_version + 1),
+            else_=users.c.token_version,
+        )
+    return values
+
+
+def role_change_values(role: UserRole) -> dict:
+    """Troca de role: incrementa a versão de token, revogando os tokens.
+
+    Substitui a versão calculada por `update_values`: com a role mudando,
+    o incremento é incondicional.
+    """
+    return {"role": role.value, "token_version": users.c.token_version + 1}
+
+
+def user_version():
+    """`User.version` em SQL: a última alteração, ou o cadastro."""
+    return func.coalesce(users.c.updated_at, users.c.created_at)
+
+
+def _by_id(user_id: UUID, expected_version: Optional[datetime]) -> list:
+    conditions = [users.c.id == user_id]
+    if expected_version is not None:
+        conditions.append(user_version() == expected_version)
+    return conditions
+
+
+def current_role(user_id: UUID):
+    """Role, data de cadastro e versão atuais, travando a linha até o commit."""
+    return (
+        select(users.c.role, users.c.created_at, user_version().label("version"))
+        .where(users.c.id == user_id)
+        .with_for_update()
+    )
+
+
+def user_exists(user_id: UUID):
+    return select(users.c.id).where(users.c.id == user_id)
+
+
+def update_user(
+    user_id: UUID, values: dict, expected_version: Optional[datetime] = None
+):
+    """UPDATE de um usuário; com `expected_version`, só se a versão bater."""
+    return (
+        update(users)
+        .where(*_by_id(user_id, expected_version))
+        .values(**values)
+        .returning(*users.c)
+    )
+
+
+def delete_user(user_id: UUID, expected_version: Optional[datetime] = None):
+    return (
+        delete(users)
+        .where(*_by_id(user_id, expected_version))
+        .returning(users.c.created_at, users.c.role)
+    )
+
+
+def _violated_constraint(orig) -> Optional[str]:
+    """Nome da constraint violada, como o driver do PostgreSQL informa."""
+    diag = getattr(orig, "diag", None)
+    if diag is not None:  # psycopg
+        return diag.constraint_name
+    # asyncpg: o erro original vem encadeado ao erro DBAPI do SQLAlchemy
+    return getattr(orig.__cause__, "constraint_name", None)
+
+
+def is_email_conflict(error: IntegrityError) -> bool:
+    """Indica violação do índice único `ix_users_email`.
+
+    No PostgreSQL, pelo nome da constraint; o SQLite não o informa, então
+    vale a mensagem, que cita a coluna.
+    """
+    constraint = _violated_constraint(error.orig)
+    if constraint is not None:
+        return constraint == EMAIL_INDEX
+    return str(error.orig) == "UNIQUE constraint failed: users.email"
+
+
+def selection_filter(selection: UserSelection) -> list:
+    """Condições do WHERE para os critérios da seleção."""
+    conditions = []
+    if selection.ids is not None:
+        conditions.append(users.c.id.in_(selection.ids))
+    if selection.role is not None:
+        conditions.append(users.c.role == selection.role.value)
+    if selection.created_from is not None:
+        conditions.append(users.c.created_at >= selection.created_from)
+    if selection.created_to is not None:
+        conditions.append(users.c.created_at < selection.created_to)
+    return conditions
+
+
+def update_role_many(selection: UserSelection, previous: UserRole, role: UserRole):
+    """Move os selecionados de `previous` para `role`.
+
+    Um UPDATE por role de origem: o RETURNING só expõe os valores novos, e
+    assim a role antiga (necessária para o rollup) é conhecida.
+    """
+    return (
+        update(users)
+        .where(*selection_filter(selection), users.c.role == previous.value)
+        .values(
+            updated_at=datetime.utcnow(),
+            **role_change_values(role),
+        )
+        .returning(users.c.id, users.c.created_at, users.c.token_version)
+    )
+
+
+def delete_many(selection: UserSelection):
+    return (
+        delete(users)
+        .where(*selection_filter(selection))
+        .returning(users.c.id, users.c.created_at, users.c.role)
+    )
+
+
+def query_filter(query: UserQuery) -> list:
+    """Condições do WHERE para os filtros da listagem."""
+    conditions = []
+    if query.role is not None:
+        conditions.append(users.c.role == query.role.value)
+    if query.created_from is not None:
+        conditions.append(users.c.created_at >= query.created_from)
+    if query.created_to is not None:
+        conditions.append(users.c.created_at < query.created_to)
+    if query.birth_from is not None:
+        conditions.append(users.c.birth_date >= query.birth_from)
+    if query.birth_to is not None:
+        conditions.append(users.c.birth_date < query.birth_to)
+    return conditions
+
+
+def _sort_columns(sort: UserSortField) -> tuple:
+    """Colunas do ORDER BY; o email é único e dispensa o id como desempate."""
+    if sort == UserSortField.NAME:
+        return users.c.name, users.c.id
+    if sort == UserSortField.EMAIL:
+        return (users.c.email,)
+    return users.c.created_at, users.c.id
+
+
+def _cursor_values(sort: UserSortField, cursor: UserCursor) -> tuple:
+    """Valores do cursor na mesma ordem de `_sort_columns`."""
+    if sort == UserSortField.NAME:
+        return cursor.key, cursor.id
+    if sort == UserSortField.EMAIL:
+        return (cursor.key,)
+    return cursor.created_at, cursor.id
+
+
+def list_users(query: UserQuery, cursor: Optional[UserCursor] = None):
+    """SELECT da listagem: filtros, ordenação e, com cursor, o keyset.
+
+    Cada combinação de filtro e ordenação tem um índice que a atende (ver
+    `UserModel.__table_args__`), então a página não exige ordenar a tabela.
+    """
+    columns = _sort_columns(query.sort)
+    statement = select_users(*query_filter(query))
+    if cursor is not None:
+        position = tuple_(*columns)
+        after = tuple_(*_cursor_values(query.sort, cursor))
+        statement = statement.where(
+            position < after if query.descending else position > after
+        )
+    return statement.order_by(
+        *(column.desc() if query.descending else column for column in columns)
+    )
+
+
+# Colunas de UserView, na ordem dos campos: leituras que só respondem à API
+# não carregam password_hash nem passam pelo identity map da Session.
+VIEW_COLUMNS = (
+    users.c.name,
+    users.c.email,
+    users.c.id,
+    users.c.role,
+    users.c.birth_date,
+    users.c.created_at,
+    users.c.updated_at,
+)
+
+
+def view_to_domain(row) -> UserView:
+    """Converte uma linha de VIEW_COLUMNS em UserView, por posição."""
+    name, email, user_id, role, birth_date, created_at, updated_at = row
+    return UserView(
+        name, email, user_id, ROLES[role], birth_date, created_at, updated_at
+    )
+
+
+def select_views(*conditions):
+    return select(*VIEW_COLUMNS).where(*conditions)
+
+
+def list_user_views(query: UserQuery, cursor: Optional[UserCursor] = None):
+    """`list_users` com apenas as colunas de UserView."""
+    return list_users(query, cursor).with_only_columns(*VIEW_COLUMNS)
+
+
+def count_users(query: UserQuery):
+    return (
+        select(func.count())  # pylint: disable=not-callable
+        .select_from(users)
+        .where(*query_filter(query))
+    )
+
+
+def _like_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _search_ranking(dialect: str, query: str):
+    """(condição, relevância) da busca por nome ou email.
+
+    Prefixo vale 1 ponto a mais que um trecho no meio. No PostgreSQL a
+    relevância soma a similaridade por trigramas, que também aceita grafias
+    parecidas; nos demais bancos (SQLite nos testes) só há prefixo e
+    trecho, via LIKE.
+    """
+    prefix = f"{_like_escape(query)}%"
+    contains = f"%{_like_escape(query)}%"
+    is_prefix = or_(
+        users.c.name.ilike(prefix, escape="\\"),
+        users.c.email.ilike(prefix, escape="\\"),
+    )
+    condition = or_(
+        users.c.name.ilike(contains, escape="\\"),
+        users.c.email.ilike(contains, escape="\\"),
+    )
+    bonus = case((is_prefix, literal(1.0, Float)), else_=literal(0.0, Float))
+    if dialect == "postgresql":
+        return _pg_trigram_ranking(query, condition, bonus)  # pragma: no cover
+    return condition, bonus + literal(0.5, Float)
+
+
+def _pg_trigram_ranking(query: str, condition, bonus):  # pragma: no cover
+    # ILIKE '%q%' e o operador % (similaridade) usam os índices GIN
+    # gin_trgm_ops de nome e email
+    similarity = func.greatest(
+        func.similarity(users.c.name, query, type_=Float),
+        func.similarity(users.c.email, query, type_=Float),
+        type_=Float,
+    )
+    return (
+        or_(condition, users.c.name.op("%")(query), users.c.email.op("%")(query)),
+        bonus + similarity,
+    )
+
+
+def search_users(
+    dialect: str, query: str, limit: int, cursor: Optional[SearchCursor] = None
+):
+    """SELECT da busca, por relevância e id, paginado por keyset."""
+    condition, score = _search_ranking(dialect, query)
+    stmt = select(users, score.label("score")).where(condition)
+    if cursor is not None:
+        stmt = stmt.where(
+            or_(
+                score < cursor.score,
+                and_(score == cursor.score, users.c.id > cursor.id),
+            )
+        )
+    return stmt.order_by(score.desc(), users.c.id).limit(limit)
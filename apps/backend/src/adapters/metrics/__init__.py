@@ -0,0 +1,29 @@
+from .histogram import Histogram
+from .registry import (
+    Counter,
+    Gauge,
+    HistogramFamily,
+    MetricsRegistry,
+    metrics_registry,
+    render_histogram,
+)
+from .pool import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    PoolMetrics,
+    instrument_pool,
+)
+
+__all__ = [
+    "Histogram",
+    "Counter",
+    "Gauge",
+    "HistogramFamily",
+    "MetricsRegistry",
+    "metrics_registry",
+    "render_histogram",
+    "InstrumentedAsyncAdaptedQueuePool",
+    "InstrumentedQueuePool",
+    "PoolMetrics",
+    "instrument_pool",
+]
@@ -0,0 +1,39 @@
+import bisect
+import threading
+from typing import Sequence
+
+# Limites em segundos, de 1 ms a 10 s; o último bucket é +Inf.
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Histograma cumulativo thread-safe com buckets fixos.
+
+    Segue o modelo do Prometheus: cada bucket conta as observações menores
+    ou iguais ao seu limite, além de soma e total de observações.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self._bounds = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        buckets: dict[str, int] = {}
+        cumulative = 0
+        for bound, bucket_count in zip(self._bounds + (float("inf"),), counts):
+            cumulative += bucket_count
+            buckets["+Inf" if bound == float("inf") else f"{bound:g}"] = cumulative
+        return {"buckets": buckets, "sum": total, "count": count}
@@ -0,0 +1,106 @@
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from .histogram import Histogram
+
+
+class PoolMetrics:
+    """Telemetria de um pool de conexões.
+
+    Conexões em uso, aberturas, checkouts e invalidações vêm dos eventos de
+    pool do SQLAlchemy; a espera por uma conexão e os timeouts são medidos
+    pelas classes de pool instrumentadas abaixo.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checked_out = 0
+        self.connections_opened = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.invalidations = 0
+        self.wait_seconds = Histogram()
+
+    def _incr(self, name: str, delta: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + delta)
+
+    def listen(self, pool: Pool) -> None:
+        """Registra os listeners de eventos no pool."""
+        event.listen(pool, "connect", lambda *_: self._incr("connections_opened"))
+        event.listen(pool, "checkout", lambda *_: self._on_checkout())
+        event.listen(pool, "checkin", lambda *_: self._incr("checked_out", -1))
+        event.listen(pool, "invalidate", lambda *_: self._incr("invalidations"))
+
+    def record_wait(self, seconds: float, timed_out: bool) -> None:
+        self.wait_seconds.observe(seconds)
+        if timed_out:
+            self._incr("timeouts")
+
+    def _on_checkout(self) -> None:
+        with self._lock:
+            self.checked_out += 1
+            self.checkouts += 1
+
+    def snapshot(self, pool: Pool) -> dict:
+        config: dict = {}
+        if isinstance(pool, QueuePool):
+            config = {
+                "pool_size": pool.size(),
+                "max_overflow": getattr(pool, "_max_overflow"),
+                "open": pool.size() + pool.overflow(),
+                "idle": pool.checkedin(),
+            }
+        with self._lock:
+            counters = {
+                "checked_out": self.checked_out,
+                "connections_opened": self.connections_opened,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "invalidations": self.invalidations,
+            }
+        return {**config, **counters, "wait_seconds": self.wait_seconds.snapshot()}
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool que mede o tempo de obtenção de conexão e conta os timeouts."""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.record_wait(time.perf_counter() - started, timed_out)
+
+    def recreate(self):
+        # engine.dispose() recria o pool; a telemetria segue para o novo
+        pool = super().recreate()
+        if isinstance(pool, InstrumentedQueuePool):
+            pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """Versão instrumentada do pool usado pelo engine assíncrono."""
+
+
+def instrument_pool(engine: Engine) -> PoolMetrics:
+    """Liga a telemetria ao pool do engine e a retorna."""
+    metrics = PoolMetrics()
+    pool = engine.pool
+    if isinstance(pool, InstrumentedQueuePool):
+        pool.metrics = metrics
+    metrics.listen(pool)
+    return metrics
@@ -0,0 +1,164 @@
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable, Sequence
+
+from .histogram import DEFAULT_BUCKETS, Histogram
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Iterable[str]) -> str:
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return f"{{{pairs}}}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Family(ABC):
+    """Família de séries de uma métrica, uma por combinação de labels."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+    @abstractmethod
+    def render(self) -> list[str]:
+        """Linhas da família no formato de texto do Prometheus."""
+
+
+class Counter(_Family):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+            for labels, value in values
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class HistogramFamily(_Family):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._buckets = tuple(buckets)
+        self._children: dict[LabelValues, Histogram] = {}
+
+    def labels(self, *labels: str) -> Histogram:
+        child = self._children.get(labels)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(labels, Histogram(self._buckets))
+        return child
+
+    def observe(self, value: float, *labels: str) -> None:
+        self.labels(*labels).observe(value)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            children = list(self._children.items())
+        lines = self.header()
+        for labels, histogram in children:
+            lines += render_histogram(self.name, self.labelnames, labels, histogram)
+        return lines
+
+
+def render_histogram(
+    name: str, labelnames: Sequence[str], labels: LabelValues, histogram: Histogram
+) -> list[str]:
+    """Linhas `_bucket`, `_sum` e `_count` de um histograma."""
+    snapshot = histogram.snapshot()
+    bucket_names = tuple(labelnames) + ("le",)
+    lines = [
+        f"{name}_bucket{_labels(bucket_names, labels + (bound,))} {count}"
+        for bound, count in snapshot["buckets"].items()
+    ]
+    lines.append(f"{name}_sum{_labels(labelnames, labels)} {snapshot['sum']!r}")
+    lines.append(f"{name}_count{_labels(labelnames, labels)} {snapshot['count']}")
+    return lines
+
+
+class MetricsRegistry:
+    """Registro de métricas do processo, renderizado no formato do Prometheus.
+
+    Além das famílias registradas, aceita coletores: funções chamadas na
+    renderização que devolvem linhas prontas (para expor estado que já é
+    mantido em outro lugar, como a telemetria do pool).
+    """
+
+    def __init__(self) -> None:
+        self._families: list[_Family] = []
+        self._collectors: list[Callable[[], list[str]]] = []
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS
+    ) -> HistogramFamily:
+        return self._register(HistogramFamily(name, documentation, labelnames, buckets))
+
+    def _register(self, family):
+        self._families.append(family)
+        return family
+
+    def add_collector(self, collector: Callable[[], list[str]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for family in self._families:
+            lines += family.render()
+        for collector in self._collectors:
+            lines += collector()
+        return "\n".join(lines) + "\n"
+
+
+# Registro único do processo, servido em /metrics.
+metrics_registry = MetricsRegistry()
@@ -0,0 +1,172 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
+
+from adapters import settings
+from application import AsyncAuthService
+from domain import (
+    AsyncUserPersistencePort,
+    InvalidCredentialsException,
+    User,
+    UserAlreadyExistsException,
+    UserRole,
+)
+
+from .auth_routes import security
+from .dependencies import get_async_user_persistence, password_hasher
+from .schemas import (
+    LoginRequest,
+    TokenResponse,
+    RefreshTokenRequest,
+    RefreshTokenResponse,
+    UserCreate,
+    UserResponse,
+    UserRoleEnum,
+)
+
+# Mesmas rotas de auth_routes, servidas pelo stack assíncrono (ASYNC_API).
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+
+def _auth_user_response(user: User) -> UserResponse:
+    return UserResponse.model_construct(
+        id=user.id,
+        name=user.name,
+        email=user.email,
+        role=UserRoleEnum(user.role.value),
+        created_at=user.created_at,
+        updated_at=user.updated_at,
+    )
+
+
+def get_async_auth_service(
+    adapter: AsyncUserPersistencePort = Depends(get_async_user_persistence),
+) -> AsyncAuthService:
+    """Dependency para obter o serviço assíncrono de autenticação."""
+    return AsyncAuthService(
+        adapter,
+        claims_tokens=settings.auth_claims_tokens,
+        hasher=password_hasher,
+    )
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    service: AsyncAuthService = Depends(get_async_auth_service),
+) -> UserResponse:
+    """Dependency para obter o usuário atual do token."""
+    user = await service.get_user_from_token(credentials.credentials)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token inválido ou expirado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return _auth_user_response(user)
+
+
+async def require_admin(
+    current_user: UserResponse = Depends(get_current_user),
+) -> UserResponse:
+    """Dependency que requer role admin."""
+    if current_user.role != UserRoleEnum.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Acesso negado. Requer permissão de administrador.",
+        )
+    return current_user
+
+
+@router.post(
+    "/register",
+    response_model=UserResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Registrar usuário",
+    description="Registra um novo usuário no sistema.",
+)
+async def register(
+    user_data: UserCreate,
+    service: AsyncAuthService = Depends(get_async_auth_service),
+) -> UserResponse:
+    try:
+        user = await service.register_user(
+            name=user_data.name,
+            email=user_data.email,
+            password=user_data.password,
+            role=UserRole(user_data.role.value),
+        )
+    except UserAlreadyExistsException as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=e.message,
+        ) from e
+    return _auth_user_response(user)
+
+
+@router.post(
+    "/login",
+    response_model=TokenResponse,
+    summary="Login",
+    description="Autentica um usuário e retorna tokens.",
+)
+async def login(
+    login_data: LoginRequest,
+    service: AsyncAuthService = Depends(get_async_auth_service),
+) -> TokenResponse:
+    try:
+        user = await service.authenticate(login_data.email, login_data.password)
+    except InvalidCredentialsException as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=e.message,
+        ) from e
+    return TokenResponse(
+        access_token=service.create_access_token(user.id, user),
+        refresh_token=service.create_refresh_token(user.id),
+        user=_auth_user_response(user),
+    )
+
+
+@router.post(
+    "/refresh",
+    response_model=RefreshTokenResponse,
+    summary="Refresh token",
+    description="Gera um novo access token a partir do refresh token.",
+)
+async def refresh_token(
+    token_data: RefreshTokenRequest,
+    service: AsyncAuthService = Depends(get_async_auth_service),
+) -> RefreshTokenResponse:
+    result = await service.refresh_access_token(token_data.refresh_token)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token inválido ou expirado",
+        )
+
+    new_access_token, user = result
+    return RefreshTokenResponse(
+        access_token=new_access_token, user=_auth_user_response(user)
+    )
+
+
+@router.get(
+    "/me",
+    response_model=UserResponse,
+    summary="Usuário atual",
+    description="Retorna os dados do usuário autenticado.",
+)
+async def get_me(
+    current_user: UserResponse = Depends(get_current_user),
+) -> UserResponse:
+    return current_user
+
+
+@router.post(
+    "/logout",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Logout",
+    description="Invalida a sessão do usuário (client-side).",
+)
+async def logout() -> None:  # pragma: no cover
+    # JWT é stateless, o logout é feito no client removendo os tokens
+    return None
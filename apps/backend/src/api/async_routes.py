@@ -0,0 +1,214 @@
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+
+from adapters import settings
+from application import AsyncAuthService, AsyncUserService
+from domain import (
+    AsyncUserPersistencePort,
+    CountStrategy,
+    InvalidCursorException,
+    UserAlreadyExistsException,
+    UserNotFoundException,
+    UserQuery,
+    UserVersionConflictException,
+    UserRole,
+)
+
+from .async_auth_routes import get_async_auth_service, get_current_user, require_admin
+from .etags import expected_version, list_etag, none_match, not_modified, user_etag
+from .dependencies import get_async_user_persistence
+from .responses import FastJSONResponse
+from .routes import _user_to_response, user_list_query
+from .schemas import (
+    CountStrategyEnum,
+    UserCreate,
+    UserListResponse,
+    UserResponse,
+    UserUpdate,
+)
+
+# Mesmas rotas de routes, servidas pelo stack assíncrono (ASYNC_API).
+router = APIRouter(prefix="/users", tags=["users"])
+
+
+def get_async_user_service(
+    adapter: AsyncUserPersistencePort = Depends(get_async_user_persistence),
+) -> AsyncUserService:
+    """Dependency para obter o serviço assíncrono de usuários."""
+    return AsyncUserService(adapter)
+
+
+@router.post(
+    "",
+    response_model=UserResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Criar usuário",
+    description="Cria um novo usuário no sistema. Requer permissão de admin.",
+)
+async def create_user(
+    user_data: UserCreate,
+    _current_user: UserResponse = Depends(require_admin),
+    service: AsyncAuthService = Depends(get_async_auth_service),
+) -> UserResponse:
+    try:
+        user = await service.register_user(
+            name=user_data.name,
+            email=user_data.email,
+            password=user_data.password,
+            role=UserRole(user_data.role.value),
+            birth_date=user_data.birth_date,
+        )
+    except UserAlreadyExistsException as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=e.message,
+        ) from e
+    return _user_to_response(user)
+
+
+@router.get(
+    "",
+    response_model=UserListResponse,
+    summary="Listar usuários",
+    description=(
+        "Lista os usuários, por padrão ordenados por data de criação. Filtra "
+        "por role e por intervalos [from, to) de cadastro e de nascimento, e "
+        "ordena por `created_at`, `name` ou `email` (`-` inverte), tudo no "
+        "banco. Aceita paginação por offset (`skip`) ou por cursor (`cursor`, "
+        "vindo de `next_cursor`, válido só para a mesma ordenação). O `total` "
+        "é exato (com cache curto, sem filtros) ou estimado, conforme `count`. "
+        "Com `If-None-Match` igual à ETag atual, responde 304."
+    ),
+)
+async def list_users(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    count: Optional[CountStrategyEnum] = None,
+    query: UserQuery = Depends(user_list_query),
+    if_none_match: Optional[str] = Header(None),
+    _current_user: UserResponse = Depends(get_current_user),
+    service: AsyncUserService = Depends(get_async_user_service),
+) -> Response:
+    etag = list_etag(await service.get_change_version())
+    if none_match(if_none_match, etag):
+        return not_modified(etag)
+    strategy = CountStrategy(count.value if count else settings.user_count_strategy)
+    try:
+        page = await service.list_users(
+            skip=skip, limit=limit, cursor=cursor, count_strategy=strategy, query=query
+        )
+    except InvalidCursorException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message,
+        ) from e
+    # UserView já tem os campos de UserResponse, na mesma ordem
+    return FastJSONResponse(
+        {"users": page.users, "total": page.total, "next_cursor": page.next_cursor},
+        headers={"ETag": etag},
+    )
+
+
+@router.get(
+    "/{user_id}",
+    response_model=UserResponse,
+    summary="Buscar usuário",
+    description=(
+        "Busca um usuário pelo ID. A resposta traz a ETag do usuário; com "
+        "`If-None-Match` igual a ela, responde 304."
+    ),
+)
+async def get_user(
+    user_id: UUID,
+    if_none_match: Optional[str] = Header(None),
+    _current_user: UserResponse = Depends(get_current_user),
+    service: AsyncUserService = Depends(get_async_user_service),
+) -> Response:
+    try:
+        user = await service.get_user(user_id)
+    except UserNotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=e.message,
+        ) from e
+    etag = user_etag(user)
+    if none_match(if_none_match, etag):
+        return not_modified(etag)
+    return FastJSONResponse(user, headers={"ETag": etag})
+
+
+@router.put(
+    "/{user_id}",
+    response_model=UserResponse,
+    summary="Atualizar usuário",
+    description=(
+        "Atualiza um usuário existente. Requer permissão de admin. Com "
+        "`If-Match`, só atualiza se a ETag ainda for a atual (senão, 412)."
+    ),
+)
+async def update_user(
+    user_id: UUID,
+    user_data: UserUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    _current_user: UserResponse = Depends(require_admin),
+    service: AsyncUserService = Depends(get_async_user_service),
+) -> UserResponse:
+    try:
+        user = await service.update_user(
+            user_id=user_id,
+            name=user_data.name,
+            email=user_data.email,
+            birth_date=user_data.birth_date,
+            role=UserRole(user_data.role.value) if user_data.role else None,
+            expected_version=expected_version(if_match, user_id),
+        )
+    except UserNotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=e.message,
+        ) from e
+    except UserAlreadyExistsException as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=e.message,
+        ) from e
+    except UserVersionConflictException as e:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=e.message,
+        ) from e
+    response.headers["ETag"] = user_etag(user)
+    return _user_to_response(user)
+
+
+@router.delete(
+    "/{user_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Deletar usuário",
+    description=(
+        "Deleta um usuário existente. Requer permissão de admin. Com "
+        "`If-Match`, só deleta se a ETag ainda for a atual (senão, 412)."
+    ),
+)
+async def delete_user(
+    user_id: UUID,
+    if_match: Optional[str] = Header(None),
+    _current_user: UserResponse = Depends(require_admin),
+    service: AsyncUserService = Depends(get_async_user_service),
+) -> None:
+    try:
+        await service.delete_user(user_id, expected_version(if_match, user_id))
+    except UserNotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=e.message,
+        ) from e
+    except UserVersionConflictException as e:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=e.message,
+        ) from e
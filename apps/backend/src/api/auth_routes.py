@@ -1,10 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
 
-from adapters import PostgreSQLUserAdapter, get_db
+from adapters import settings
 from application import AuthService
-from domain import InvalidCredentialsException, UserAlreadyExistsException, UserRole
+from domain import (
+    InvalidCredentialsException,
+    UserAlreadyExistsException,
+    UserPersistencePort,
+    UserRole,
+)
+
+from .dependencies import get_user_persistence, password_hasher
 
 from .schemas import (
     LoginRequest,
@@ -20,10 +26,15 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 security = HTTPBearer()
 
 
-def get_auth_service(db: Session = Depends(get_db)) -> AuthService:
+def get_auth_service(
+    adapter: UserPersistencePort = Depends(get_user_persistence),
+) -> AuthService:
     """Dependency para obter o serviço de autenticação."""
-    adapter = PostgreSQLUserAdapter(db)
-    return AuthService(adapter)
+    return AuthService(
+        adapter,
+        claims_tokens=settings.auth_claims_tokens,
+        hasher=password_hasher,
+    )
 
 
 def get_current_user(
@@ -39,7 +50,7 @@ def get_current_user(
             detail="Token inválido ou expirado",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return UserResponse(
+    return UserResponse.model_construct(
         id=user.id,
         name=user.name,
         email=user.email,
@@ -79,7 +90,7 @@ def register(
             password=user_data.password,
             role=UserRole(user_data.role.value),
         )
-        return UserResponse(
+        return UserResponse.model_construct(
             id=user.id,
             name=user.name,
             email=user.email,
@@ -106,13 +117,13 @@ def login(
 ) -> TokenResponse:
     try:
         user = service.authenticate(login_data.email, login_data.password)
-        access_token = service.create_access_token(user.id)
+        access_token = service.create_access_token(user.id, user)
         refresh_token = service.create_refresh_token(user.id)
 
         return TokenResponse(
             access_token=access_token,
             refresh_token=refresh_token,
-            user=UserResponse(
+            user=UserResponse.model_construct(
                 id=user.id,
                 name=user.name,
                 email=user.email,
@@ -148,7 +159,7 @@ def refresh_token(
     new_access_token, user = result
     return RefreshTokenResponse(
         access_token=new_access_token,
-        user=UserResponse(
+        user=UserResponse.model_construct(
             id=user.id,
             name=user.name,
             email=user.email,
@@ -0,0 +1,491 @@
+import codecs
+import csv
+import io
+import json
+from collections import Counter
+from typing import AsyncIterator, Iterator, Optional, Union
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from adapters import settings
+from application import UserImportService, UserService
+from domain import (
+    ImportResult,
+    ImportRow,
+    ImportStatus,
+    InvalidCursorException,
+    InvalidUserDataException,
+    User,
+    UserPersistencePort,
+    UserRole,
+    UserSelection,
+)
+
+from .auth_routes import get_current_user, require_admin
+from .dependencies import get_user_persistence, password_hasher
+from .responses import DuplexStreamingResponse, FastJSONResponse
+from .routes import _utc, get_user_service
+from .schemas import (
+    BULK_MAX_IDS,
+    ExportFormatEnum,
+    UserBatchGetRequest,
+    UserBatchResponse,
+    UserBulkDelete,
+    UserBulkResponse,
+    UserBulkUpdate,
+    UserCreate,
+    UserResponse,
+    UserRoleEnum,
+    UserSearchResponse,
+    UserSearchResult,
+    UserSelectionRequest,
+)
+
+router = APIRouter(prefix="/users", tags=["users"])
+
+NDJSON = "application/x-ndjson"
+CSV = "text/csv"
+
+# Usuários lidos do cursor e enviados ao cliente por vez na exportação.
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_FIELDS = (
+    "id",
+    "name",
+    "email",
+    "role",
+    "birth_date",
+    "created_at",
+    "updated_at",
+)
+
+
+def get_user_import_service(
+    adapter: UserPersistencePort = Depends(get_user_persistence),
+) -> UserImportService:
+    """Dependency para obter o serviço de importação em lote."""
+    return UserImportService(adapter, hasher=password_hasher)
+
+
+class _UploadTooLarge(Exception):
+    """O corpo passou de BULK_IMPORT_MAX_BYTES enquanto era lido."""
+
+
+async def _lines(chunks: AsyncIterator[bytes], max_bytes: int) -> AsyncIterator[str]:
+    """Corta o corpo em linhas (com o terminador) conforme os pedaços chegam.
+
+    Só a linha incompleta do fim do pedaço fica guardada até o próximo. Ao
+    passar de `max_bytes`, as linhas completas até o limite ainda saem.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    received = 0
+    pending = ""
+    async for chunk in chunks:
+        allowed = max_bytes - received
+        received += len(chunk)
+        *complete, pending = (pending + decoder.decode(chunk[:allowed])).split("\n")
+        for line in complete:
+            yield line + "\n"
+        if received > max_bytes:
+            raise _UploadTooLarge
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def _csv_records(lines: AsyncIterator[str]) -> AsyncIterator[tuple[int, object]]:
+    # Um registro CSV pode ocupar várias linhas (campo entre aspas com quebra
+    # de linha): junta as linhas até as aspas fecharem antes de interpretar.
+    header: Optional[list[str]] = None
+    record = ""
+    line = 0
+    async for raw in lines:
+        line += 1
+        record += raw
+        if record.count('"') % 2:
+            continue
+        rows = list(csv.reader([record]))
+        record = ""
+        for values in rows:
+            if not values:
+                continue
+            if header is None:
+                header = values
+                continue
+            # Campos vazios contam como ausentes; colunas extras são ignoradas
+            yield line, {key: value for key, value in zip(header, values) if value}
+
+
+async def _records(
+    lines: AsyncIterator[str], media_type: str
+) -> AsyncIterator[tuple[int, object]]:
+    """Lê (linha, registro) do corpo; JSON malformado vira a mensagem de erro."""
+    if media_type == CSV:
+        async for entry in _csv_records(lines):
+            yield entry
+        return
+    line = 0
+    async for raw in lines:
+        line += 1
+        if not raw.strip():
+            continue
+        try:
+            yield line, json.loads(raw)
+        except json.JSONDecodeError as e:
+            yield line, f"JSON inválido: {e.msg}"
+
+
+def _validate(line: int, record: object) -> Union[ImportRow, ImportResult]:
+    """Valida o registro com o mesmo schema do POST /api/users."""
+    if isinstance(record, str):
+        return ImportResult(line=line, status=ImportStatus.INVALID, detail=record)
+    try:
+        data = UserCreate.model_validate(record)
+    except ValidationError as e:
+        return ImportResult(
+            line=line,
+            status=ImportStatus.INVALID,
+            email=record.get("email") if isinstance(record, dict) else None,
+            detail="; ".join(
+                f"{'.'.join(str(part) for part in error['loc']) or 'linha'}: "
+                f"{error['msg']}"
+                for error in e.errors()
+            ),
+        )
+    return ImportRow(
+        line=line,
+        name=data.name,
+        email=data.email,
+        password=data.password,
+        role=UserRole(data.role.value),
+        birth_date=data.birth_date,
+    )
+
+
+def _import_batch(
+    service: UserImportService, entries: list[Union[ImportRow, ImportResult]]
+) -> list[ImportResult]:
+    """Importa as linhas válidas e intercala os inválidos, na ordem do arquivo."""
+    rows = [entry for entry in entries if isinstance(entry, ImportRow)]
+    imported = iter(service.import_batch(rows) if rows else [])
+    return [
+        next(imported) if isinstance(entry, ImportRow) else entry for entry in entries
+    ]
+
+
+def _result_line(result: ImportResult) -> str:
+    report = {"line": result.line, "status": result.status.value}
+    if result.email is not None:
+        report["email"] = result.email
+    if result.id is not None:
+        report["id"] = str(result.id)
+    if result.detail is not None:
+        report["detail"] = result.detail
+    return json.dumps(report, ensure_ascii=False) + "\n"
+
+
+async def _import_report(
+    service: UserImportService,
+    chunks: AsyncIterator[bytes],
+    media_type: str,
+    batch_size: int,
+    max_bytes: int,
+) -> AsyncIterator[str]:
+    """Valida e importa o upload lote a lote, enquanto ele ainda chega.
+
+    Cada lote completo vai ao banco (numa thread do threadpool) e tem seu
+    relatório emitido antes de o próximo pedaço do corpo ser lido.
+    """
+    totals: Counter[str] = Counter({status.value: 0 for status in ImportStatus})
+    entries: list[Union[ImportRow, ImportResult]] = []
+    error = None
+    try:
+        async for line, record in _records(_lines(chunks, max_bytes), media_type):
+            entries.append(_validate(line, record))
+            if len(entries) >= batch_size:
+                for result in await run_in_threadpool(_import_batch, service, entries):
+                    totals[result.status.value] += 1
+                    yield _result_line(result)
+                entries = []
+    except _UploadTooLarge:
+        # Sem Content-Length o limite só aparece no meio do envio, com a
+        # resposta já começada: o que chegou inteiro é importado e a
+        # interrupção vai no relatório.
+        error = f"Upload acima de {max_bytes} bytes; o restante foi ignorado"
+    for result in await run_in_threadpool(_import_batch, service, entries):
+        totals[result.status.value] += 1
+        yield _result_line(result)
+    if error is not None:
+        yield json.dumps({"error": error}, ensure_ascii=False) + "\n"
+    yield json.dumps({"summary": dict(totals)}) + "\n"
+
+
+@router.post(
+    "/bulk",
+    summary="Importar usuários em lote",
+    description=(
+        "Importa usuários de um arquivo NDJSON (`application/x-ndjson`, um "
+        "objeto por linha) ou CSV (`text/csv`, com cabeçalho), com os campos "
+        "do POST /api/users. Emails já cadastrados ou repetidos são pulados. "
+        "Responde em NDJSON, uma linha de resultado por registro seguida de "
+        "um resumo. As linhas são validadas e importadas em lotes enquanto "
+        "o arquivo é enviado, e o relatório de cada lote sai em seguida. "
+        "Uploads acima de BULK_IMPORT_MAX_BYTES são recusados com 413. "
+        "Requer permissão de admin."
+    ),
+    response_class=StreamingResponse,
+    responses={200: {"content": {NDJSON: {}}}},
+)
+async def import_users(
+    request: Request,
+    _current_user: UserResponse = Depends(require_admin),
+    service: UserImportService = Depends(get_user_import_service),
+) -> StreamingResponse:
+    media_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if media_type.lower() not in (NDJSON, CSV):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Envie {NDJSON} ou {CSV}",
+        )
+
+    max_bytes = settings.bulk_import_max_bytes
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"Envie no máximo {max_bytes} bytes por importação",
+        )
+    return DuplexStreamingResponse(
+        _import_report(
+            service,
+            request.stream(),
+            media_type.lower(),
+            settings.bulk_import_batch_size,
+            max_bytes,
+        ),
+        media_type=NDJSON,
+    )
+
+
+def _export_values(user: User) -> tuple:
+    """Campos exportados do usuário (sem o hash de senha), como texto ou None."""
+    return (
+        str(user.id),
+        user.name,
+        user.email,
+        user.role.value,
+        user.birth_date.isoformat() if user.birth_date else None,
+        user.created_at.isoformat(),
+        user.updated_at.isoformat() if user.updated_at else None,
+    )
+
+
+def _export_ndjson(chunks: Iterator[list[User]]) -> Iterator[str]:
+    for users in chunks:
+        yield "".join(
+            json.dumps(
+                dict(zip(EXPORT_FIELDS, _export_values(user))), ensure_ascii=False
+            )
+            + "\n"
+            for user in users
+        )
+
+
+def _export_csv(chunks: Iterator[list[User]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for users in chunks:
+        writer.writerows(_export_values(user) for user in users)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@router.get(
+    "/export",
+    summary="Exportar usuários",
+    description=(
+        "Exporta todos os usuários, ordenados por data de criação, em NDJSON "
+        "ou CSV. A resposta é gerada em streaming a partir de um cursor no "
+        "banco, sem montar a lista inteira em memória. Requer permissão de "
+        "admin."
+    ),
+    response_class=StreamingResponse,
+    responses={200: {"content": {NDJSON: {}, CSV: {}}}},
+)
+def export_users(
+    export_format: ExportFormatEnum = Query(ExportFormatEnum.NDJSON, alias="format"),
+    _current_user: UserResponse = Depends(require_admin),
+    service: UserService = Depends(get_user_service),
+) -> StreamingResponse:
+    chunks = service.export_users(EXPORT_CHUNK_SIZE)
+    if export_format == ExportFormatEnum.CSV:
+        body, media_type = _export_csv(chunks), CSV
+    else:
+        body, media_type = _export_ndjson(chunks), NDJSON
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="users.{export_format.value}"'
+            )
+        },
+    )
+
+
+def _selection(request: UserSelectionRequest) -> UserSelection:
+    try:
+        return UserSelection(
+            ids=tuple(request.ids) if request.ids is not None else None,
+            role=UserRole(request.role.value) if request.role else None,
+            created_from=_utc(request.created_from),
+            created_to=_utc(request.created_to),
+        )
+    except InvalidUserDataException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message,
+        ) from e
+
+
+@router.patch(
+    "/bulk",
+    response_model=UserBulkResponse,
+    summary="Atualizar usuários em lote",
+    description=(
+        "Troca a role de todos os usuários selecionados (por ids e/ou pelos "
+        "filtros role e intervalo de criação [created_from, created_to)) "
+        "numa única transação. Retorna os ids alterados; quem já tinha a "
+        "role não conta. Requer permissão de admin."
+    ),
+)
+def bulk_update_users(
+    payload: UserBulkUpdate,
+    _current_user: UserResponse = Depends(require_admin),
+    service: UserService = Depends(get_user_service),
+) -> UserBulkResponse:
+    ids = service.update_role_many(
+        _selection(payload.selection), UserRole(payload.role.value)
+    )
+    return UserBulkResponse(ids=ids, count=len(ids))
+
+
+@router.post(
+    "/bulk-delete",
+    response_model=UserBulkResponse,
+    summary="Remover usuários em lote",
+    description=(
+        "Remove todos os usuários selecionados (por ids e/ou pelos filtros "
+        "role e intervalo de criação) numa única transação e retorna os ids "
+        "removidos. Requer permissão de admin."
+    ),
+)
+def bulk_delete_users(
+    payload: UserBulkDelete,
+    _current_user: UserResponse = Depends(require_admin),
+    service: UserService = Depends(get_user_service),
+) -> UserBulkResponse:
+    ids = service.delete_many(_selection(payload.selection))
+    return UserBulkResponse(ids=ids, count=len(ids))
+
+
+def _batch_get(service: UserService, ids: list[UUID]) -> FastJSONResponse:
+    users, missing = service.get_users(ids)
+    return FastJSONResponse({"users": users, "missing": missing})
+
+
+@router.post(
+    "/batch-get",
+    response_model=UserBatchResponse,
+    summary="Buscar vários usuários",
+    description=(
+        f"Busca até {BULK_MAX_IDS} usuários por id numa única consulta. Os "
+        "usuários vêm na ordem pedida (sem repetições) e os ids inexistentes "
+        "são listados em `missing`."
+    ),
+)
+def batch_get_users(
+    payload: UserBatchGetRequest,
+    _current_user: UserResponse = Depends(get_current_user),
+    service: UserService = Depends(get_user_service),
+) -> FastJSONResponse:
+    return _batch_get(service, payload.ids)
+
+
+@router.get(
+    "/batch-get",
+    response_model=UserBatchResponse,
+    summary="Buscar vários usuários (query string)",
+    description=(
+        "Mesmo que o POST /api/users/batch-get, com os ids na query string "
+        "(`?ids=...&ids=...` ou separados por vírgula)."
+    ),
+)
+def batch_get_users_query(
+    ids: list[str] = Query(..., min_length=1),
+    _current_user: UserResponse = Depends(get_current_user),
+    service: UserService = Depends(get_user_service),
+) -> FastJSONResponse:
+    try:
+        payload = UserBatchGetRequest(
+            ids=[value for item in ids for value in item.split(",") if value]
+        )
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=e.errors(include_url=False, include_context=False),
+        ) from e
+    return _batch_get(service, payload.ids)
+
+
+@router.get(
+    "/search",
+    response_model=UserSearchResponse,
+    summary="Buscar usuários por nome ou email",
+    description=(
+        "Busca por prefixo e por trecho do nome ou do email, sem diferenciar "
+        "maiúsculas. Os resultados vêm por relevância (prefixo primeiro); no "
+        "PostgreSQL, a similaridade por trigramas (pg_trgm) também pontua e "
+        "encontra nomes com pequenos erros de digitação. Use `next_cursor` "
+        "para a próxima página."
+    ),
+)
+def search_users(
+    q: str = Query(..., min_length=3, max_length=100, description="Termo buscado"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor da página anterior"),
+    _current_user: UserResponse = Depends(get_current_user),
+    service: UserService = Depends(get_user_service),
+) -> FastJSONResponse:
+    try:
+        page = service.search_users(q, limit=limit, cursor=cursor)
+    except InvalidCursorException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message,
+        ) from e
+    return FastJSONResponse(
+        UserSearchResponse.model_construct(
+            users=[
+                UserSearchResult.model_construct(
+                    id=match.user.id,
+                    name=match.user.name,
+                    email=match.user.email,
+                    role=UserRoleEnum(match.user.role.value),
+                    birth_date=match.user.birth_date,
+                    created_at=match.user.created_at,
+                    updated_at=match.user.updated_at,
+                    score=match.score,
+                )
+                for match in page.matches
+            ],
+            next_cursor=page.next_cursor,
+        )
+    )
@@ -0,0 +1,81 @@
+from typing import Iterator, Optional
+
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from adapters import (
+    AsyncPostgreSQLUserAdapter,
+    CachedUserPersistenceAdapter,
+    PostgreSQLUserAdapter,
+    ReadReplicas,
+    get_async_db,
+    get_db,
+    get_read_replicas,
+    settings,
+    user_entity_cache,
+)
+from application import PasswordHasher, PasswordHashingPool
+from domain import AsyncUserPersistencePort, UserPersistencePort
+
+from .metrics import observe_password_hash
+from .replicas import READ_METHODS, pinned_to_primary
+
+# Criado uma vez por processo; os workers sobem sob demanda no primeiro uso.
+password_hashing_pool: Optional[PasswordHashingPool] = (
+    PasswordHashingPool(
+        workers=settings.password_hash_workers,
+        max_pending=settings.password_hash_max_pending,
+        use_processes=settings.password_hash_executor == "process",
+    )
+    if settings.password_hash_executor != "inline"
+    else None
+)
+
+# Hasher único do processo, montado na subida a partir das configurações.
+password_hasher = PasswordHasher(
+    schemes=settings.password_hash_schemes,
+    bcrypt_rounds=settings.password_hash_bcrypt_rounds,
+    pool=password_hashing_pool,
+    observer=observe_password_hash,
+)
+
+
+def get_request_db(
+    request: Request,
+    db: Session = Depends(get_db),
+    replicas: ReadReplicas = Depends(get_read_replicas),
+) -> Iterator[Session]:
+    """Dependency com a sessão da requisição: primário ou réplica de leitura.
+
+    GET e HEAD leem de uma réplica em dia, salvo logo após uma escrita do
+    próprio cliente. A sessão do primário só conecta se for usada.
+    """
+    if request.method in READ_METHODS and not pinned_to_primary(request):
+        replica = replicas.session()
+        if replica is not None:
+            try:
+                yield replica
+            finally:
+                replica.close()
+            return
+    yield db
+
+
+def get_user_persistence(
+    db: Session = Depends(get_request_db),
+) -> UserPersistencePort:
+    """Dependency para obter o adapter de persistência de usuários."""
+    adapter: UserPersistencePort = PostgreSQLUserAdapter(db)
+    # O cache é do processo: preenchê-lo a partir de uma réplica atrasada
+    # serviria dados velhos mesmo a quem lê do primário
+    if settings.user_cache_enabled and not db.info.get("replica"):
+        adapter = CachedUserPersistenceAdapter(adapter, user_entity_cache)
+    return adapter
+
+
+def get_async_user_persistence(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncUserPersistencePort:
+    """Dependency para obter o adapter assíncrono de persistência de usuários."""
+    return AsyncPostgreSQLUserAdapter(db)
@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import Optional, Union
+from uuid import UUID
+
+from fastapi import HTTPException, Response, status
+
+from domain import User, UserView
+
+ETAG_STAMP = "%Y%m%dT%H%M%S%f"
+
+
+def user_etag(user: Union[User, UserView]) -> str:
+    """ETag forte do usuário: id e `User.version` (última alteração)."""
+    return f'"{user.id.hex}.{user.version.strftime(ETAG_STAMP)}"'
+
+
+def list_etag(version: int) -> str:
+    """ETag da listagem: a versão da tabela, que muda a cada escrita."""
+    return f'"users.{version}"'
+
+
+def none_match(if_none_match: Optional[str], etag: str) -> bool:
+    """Indica se o If-None-Match cobre a ETag atual, ou seja, se cabe um 304.
+
+    Usa a comparação fraca, como pede a RFC 9110 para o If-None-Match.
+    """
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+def not_modified(etag: str) -> Response:
+    """304 sem corpo: nada de montar (nem serializar) o schema de resposta."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def expected_version(if_match: Optional[str], user_id: UUID) -> Optional[datetime]:
+    """Versão do usuário exigida pelo If-Match, para escrita otimista.
+
+    Retorna None sem If-Match (ou com `*`). Uma ETag fraca, de outro
+    usuário ou malformada nunca corresponde e responde 412 na hora.
+    """
+    if not if_match:
+        return None
+    tags = [tag.strip() for tag in if_match.split(",")]
+    if "*" in tags:
+        return None
+    prefix = f'"{user_id.hex}.'
+    for tag in tags:
+        if tag.startswith(prefix) and tag.endswith('"'):
+            try:
+                return datetime.strptime(tag[len(prefix) : -1], ETAG_STAMP)
+            except ValueError:
+                continue
+    raise HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="If-Match não corresponde à versão atual do usuário",
+    )
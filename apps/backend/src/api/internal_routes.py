@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends
+
+from adapters import pool_snapshots, settings, user_entity_cache
+from application import verified_tokens
+
+from .auth_routes import require_admin
+
+# Telemetria interna: só para admins e fora do schema OpenAPI público
+router = APIRouter(
+    prefix="/internal",
+    tags=["internal"],
+    dependencies=[Depends(require_admin)],
+    include_in_schema=False,
+)
+
+# Engines que abrem conexões no primário; as réplicas de leitura ficam de fora
+PRIMARY_POOLS = ("sync", "async")
+
+
+@router.get(
+    "/cache",
+    summary="Métricas de cache",
+    description=(
+        "Contadores dos caches de usuários e de tokens verificados "
+        "(hits, misses e evictions)."
+    ),
+)
+def cache_stats() -> dict:
+    return {
+        "user_cache": user_entity_cache.stats(),
+        "token_cache": verified_tokens.stats(),
+    }
+
+
+@router.get(
+    "/pool",
+    summary="Métricas do pool de conexões",
+    description=(
+        "Conexões em uso, checkouts, timeouts e histograma de espera por "
+        "conexão de cada engine do primário (`sync` e, com ASYNC_API, "
+        "`async`), mais o máximo de conexões que esta réplica pode abrir "
+        "(para dimensionar contra o max_connections do Postgres)."
+    ),
+)
+def pool_stats() -> dict:
+    pools = {
+        name: snapshot
+        for name, snapshot in pool_snapshots().items()
+        if name in PRIMARY_POOLS
+    }
+    per_engine = settings.db_pool_size + settings.db_max_overflow
+    return {"max_connections_per_replica": per_engine * len(pools), **pools}
@@ -1,44 +1,100 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from adapters import instrument_statements, settings
+from domain import PasswordHashingUnavailableException
+
+from .async_auth_routes import router as async_auth_router
+from .async_routes import router as async_router
 from .routes import router
+from .bulk_routes import router as bulk_router
 from .auth_routes import router as auth_router
 from .stats_routes import router as stats_router
+from .internal_routes import router as internal_router
+from .metrics import MetricsMiddleware, QueryStatsMiddleware, metrics_endpoint
+from .replicas import ReadYourWritesMiddleware
+from .responses import FastJSONResponse
+
+
+def password_hashing_unavailable_handler(
+    _request: Request, exc: Exception
+) -> JSONResponse:
+    """Pool de bcrypt saturado: falha rápido para o cliente tentar de novo."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
 
 
-app = FastAPI(
-    title="Image Promotion Backend",
-    description="API REST para CRUD de usuários - Demo GitOps",
-    version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc",
-)
-
-# Configuração de CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000",
-        "http://127.0.0.1:3000",
-    ],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Registra as rotas
-app.include_router(auth_router, prefix="/api")
-app.include_router(router, prefix="/api")
-app.include_router(stats_router, prefix="/api")
-
-
-@app.get("/health", tags=["health"])
 def health_check():
     """Endpoint de health check para Kubernetes."""
     return {"status": "healthy"}
 
 
-@app.get("/ready", tags=["health"])
 def readiness_check():
     """Endpoint de readiness check para Kubernetes."""
     return {"status": "ready"}
+
+
+def create_app(
+    async_api: bool = settings.async_api,
+    metrics: bool = settings.metrics_enabled,
+    query_headers: bool = settings.db_query_headers,
+    read_replicas: bool = bool(settings.database_read_urls),
+) -> FastAPI:
+    """Monta a aplicação; com `async_api`, auth e users usam o stack async."""
+    application = FastAPI(
+        title="Image Promotion Backend",
+        description="API REST para CRUD de usuários - Demo GitOps",
+        version="1.0.0",
+        docs_url="/docs",
+        redoc_url="/redoc",
+        default_response_class=FastJSONResponse,
+    )
+
+    # Configuração de CORS
+    application.add_middleware(
+        CORSMiddleware,
+        allow_origins=[
+            "http://localhost:3000",
+            "http://127.0.0.1:3000",
+        ],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Registra as rotas; as de lote vêm antes de /users/{user_id}
+    application.include_router(bulk_router, prefix="/api")
+    if async_api:
+        application.include_router(async_auth_router, prefix="/api")
+        application.include_router(async_router, prefix="/api")
+    else:
+        application.include_router(auth_router, prefix="/api")
+        application.include_router(router, prefix="/api")
+    application.include_router(stats_router, prefix="/api")
+    application.include_router(internal_router)
+
+    application.add_exception_handler(
+        PasswordHashingUnavailableException, password_hashing_unavailable_handler
+    )
+    application.add_api_route("/health", health_check, tags=["health"])
+    application.add_api_route("/ready", readiness_check, tags=["health"])
+    if read_replicas:
+        application.add_middleware(ReadYourWritesMiddleware)
+    if metrics or query_headers:
+        # Listeners globais de comandos SQL: só quando alguém lê as medições
+        instrument_statements()
+    if query_headers:
+        application.add_middleware(QueryStatsMiddleware)
+    if metrics:
+        application.add_middleware(MetricsMiddleware)
+        application.add_api_route(
+            "/metrics", metrics_endpoint, tags=["internal"], include_in_schema=False
+        )
+    return application
+
+
+app = create_app()
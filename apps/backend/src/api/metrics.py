@@ -0,0 +1,109 @@
+import time
+
+from fastapi import Response
+
+from adapters import track_queries
+from adapters.metrics import metrics_registry
+
+# Buckets de bcrypt: o custo típico fica entre 50 ms e 1 s.
+HASH_BUCKETS = (0.01, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0)
+
+http_requests = metrics_registry.counter(
+    "http_requests_total",
+    "Requisições HTTP atendidas.",
+    ["method", "route", "status"],
+)
+http_request_duration = metrics_registry.histogram(
+    "http_request_duration_seconds",
+    "Latência das requisições HTTP.",
+    ["method", "route", "status"],
+)
+http_in_flight = metrics_registry.gauge(
+    "http_requests_in_flight", "Requisições HTTP em andamento."
+)
+password_hash_duration = metrics_registry.histogram(
+    "password_hash_duration_seconds",
+    "Duração do hashing/verificação de senhas, incluindo a fila do pool.",
+    ["operation"],
+    buckets=HASH_BUCKETS,
+)
+
+
+def observe_password_hash(operation: str, seconds: float) -> None:
+    password_hash_duration.observe(seconds, operation)
+
+
+class MetricsMiddleware:
+    """Middleware ASGI puro que mede cada requisição HTTP.
+
+    Usa o template da rota (ex.: `/api/users/{user_id}`) como label, para
+    manter a cardinalidade limitada; requisições sem rota viram
+    `unmatched`. Não usa BaseHTTPMiddleware para evitar o custo extra
+    de uma task por requisição.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        http_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_in_flight.dec()
+            route = scope.get("route")
+            template = getattr(route, "path_format", None) or "unmatched"
+            labels = (scope["method"], template, status)
+            http_requests.inc(*labels)
+            http_request_duration.observe(elapsed, *labels)
+
+
+class QueryStatsMiddleware:
+    """Middleware ASGI que conta os comandos SQL de cada requisição.
+
+    Os totais vão nos headers `X-DB-Queries` e `X-DB-Time` (milissegundos),
+    com o que foi executado até o início da resposta.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+
+            async def send_with_headers(message):
+                if message["type"] == "http.response.start":
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"x-db-queries", str(stats.queries).encode()),
+                        (b"x-db-time", f"{stats.seconds * 1000:.3f}".encode()),
+                    ]
+                await send(message)
+
+            await self.app(scope, receive, send_with_headers)
+
+
+def metrics_endpoint() -> Response:
+    """Métricas do processo no formato de texto do Prometheus."""
+    return Response(
+        content=metrics_registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
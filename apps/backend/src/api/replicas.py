@@ -0,0 +1,51 @@
+import time
+
+from fastapi import Request
+
+from adapters import settings
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+# Até quando (epoch, em segundos) as leituras do cliente vão ao primário
+PIN_COOKIE = "read_primary_until"
+
+
+def pinned_to_primary(request: Request) -> bool:
+    """Indica se o cliente escreveu há pouco e deve ler do primário."""
+    try:
+        return float(request.cookies.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:
+    """Middleware ASGI que marca o cliente após cada escrita bem-sucedida.
+
+    O cookie `read_primary_until` faz as leituras seguintes do cliente irem
+    ao primário por `read_your_writes_window` segundos, tempo para as
+    réplicas receberem a escrita. Por ser um cookie, vale em qualquer
+    worker ou instância da API.
+    """
+
+    def __init__(self, app, window: float = settings.read_your_writes_window):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in READ_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.window
+                cookie = (
+                    f"{PIN_COOKIE}={until:.3f}; Max-Age={self.window:.0f}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"set-cookie", cookie.encode()),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
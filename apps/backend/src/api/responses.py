@@ -0,0 +1,36 @@
+from typing import Any
+
+import pydantic_core
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.requests import ClientDisconnect
+from starlette.types import Receive, Scope, Send
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse codificado pelo serializer (Rust) do pydantic-core.
+
+    É a resposta padrão da aplicação. As rotas quentes devolvem
+    `FastJSONResponse(schema)` diretamente: o schema vai direto para bytes,
+    sem a validação e o dump para dict que o FastAPI faz no response_model.
+    Listagens e buscas por id devolvem `UserView`s (dataclasses com slots),
+    serializadas da mesma forma, sem passar por um schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content)
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """StreamingResponse cujo corpo ainda lê o corpo da requisição.
+
+    O StreamingResponse padrão (ASGI < 2.4) consome `receive` numa tarefa
+    paralela à espera do disconnect, e roubaria os pedaços do upload. Aqui
+    o próprio `request.stream()` percebe a desconexão (ClientDisconnect).
+    Sem suporte a `background`.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError as e:
+            raise ClientDisconnect() from e
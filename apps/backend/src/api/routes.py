@@ -1,39 +1,77 @@
+from datetime import date, datetime, timezone
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import Optional
 
-from adapters import PostgreSQLUserAdapter, get_db
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from adapters import settings
 from application import AuthService, UserService
-from domain import UserAlreadyExistsException, UserNotFoundException, UserRole
+from domain import (
+    CountStrategy,
+    InvalidCursorException,
+    UserAlreadyExistsException,
+    UserNotFoundException,
+    UserVersionConflictException,
+    UserPersistencePort,
+    UserQuery,
+    UserRole,
+    UserSortField,
+)
 
-from .auth_routes import get_current_user, require_admin
+from .auth_routes import get_auth_service, get_current_user, require_admin
+from .etags import expected_version, list_etag, none_match, not_modified, user_etag
+from .dependencies import get_user_persistence
+from .responses import FastJSONResponse
 from .schemas import (
+    CountStrategyEnum,
     UserCreate,
     UserListResponse,
     UserResponse,
     UserRoleEnum,
+    UserSortEnum,
     UserUpdate,
 )
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
-def get_user_service(db: Session = Depends(get_db)) -> UserService:
+def get_user_service(
+    adapter: UserPersistencePort = Depends(get_user_persistence),
+) -> UserService:
     """Dependency para obter o serviço de usuários com adapter injetado."""
-    adapter = PostgreSQLUserAdapter(db)
     return UserService(adapter)
 
 
-def get_auth_service(db: Session = Depends(get_db)) -> AuthService:
-    """Dependency para obter o serviço de autenticação."""
-    adapter = PostgreSQLUserAdapter(db)
-    return AuthService(adapter)
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Datas com fuso viram UTC sem fuso, como `created_at` é gravado."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def user_list_query(
+    role: Optional[UserRoleEnum] = None,
+    created_from: Optional[datetime] = Query(None, description="Cadastro a partir de"),
+    created_to: Optional[datetime] = Query(None, description="Cadastro antes de"),
+    birth_from: Optional[date] = Query(None, description="Nascimento a partir de"),
+    birth_to: Optional[date] = Query(None, description="Nascimento antes de"),
+    sort: UserSortEnum = UserSortEnum.CREATED_AT,
+) -> UserQuery:
+    """Dependency com os filtros e a ordenação da listagem de usuários."""
+    return UserQuery(
+        role=UserRole(role.value) if role else None,
+        created_from=_utc(created_from),
+        created_to=_utc(created_to),
+        birth_from=birth_from,
+        birth_to=birth_to,
+        sort=UserSortField(sort.value.removeprefix("-")),
+        descending=sort.value.startswith("-"),
+    )
 
 
 def _user_to_response(user) -> UserResponse:
     """Converte User domain para UserResponse."""
-    return UserResponse(
+    return UserResponse.model_construct(
         id=user.id,
         name=user.name,
         email=user.email,
@@ -76,18 +114,43 @@ def create_user(
     "",
     response_model=UserListResponse,
     summary="Listar usuários",
-    description="Lista todos os usuários com paginação.",
+    description=(
+        "Lista os usuários, por padrão ordenados por data de criação. Filtra "
+        "por role e por intervalos [from, to) de cadastro e de nascimento, e "
+        "ordena por `created_at`, `name` ou `email` (`-` inverte), tudo no "
+        "banco. Aceita paginação por offset (`skip`) ou por cursor (`cursor`, "
+        "vindo de `next_cursor`, válido só para a mesma ordenação). O `total` "
+        "é exato (com cache curto, sem filtros) ou estimado, conforme `count`. "
+        "Com `If-None-Match` igual à ETag atual, responde 304."
+    ),
 )
 def list_users(
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    count: Optional[CountStrategyEnum] = None,
+    query: UserQuery = Depends(user_list_query),
+    if_none_match: Optional[str] = Header(None),
     _current_user: UserResponse = Depends(get_current_user),
     service: UserService = Depends(get_user_service),
-) -> UserListResponse:
-    users = service.list_users(skip=skip, limit=limit)
-    return UserListResponse(
-        users=[_user_to_response(user) for user in users],
-        total=len(users),
+) -> Response:
+    etag = list_etag(service.get_change_version())
+    if none_match(if_none_match, etag):
+        return not_modified(etag)
+    strategy = CountStrategy(count.value if count else settings.user_count_strategy)
+    try:
+        page = service.list_users(
+            skip=skip, limit=limit, cursor=cursor, count_strategy=strategy, query=query
+        )
+    except InvalidCursorException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message,
+        ) from e
+    # UserView já tem os campos de UserResponse, na mesma ordem
+    return FastJSONResponse(
+        {"users": page.users, "total": page.total, "next_cursor": page.next_cursor},
+        headers={"ETag": etag},
     )
 
 
@@ -95,32 +158,44 @@ def list_users(
     "/{user_id}",
     response_model=UserResponse,
     summary="Buscar usuário",
-    description="Busca um usuário pelo ID.",
+    description=(
+        "Busca um usuário pelo ID. A resposta traz a ETag do usuário; com "
+        "`If-None-Match` igual a ela, responde 304."
+    ),
 )
 def get_user(
     user_id: UUID,
+    if_none_match: Optional[str] = Header(None),
     _current_user: UserResponse = Depends(get_current_user),
     service: UserService = Depends(get_user_service),
-) -> UserResponse:
+) -> Response:
     try:
         user = service.get_user(user_id)
-        return _user_to_response(user)
     except UserNotFoundException as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=e.message,
         ) from e
+    etag = user_etag(user)
+    if none_match(if_none_match, etag):
+        return not_modified(etag)
+    return FastJSONResponse(user, headers={"ETag": etag})
 
 
 @router.put(
     "/{user_id}",
     response_model=UserResponse,
     summary="Atualizar usuário",
-    description="Atualiza um usuário existente. Requer permissão de admin.",
+    description=(
+        "Atualiza um usuário existente. Requer permissão de admin. Com "
+        "`If-Match`, só atualiza se a ETag ainda for a atual (senão, 412)."
+    ),
 )
 def update_user(
     user_id: UUID,
     user_data: UserUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     _current_user: UserResponse = Depends(require_admin),
     service: UserService = Depends(get_user_service),
 ) -> UserResponse:
@@ -130,8 +205,9 @@ def update_user(
             name=user_data.name,
             email=user_data.email,
             birth_date=user_data.birth_date,
+            role=UserRole(user_data.role.value) if user_data.role else None,
+            expected_version=expected_version(if_match, user_id),
         )
-        return _user_to_response(user)
     except UserNotFoundException as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -142,23 +218,39 @@ def update_user(
             status_code=status.HTTP_409_CONFLICT,
             detail=e.message,
         ) from e
+    except UserVersionConflictException as e:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=e.message,
+        ) from e
+    response.headers["ETag"] = user_etag(user)
+    return _user_to_response(user)
 
 
 @router.delete(
     "/{user_id}",
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Deletar usuário",
-    description="Deleta um usuário existente. Requer permissão de admin.",
+    description=(
+        "Deleta um usuário existente. Requer permissão de admin. Com "
+        "`If-Match`, só deleta se a ETag ainda for a atual (senão, 412)."
+    ),
 )
 def delete_user(
     user_id: UUID,
+    if_match: Optional[str] = Header(None),
     _current_user: UserResponse = Depends(require_admin),
     service: UserService = Depends(get_user_service),
 ) -> None:
     try:
-        service.delete_user(user_id)
+        service.delete_user(user_id, expected_version(if_match, user_id))
     except UserNotFoundException as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=e.message,
         ) from e
+    except UserVersionConflictException as e:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=e.message,
+        ) from e
@@ -3,7 +3,10 @@ from enum import Enum
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+
+# Limite de ids explícitos numa operação em lote (filtros não têm limite).
+BULK_MAX_IDS = 1000
 
 
 class UserRoleEnum(str, Enum):
@@ -13,6 +16,31 @@ class UserRoleEnum(str, Enum):
     USER = "user"
 
 
+class CountStrategyEnum(str, Enum):
+    """Estratégia de contagem do total na listagem de usuários."""
+
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+
+
+class UserSortEnum(str, Enum):
+    """Ordenação da listagem de usuários; o prefixo `-` inverte a ordem."""
+
+    CREATED_AT = "created_at"
+    CREATED_AT_DESC = "-created_at"
+    NAME = "name"
+    NAME_DESC = "-name"
+    EMAIL = "email"
+    EMAIL_DESC = "-email"
+
+
+class ExportFormatEnum(str, Enum):
+    """Formato da exportação de usuários."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
 class UserBase(BaseModel):
     """Schema base para usuário."""
 
@@ -34,10 +62,44 @@ class UserUpdate(BaseModel):
     name: Optional[str] = None
     email: Optional[EmailStr] = None
     birth_date: Optional[date] = None
+    role: Optional[UserRoleEnum] = None
+
+
+class UserSelectionRequest(BaseModel):
+    """Usuários alvo de uma operação em lote: ids e/ou filtros, combinados."""
+
+    ids: Optional[list[UUID]] = Field(None, max_length=BULK_MAX_IDS)
+    role: Optional[UserRoleEnum] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+
+
+class UserBulkUpdate(BaseModel):
+    """Schema para atualização em lote: a seleção e a nova role."""
+
+    selection: UserSelectionRequest
+    role: UserRoleEnum
+
+
+class UserBulkDelete(BaseModel):
+    """Schema para remoção em lote."""
+
+    selection: UserSelectionRequest
+
+
+class UserBulkResponse(BaseModel):
+    """Schema de resposta das operações em lote: os usuários afetados."""
+
+    ids: list[UUID]
+    count: int
 
 
 class UserResponse(UserBase):
-    """Schema de resposta para usuário."""
+    """Schema de resposta para usuário.
+
+    As rotas o montam com `model_construct` a partir de dados já gravados
+    (validados na escrita), sem validar de novo o EmailStr de cada usuário.
+    """
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -48,11 +110,38 @@ class UserResponse(UserBase):
     updated_at: Optional[datetime] = None
 
 
+class UserSearchResult(UserResponse):
+    """Usuário encontrado pela busca, com a relevância (maior é melhor)."""
+
+    score: float
+
+
+class UserSearchResponse(BaseModel):
+    """Schema de resposta da busca de usuários."""
+
+    users: list[UserSearchResult]
+    next_cursor: Optional[str] = None
+
+
 class UserListResponse(BaseModel):
     """Schema de resposta para lista de usuários."""
 
     users: list[UserResponse]
     total: int
+    next_cursor: Optional[str] = None
+
+
+class UserBatchGetRequest(BaseModel):
+    """Schema para busca de vários usuários por id."""
+
+    ids: list[UUID] = Field(min_length=1, max_length=BULK_MAX_IDS)
+
+
+class UserBatchResponse(BaseModel):
+    """Schema de resposta da busca em lote: usuários na ordem pedida."""
+
+    users: list[UserResponse]
+    missing: list[UUID]
 
 
 class MessageResponse(BaseModel):
@@ -107,3 +196,28 @@ class StatsResponse(BaseModel):
     users_this_month: int
     recent_users: list[UserResponse]
     growth_data: list[dict]
+
+
+class GrowthGranularityEnum(str, Enum):
+    """Granularidade da série de crescimento."""
+
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class GrowthPoint(BaseModel):
+    """Ponto da série de crescimento."""
+
+    date: str
+    count: int
+
+
+class GrowthResponse(BaseModel):
+    """Schema de resposta para a série de crescimento."""
+
+    start: date
+    end: date
+    granularity: GrowthGranularityEnum
+    total: int
+    points: list[GrowthPoint]
@@ -1,18 +1,51 @@
-# pylint: disable=not-callable
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from typing import Optional
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from adapters import get_db
 from adapters.database.models import UserModel
+from adapters.database.signup_rollup import signup_totals, signups_by_day
 
 from .auth_routes import require_admin
-from .schemas import StatsResponse, UserResponse, UserRoleEnum
+from .dependencies import get_request_db
+from .schemas import (
+    GrowthGranularityEnum,
+    GrowthPoint,
+    GrowthResponse,
+    StatsResponse,
+    UserResponse,
+    UserRoleEnum,
+)
 
 router = APIRouter(prefix="/stats", tags=["stats"])
 
+GROWTH_DAYS = 30
+MAX_GROWTH_RANGE_DAYS = 3660
+
+
+def _count_since(per_day: dict[date, int], start: date) -> int:
+    """Soma os buckets diários a partir de `start` (inclusive)."""
+    return sum(count for day, count in per_day.items() if day >= start)
+
+
+def _bucket_start(day: date, granularity: GrowthGranularityEnum) -> date:
+    """Retorna o primeiro dia do bucket ao qual `day` pertence."""
+    if granularity == GrowthGranularityEnum.WEEK:
+        return day - timedelta(days=day.weekday())
+    if granularity == GrowthGranularityEnum.MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(day: date, granularity: GrowthGranularityEnum) -> date:
+    """Retorna o início do bucket seguinte a `day` (já alinhado)."""
+    if granularity == GrowthGranularityEnum.WEEK:
+        return day + timedelta(days=7)
+    if granularity == GrowthGranularityEnum.MONTH:
+        return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return day + timedelta(days=1)
+
 
 @router.get(
     "",
@@ -22,46 +55,23 @@ router = APIRouter(prefix="/stats", tags=["stats"])
 )
 def get_stats(
     _current_user: UserResponse = Depends(require_admin),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_request_db),
 ) -> StatsResponse:
-    now = datetime.utcnow()
-    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    week_start = today_start - timedelta(days=today_start.weekday())
-    month_start = today_start.replace(day=1)
-
-    # Total de usuários
-    total_users = db.query(func.count(UserModel.id)).scalar() or 0
-
-    # Usuários criados hoje
-    users_today = (
-        db.query(func.count(UserModel.id))
-        .filter(UserModel.created_at >= today_start)
-        .scalar()
-        or 0
-    )
+    today = datetime.utcnow().date()
+    week_start = today - timedelta(days=today.weekday())
+    month_start = today.replace(day=1)
+    series_start = today - timedelta(days=GROWTH_DAYS)
 
-    # Usuários criados esta semana
-    users_this_week = (
-        db.query(func.count(UserModel.id))
-        .filter(UserModel.created_at >= week_start)
-        .scalar()
-        or 0
-    )
-
-    # Usuários criados este mês
-    users_this_month = (
-        db.query(func.count(UserModel.id))
-        .filter(UserModel.created_at >= month_start)
-        .scalar()
-        or 0
-    )
+    # Contadores e série saem do rollup diário numa única consulta agrupada;
+    # o início da semana e do mês sempre caem dentro da janela de 31 dias.
+    total_users, per_day = signup_totals(db, series_start)
 
     # Últimos 5 usuários cadastrados
     recent_users_models = (
         db.query(UserModel).order_by(UserModel.created_at.desc()).limit(5).all()
     )
     recent_users = [
-        UserResponse(
+        UserResponse.model_construct(
             id=u.id,
             name=u.name,
             email=u.email,
@@ -72,30 +82,69 @@ def get_stats(
         for u in recent_users_models
     ]
 
-    # Dados de crescimento (últimos 30 dias)
+    # Dados de crescimento (últimos 30 dias), com zero nos dias sem cadastro
     growth_data = []
-    for i in range(30, -1, -1):
-        day = today_start - timedelta(days=i)
-        day_end = day + timedelta(days=1)
-        count = (
-            db.query(func.count(UserModel.id))
-            .filter(UserModel.created_at >= day)
-            .filter(UserModel.created_at < day_end)
-            .scalar()
-            or 0
-        )
+    for i in range(GROWTH_DAYS, -1, -1):
+        day = today - timedelta(days=i)
         growth_data.append(
-            {
-                "date": day.strftime("%Y-%m-%d"),
-                "count": count,
-            }
+            {"date": day.strftime("%Y-%m-%d"), "count": per_day.get(day, 0)}
         )
 
     return StatsResponse(
         total_users=total_users,
-        users_today=users_today,
-        users_this_week=users_this_week,
-        users_this_month=users_this_month,
+        users_today=_count_since(per_day, today),
+        users_this_week=_count_since(per_day, week_start),
+        users_this_month=_count_since(per_day, month_start),
         recent_users=recent_users,
         growth_data=growth_data,
     )
+
+
+@router.get(
+    "/growth",
+    response_model=GrowthResponse,
+    summary="Crescimento de usuários",
+    description=(
+        "Retorna a série de cadastros no intervalo informado, agrupada por dia, "
+        "semana ou mês. Servido pelo rollup diário. Requer permissão de admin."
+    ),
+)
+def get_growth(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    granularity: GrowthGranularityEnum = GrowthGranularityEnum.DAY,
+    role: Optional[UserRoleEnum] = None,
+    _current_user: UserResponse = Depends(require_admin),
+    db: Session = Depends(get_request_db),
+) -> GrowthResponse:
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=GROWTH_DAYS)
+    if start > end or (end - start).days > MAX_GROWTH_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                "Intervalo inválido: 'start' deve ser anterior a 'end' e o "
+                f"intervalo não pode passar de {MAX_GROWTH_RANGE_DAYS} dias"
+            ),
+        )
+
+    per_day = signups_by_day(db, start, end, role.value if role else None)
+
+    buckets: dict[date, int] = {}
+    bucket = _bucket_start(start, granularity)
+    while bucket <= end:
+        buckets[bucket] = 0
+        bucket = _next_bucket(bucket, granularity)
+    for day, count in per_day.items():
+        buckets[_bucket_start(day, granularity)] += count
+
+    return GrowthResponse(
+        start=start,
+        end=end,
+        granularity=granularity,
+        total=sum(buckets.values()),
+        points=[
+            GrowthPoint(date=day.isoformat(), count=count)
+            for day, count in buckets.items()
+        ],
+    )
@@ -1,3 +1,25 @@
-from .services import UserService, AuthService
+from .services import (
+    UserService,
+    AuthService,
+    AsyncUserService,
+    AsyncAuthService,
+    UserImportService,
+)
+from .services.password_hashing import (
+    PasswordHasher,
+    PasswordHashingPool,
+    calibrate_bcrypt_rounds,
+)
+from .services.token_cache import verified_tokens
 
-__all__ = ["UserService", "AuthService"]
+__all__ = [
+    "UserService",
+    "AuthService",
+    "AsyncUserService",
+    "AsyncAuthService",
+    "UserImportService",
+    "PasswordHasher",
+    "PasswordHashingPool",
+    "calibrate_bcrypt_rounds",
+    "verified_tokens",
+]
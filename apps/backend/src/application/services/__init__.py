@@ -1,4 +1,13 @@
 from .user_service import UserService
 from .auth_service import AuthService
+from .async_user_service import AsyncUserService
+from .async_auth_service import AsyncAuthService
+from .user_import_service import UserImportService
 
-__all__ = ["UserService", "AuthService"]
+__all__ = [
+    "UserService",
+    "AuthService",
+    "AsyncUserService",
+    "AsyncAuthService",
+    "UserImportService",
+]
@@ -0,0 +1,110 @@
+from datetime import date
+from typing import Optional
+from uuid import UUID
+
+from domain import (
+    AsyncUserPersistencePort,
+    InvalidCredentialsException,
+    User,
+    UserRole,
+)
+
+from .auth_service import BaseAuthService
+from .password_hashing import PasswordHasher
+from .token_cache import VerifiedTokenCache, verified_tokens
+from .token_versions import TokenVersionCache, token_versions
+
+
+class AsyncAuthService(BaseAuthService):
+    """Versão assíncrona do AuthService, sobre o AsyncUserPersistencePort.
+
+    O bcrypt é aguardado sem bloquear o event loop (no pool dedicado, ou
+    numa thread quando não há pool).
+    """
+
+    def __init__(
+        self,
+        persistence_port: AsyncUserPersistencePort,
+        claims_tokens: bool = False,
+        versions: TokenVersionCache = token_versions,
+        token_cache: Optional[VerifiedTokenCache] = verified_tokens,
+        hasher: Optional[PasswordHasher] = None,
+    ):
+        super().__init__(claims_tokens, versions, token_cache, hasher)
+        self._persistence = persistence_port
+
+    async def _user_from_claims(self, user_id: UUID, payload: dict) -> Optional[User]:
+        """Monta o usuário a partir das claims, se a versão do token é atual."""
+        found, current_version = self._versions.lookup(user_id)
+        if not found:
+            current_version = await self._persistence.get_token_version(user_id)
+            self._versions.set(user_id, current_version)
+        return self._claims_user(user_id, payload, current_version)
+
+    async def register_user(
+        self,
+        name: str,
+        email: str,
+        password: str,
+        role: UserRole = UserRole.USER,
+        birth_date: Optional[date] = None,
+    ) -> User:
+        """Registra um novo usuário.
+
+        Email repetido é detectado pelo índice único no INSERT
+        (UserAlreadyExistsException), sem consulta prévia.
+        """
+        password_hash = await self._hasher.hash_async(password)
+        user = User(
+            name=name,
+            email=email,
+            password_hash=password_hash,
+            role=role,
+            birth_date=birth_date,
+        )
+        return await self._persistence.save(user)
+
+    async def authenticate(self, email: str, password: str) -> User:
+        """Autentica um usuário por email e senha."""
+        user = await self._persistence.find_by_email(email)
+        if not user:
+            raise InvalidCredentialsException()
+
+        await self._persistence.release_connection()
+        valid, new_hash = await self._hasher.verify_and_update_async(
+            password, user.password_hash
+        )
+        if not valid:
+            raise InvalidCredentialsException()
+
+        if new_hash is not None:
+            # Hash em esquema antigo ou com outro custo: regrava com o atual
+            await self._persistence.update_password_hash(user.id, new_hash)
+            user.password_hash = new_hash
+
+        return user
+
+    async def get_user_from_token(self, token: str) -> Optional[User]:
+        """Obtém o usuário a partir de um access token."""
+        payload = self._decode_token(token, "access")
+        if payload is None:
+            return None
+        user_id = UUID(payload["sub"])
+        if self._claims_tokens and "ver" in payload:
+            return await self._user_from_claims(user_id, payload)
+        return await self._persistence.find_by_id(user_id)
+
+    async def refresh_access_token(
+        self, refresh_token: str
+    ) -> Optional[tuple[str, User]]:
+        """Gera um novo access token a partir de um refresh token."""
+        user_id = self.verify_token(refresh_token, "refresh")
+        if user_id is None:
+            return None
+
+        user = await self._persistence.find_by_id(user_id)
+        if user is None:
+            return None
+
+        new_access_token = self.create_access_token(user_id, user)
+        return new_access_token, user
@@ -0,0 +1,110 @@
+from datetime import date, datetime
+from typing import Optional
+from uuid import UUID
+
+from domain import (
+    AsyncUserPersistencePort,
+    CountStrategy,
+    User,
+    UserCursor,
+    UserNotFoundException,
+    UserPage,
+    UserQuery,
+    UserRole,
+    UserView,
+)
+
+from .token_versions import token_versions
+
+
+class AsyncUserService:
+    """Versão assíncrona do UserService, sobre o AsyncUserPersistencePort."""
+
+    def __init__(self, persistence_port: AsyncUserPersistencePort):
+        self._persistence = persistence_port
+
+    async def get_user(self, user_id: UUID) -> UserView:
+        """Busca os dados públicos de um usuário pelo ID."""
+        user = await self._persistence.find_view_by_id(user_id)
+        if not user:
+            raise UserNotFoundException(str(user_id))
+        return user
+
+    async def get_user_by_email(self, email: str) -> User:
+        """Busca um usuário pelo email."""
+        user = await self._persistence.find_by_email(email)
+        if not user:
+            raise UserNotFoundException(email)
+        return user
+
+    async def list_users(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+        query: Optional[UserQuery] = None,
+    ) -> UserPage:
+        """Lista usuários por offset (`skip`) ou por keyset (`cursor`).
+
+        Mesmas regras do UserService.list_users.
+        """
+        query = query or UserQuery()
+        if cursor is not None:
+            position = UserCursor.decode(cursor)
+            position.check(query)
+            users = await self._persistence.find_views_after(position, limit + 1, query)
+        else:
+            users = await self._persistence.find_all_views(
+                skip=skip, limit=limit + 1, query=query
+            )
+
+        page = UserPage(
+            users=users[:limit],
+            total=await self._persistence.count(count_strategy, query),
+        )
+        if len(users) > limit:
+            page.next_cursor = UserCursor.from_user(page.users[-1], query).encode()
+        return page
+
+    async def get_change_version(self) -> int:
+        """Versão da tabela de usuários, que muda a cada escrita."""
+        return await self._persistence.get_change_version()
+
+    async def update_user(
+        self,
+        user_id: UUID,
+        name: Optional[str] = None,
+        email: Optional[str] = None,
+        birth_date: Optional[date] = None,
+        role: Optional[UserRole] = None,
+        expected_version: Optional[datetime] = None,
+    ) -> User:
+        """Atualiza um usuário existente.
+
+        Uma troca de role incrementa a versão de token do usuário, revogando
+        os access tokens com claims emitidos antes dela. Email repetido é
+        detectado pelo índice único, sem consulta prévia. Com
+        `expected_version`, falha se o usuário mudou desde essa versão.
+        """
+        updated = await self._persistence.update(
+            user_id,
+            name=name,
+            email=email,
+            birth_date=birth_date,
+            role=role,
+            expected_version=expected_version,
+        )
+        if updated is None:
+            raise UserNotFoundException(str(user_id))
+        token_versions.set(updated.id, updated.token_version)
+        return updated
+
+    async def delete_user(
+        self, user_id: UUID, expected_version: Optional[datetime] = None
+    ) -> bool:
+        """Deleta um usuário pelo ID (só na `expected_version`, se informada)."""
+        if not await self._persistence.delete(user_id, expected_version):
+            raise UserNotFoundException(str(user_id))
+        token_versions.set(user_id, None)
+        return True
@@ -4,36 +4,45 @@ from typing import Optional
 from uuid import UUID
 
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 
 from domain import (
     User,
     UserRole,
     UserPersistencePort,
-    UserAlreadyExistsException,
     InvalidCredentialsException,
 )
 
+from .password_hashing import PasswordHasher
+from .token_cache import VerifiedTokenCache, verified_tokens
+from .token_versions import TokenVersionCache, token_versions
 
-class AuthService:
-    """Serviço de aplicação para autenticação."""
+
+class BaseAuthService:
+    """Emissão e verificação de tokens, comum às versões sync e async.
+
+    Não acessa a persistência; AuthService e AsyncAuthService acrescentam os
+    casos de uso que dependem do banco.
+    """
 
     SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
     ALGORITHM = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES = 30
     REFRESH_TOKEN_EXPIRE_DAYS = 7
 
-    def __init__(self, persistence_port: UserPersistencePort):
-        self._persistence = persistence_port
-        self._pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-    def _hash_password(self, password: str) -> str:
-        """Gera hash da senha."""
-        return self._pwd_context.hash(password)
-
-    def _verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        """Verifica se a senha está correta."""
-        return self._pwd_context.verify(plain_password, hashed_password)
+    def __init__(
+        self,
+        claims_tokens: bool = False,
+        versions: TokenVersionCache = token_versions,
+        token_cache: Optional[VerifiedTokenCache] = verified_tokens,
+        hasher: Optional[PasswordHasher] = None,
+    ):
+        # O hasher compartilhado vem da API; sem ele, usa a configuração padrão.
+        self._hasher = hasher or PasswordHasher()
+        # Com claims_tokens, o access token carrega role/nome/email e a versão
+        # de token do usuário, e a autenticação dispensa a consulta ao banco.
+        self._claims_tokens = claims_tokens
+        self._versions = versions
+        self._token_cache = token_cache
 
     def _create_token(self, data: dict, expires_delta: timedelta) -> str:
         """Cria um token JWT."""
@@ -42,28 +51,108 @@ class AuthService:
         to_encode.update({"exp": expire})
         return jwt.encode(to_encode, self.SECRET_KEY, algorithm=self.ALGORITHM)
 
-    def create_access_token(self, user_id: UUID) -> str:
-        """Cria um access token para o usuário."""
+    def create_access_token(self, user_id: UUID, user: Optional[User] = None) -> str:
+        """Cria um access token para o usuário.
+
+        No modo claims_tokens, quando `user` é informado, o token carrega os
+        dados necessários para montar o usuário autenticado sem ir ao banco.
+        """
         expires = timedelta(minutes=self.ACCESS_TOKEN_EXPIRE_MINUTES)
-        return self._create_token({"sub": str(user_id), "type": "access"}, expires)
+        data: dict = {"sub": str(user_id), "type": "access"}
+        if self._claims_tokens and user is not None:
+            data.update(
+                {
+                    "name": user.name,
+                    "email": user.email,
+                    "role": user.role.value,
+                    "ver": user.token_version,
+                    "cat": user.created_at.isoformat(),
+                    "uat": user.updated_at.isoformat() if user.updated_at else None,
+                }
+            )
+            self._versions.set(user.id, user.token_version)
+        return self._create_token(data, expires)
 
     def create_refresh_token(self, user_id: UUID) -> str:
         """Cria um refresh token para o usuário."""
         expires = timedelta(days=self.REFRESH_TOKEN_EXPIRE_DAYS)
         return self._create_token({"sub": str(user_id), "type": "refresh"}, expires)
 
+    def _decode_token(self, token: str, token_type: str) -> Optional[dict]:
+        """Decodifica um token JWT e confere o tipo e a presença do subject.
+
+        Tokens já verificados vêm do cache até expirarem, evitando repetir
+        a verificação HMAC e o parsing a cada requisição da mesma sessão.
+        """
+        payload = self._token_cache.get(token) if self._token_cache else None
+        if payload is None:
+            try:
+                payload = jwt.decode(
+                    token, self.SECRET_KEY, algorithms=[self.ALGORITHM]
+                )
+            except JWTError:
+                return None
+            if self._token_cache:
+                self._token_cache.put(token, payload)
+        if payload.get("type") != token_type or payload.get("sub") is None:
+            return None
+        return payload
+
     def verify_token(self, token: str, token_type: str = "access") -> Optional[UUID]:
         """Verifica e decodifica um token JWT."""
-        try:
-            payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
-            if payload.get("type") != token_type:
-                return None
-            user_id = payload.get("sub")
-            if user_id is None:
-                return None
-            return UUID(user_id)
-        except JWTError:
+        payload = self._decode_token(token, token_type)
+        if payload is None:
+            return None
+        return UUID(payload["sub"])
+
+    @staticmethod
+    def _claims_user(
+        user_id: UUID, payload: dict, current_version: Optional[int]
+    ) -> Optional[User]:
+        """Monta o usuário a partir das claims, se a versão do token é atual."""
+        if current_version is None or current_version != payload["ver"]:
             return None
+        return User(
+            id=user_id,
+            name=payload["name"],
+            email=payload["email"],
+            role=UserRole(payload["role"]),
+            token_version=payload["ver"],
+            created_at=datetime.fromisoformat(payload["cat"]),
+            updated_at=(
+                datetime.fromisoformat(payload["uat"]) if payload["uat"] else None
+            ),
+        )
+
+
+class AuthService(BaseAuthService):
+    """Serviço de aplicação para autenticação."""
+
+    def __init__(
+        self,
+        persistence_port: UserPersistencePort,
+        claims_tokens: bool = False,
+        versions: TokenVersionCache = token_versions,
+        token_cache: Optional[VerifiedTokenCache] = verified_tokens,
+        hasher: Optional[PasswordHasher] = None,
+    ):
+        super().__init__(claims_tokens, versions, token_cache, hasher)
+        self._persistence = persistence_port
+
+    def _hash_password(self, password: str) -> str:
+        """Gera hash da senha."""
+        return self._hasher.hash(password)
+
+    def _verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Verifica se a senha está correta."""
+        return self._hasher.verify_and_update(plain_password, hashed_password)[0]
+
+    def _user_from_claims(self, user_id: UUID, payload: dict) -> Optional[User]:
+        """Monta o usuário a partir das claims, se a versão do token é atual."""
+        current_version = self._versions.get(
+            user_id, self._persistence.get_token_version
+        )
+        return self._claims_user(user_id, payload, current_version)
 
     def register_user(
         self,
@@ -73,11 +162,11 @@ class AuthService:
         role: UserRole = UserRole.USER,
         birth_date: Optional[date] = None,
     ) -> User:
-        """Registra um novo usuário."""
-        existing_user = self._persistence.find_by_email(email)
-        if existing_user:
-            raise UserAlreadyExistsException(email)
+        """Registra um novo usuário.
 
+        Email repetido é detectado pelo índice único no INSERT
+        (UserAlreadyExistsException), sem consulta prévia.
+        """
         password_hash = self._hash_password(password)
         user = User(
             name=name,
@@ -94,16 +183,26 @@ class AuthService:
         if not user:
             raise InvalidCredentialsException()
 
-        if not self._verify_password(password, user.password_hash):
+        self._persistence.release_connection()
+        valid, new_hash = self._hasher.verify_and_update(password, user.password_hash)
+        if not valid:
             raise InvalidCredentialsException()
 
+        if new_hash is not None:
+            # Hash em esquema antigo ou com outro custo: regrava com o atual
+            self._persistence.update_password_hash(user.id, new_hash)
+            user.password_hash = new_hash
+
         return user
 
     def get_user_from_token(self, token: str) -> Optional[User]:
         """Obtém o usuário a partir de um access token."""
-        user_id = self.verify_token(token, "access")
-        if user_id is None:
+        payload = self._decode_token(token, "access")
+        if payload is None:
             return None
+        user_id = UUID(payload["sub"])
+        if self._claims_tokens and "ver" in payload:
+            return self._user_from_claims(user_id, payload)
         return self._persistence.find_by_id(user_id)
 
     def refresh_access_token(self, refresh_token: str) -> Optional[tuple[str, User]]:
@@ -116,5 +215,5 @@ class AuthService:
         if user is None:
             return None
 
-        new_access_token = self.create_access_token(user_id)
+        new_access_token = self.create_access_token(user_id, user)
         return new_access_token, user
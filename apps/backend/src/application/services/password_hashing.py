@@ -0,0 +1,244 @@
+import asyncio
+import functools
+import math
+import multiprocessing
+import threading
+import time
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import Callable, Optional, Sequence, TypeVar
+
+from passlib.context import CryptContext
+
+from domain import PasswordHashingUnavailableException
+
+T = TypeVar("T")
+
+DEFAULT_SCHEMES = ("bcrypt",)
+DEFAULT_BCRYPT_ROUNDS = 12
+
+
+@functools.lru_cache(maxsize=8)
+def _context(schemes: tuple[str, ...], bcrypt_rounds: int) -> CryptContext:
+    """Retorna o CryptContext da configuração, criado uma vez por processo.
+
+    O primeiro esquema é o usado nos hashes novos; os demais só são aceitos
+    na verificação. Hashes bcrypt com custo diferente de `bcrypt_rounds`
+    também contam como desatualizados.
+    """
+    return CryptContext(
+        schemes=list(schemes),
+        deprecated="auto",
+        bcrypt__default_rounds=bcrypt_rounds,
+        bcrypt__min_rounds=bcrypt_rounds,
+        bcrypt__max_rounds=bcrypt_rounds,
+    )
+
+
+# Funções de módulo (e não métodos) para poderem ser enviadas aos workers.
+def _hash(schemes: tuple[str, ...], bcrypt_rounds: int, password: str) -> str:
+    return _context(schemes, bcrypt_rounds).hash(password)
+
+
+def _hash_many(
+    schemes: tuple[str, ...], bcrypt_rounds: int, passwords: list[str]
+) -> list[str]:
+    context = _context(schemes, bcrypt_rounds)
+    return [context.hash(password) for password in passwords]
+
+
+def _verify_and_update(
+    schemes: tuple[str, ...], bcrypt_rounds: int, password: str, hashed: str
+) -> tuple[bool, Optional[str]]:
+    return _context(schemes, bcrypt_rounds).verify_and_update(password, hashed)
+
+
+class PasswordHashingPool:
+    """Executor dedicado e limitado para bcrypt.
+
+    O hashing sai do threadpool compartilhado do FastAPI para um pool próprio
+    (de processos, por padrão, fugindo do GIL). No máximo `workers +
+    max_pending` operações ficam em andamento; além disso a chamada falha na
+    hora com PasswordHashingUnavailableException, de modo que uma rajada de
+    logins ocupa um número limitado de threads e não trava o restante da API.
+    """
+
+    def __init__(
+        self, workers: int = 2, max_pending: int = 16, use_processes: bool = True
+    ):
+        self._workers = workers
+        self._use_processes = use_processes
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self._use_processes:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self._workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self._workers,
+                        thread_name_prefix="password-hashing",
+                    )
+            return self._executor
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    def _submit(self, fn: Callable[..., T], *args, wait: bool = False) -> Future[T]:
+        # O slot é devolvido no callback do future, não num bloco with
+        # pylint: disable-next=consider-using-with
+        if not self._slots.acquire(blocking=wait):
+            raise PasswordHashingUnavailableException()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _future: self._slots.release())
+        return future
+
+    def run(self, fn: Callable[..., T], *args) -> T:
+        """Executa `fn(*args)` no pool e espera o resultado."""
+        return self._submit(fn, *args).result()
+
+    async def run_async(self, fn: Callable[..., T], *args) -> T:
+        """Executa `fn(*args)` no pool sem bloquear o event loop."""
+        return await asyncio.wrap_future(self._submit(fn, *args))
+
+    def map(self, fn: Callable[..., T], calls: Sequence[tuple]) -> list[T]:
+        """Executa `fn(*args)` para cada `args` em paralelo, na ordem dada.
+
+        Para trabalho em lote: espera por vaga em vez de falhar, mas cada
+        chamada ocupa uma só vaga, sobrando espaço para os logins.
+        """
+        futures = [self._submit(fn, *args, wait=True) for args in calls]
+        return [future.result() for future in futures]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+class PasswordHasher:
+    """Hasher de senhas compartilhado por todas as requisições do processo.
+
+    Concentra a configuração de esquemas e custo do bcrypt e, se houver,
+    despacha o trabalho para o PasswordHashingPool. Na verificação informa
+    quando o hash armazenado está desatualizado (esquema antigo ou custo
+    diferente do atual) e devolve o hash novo para ser regravado.
+    """
+
+    def __init__(
+        self,
+        schemes: Sequence[str] = DEFAULT_SCHEMES,
+        bcrypt_rounds: int = DEFAULT_BCRYPT_ROUNDS,
+        pool: Optional[PasswordHashingPool] = None,
+        observer: Optional[Callable[[str, float], None]] = None,
+    ):
+        self._schemes = tuple(schemes)
+        self._bcrypt_rounds = bcrypt_rounds
+        self._pool = pool
+        # Recebe ("hash" | "verify", segundos), incluindo a espera no pool.
+        self._observer = observer
+        # Valida a configuração já na criação, e não no primeiro login.
+        _context(self._schemes, self._bcrypt_rounds)
+
+    def _observe(self, operation: str, started: float) -> None:
+        if self._observer is not None:
+            self._observer(operation, time.perf_counter() - started)
+
+    def _run(self, operation: str, fn: Callable[..., T], *args) -> T:
+        started = time.perf_counter()
+        if self._pool is not None:
+            result = self._pool.run(fn, self._schemes, self._bcrypt_rounds, *args)
+        else:
+            result = fn(self._schemes, self._bcrypt_rounds, *args)
+        self._observe(operation, started)
+        return result
+
+    async def _run_async(self, operation: str, fn: Callable[..., T], *args) -> T:
+        started = time.perf_counter()
+        if self._pool is not None:
+            result = await self._pool.run_async(
+                fn, self._schemes, self._bcrypt_rounds, *args
+            )
+        else:
+            # Sem pool, roda numa thread para não travar o event loop
+            result = await asyncio.to_thread(
+                fn, self._schemes, self._bcrypt_rounds, *args
+            )
+        self._observe(operation, started)
+        return result
+
+    def hash(self, password: str) -> str:
+        return self._run("hash", _hash, password)
+
+    def verify_and_update(
+        self, password: str, hashed: str
+    ) -> tuple[bool, Optional[str]]:
+        """Verifica a senha; retorna também o hash novo se o atual estiver velho."""
+        return self._run("verify", _verify_and_update, password, hashed)
+
+    def hash_many(self, passwords: Sequence[str]) -> list[str]:
+        """Gera os hashes de um lote, dividido entre os workers do pool."""
+        started = time.perf_counter()
+        if self._pool is None:
+            hashes = _hash_many(self._schemes, self._bcrypt_rounds, list(passwords))
+        else:
+            size = max(1, math.ceil(len(passwords) / self._pool.workers))
+            calls = [
+                (self._schemes, self._bcrypt_rounds, list(passwords[i : i + size]))
+                for i in range(0, len(passwords), size)
+            ]
+            hashes = [
+                hashed
+                for chunk in self._pool.map(_hash_many, calls)
+                for hashed in chunk
+            ]
+        self._observe("hash_many", started)
+        return hashes
+
+    async def hash_async(self, password: str) -> str:
+        return await self._run_async("hash", _hash, password)
+
+    async def verify_and_update_async(
+        self, password: str, hashed: str
+    ) -> tuple[bool, Optional[str]]:
+        return await self._run_async("verify", _verify_and_update, password, hashed)
+
+
+def calibrate_bcrypt_rounds(
+    target_seconds: float, min_rounds: int = 4, max_rounds: int = 16
+) -> tuple[int, list[tuple[int, float]]]:
+    """Mede a verificação bcrypt nesta CPU e escolhe o custo para o alvo.
+
+    Cada custo a mais dobra o tempo, então a medição para no primeiro custo
+    que passa do alvo. Retorna o maior custo dentro do alvo (no mínimo
+    `min_rounds`) e as medições feitas.
+    """
+    measurements: list[tuple[int, float]] = []
+    chosen = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        context = _context(("bcrypt",), rounds)
+        hashed = context.hash("calibration-password")
+        started = time.perf_counter()
+        context.verify("calibration-password", hashed)
+        elapsed = time.perf_counter() - started
+        measurements.append((rounds, elapsed))
+        if elapsed > target_seconds:
+            break
+        chosen = rounds
+    return chosen, measurements
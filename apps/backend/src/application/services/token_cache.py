@@ -0,0 +1,69 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class VerifiedTokenCache:
+    """Cache LRU de tokens JWT já verificados, válido até o `exp` do token.
+
+    A chave é o SHA-256 do token, então o token em si não fica em memória.
+    Só entram tokens cuja assinatura e claims já foram validadas; o payload
+    devolvido deve ser tratado como somente leitura.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[bytes, dict] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._key(token)
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None and time.time() < payload["exp"]:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return payload
+            if payload is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, payload: dict) -> None:
+        if "exp" not in payload:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Compartilhado por todas as requisições do processo.
+verified_tokens = VerifiedTokenCache()
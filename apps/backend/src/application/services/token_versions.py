@@ -0,0 +1,55 @@
+import threading
+import time
+from typing import Callable, Optional
+from uuid import UUID
+
+
+class TokenVersionCache:
+    """Mapa em memória user_id -> token_version usado pelos tokens com claims.
+
+    Cada entrada vale por `ttl_seconds`; depois disso a versão é relida do
+    banco, o que limita o tempo em que outra réplica aceita um token revogado.
+    Escritas feitas neste processo atualizam o mapa na hora. `None` indica
+    usuário removido.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 10_000):
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: dict[UUID, tuple[Optional[int], float]] = {}
+
+    def lookup(self, user_id: UUID) -> tuple[bool, Optional[int]]:
+        """Retorna (encontrado, versão) sem ir ao banco."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry is not None and time.monotonic() < entry[1]:
+            return True, entry[0]
+        return False, None
+
+    def get(
+        self, user_id: UUID, loader: Callable[[UUID], Optional[int]]
+    ) -> Optional[int]:
+        found, version = self.lookup(user_id)
+        if found:
+            return version
+
+        version = loader(user_id)
+        self.set(user_id, version)
+        return version
+
+    def set(self, user_id: UUID, version: Optional[int]) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+            if len(self._entries) >= self._max_entries:
+                # dict preserva a ordem de inserção: descarta a entrada mais antiga
+                del self._entries[next(iter(self._entries))]
+            self._entries[user_id] = (version, time.monotonic() + self._ttl)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Compartilhado por todas as requisições do processo.
+token_versions = TokenVersionCache()
@@ -0,0 +1,76 @@
+from typing import Optional
+
+from domain import (
+    ImportResult,
+    ImportRow,
+    ImportStatus,
+    User,
+    UserPersistencePort,
+)
+
+from .password_hashing import PasswordHasher
+
+
+class UserImportService:
+    """Caso de uso de importação de usuários em lote.
+
+    Cada lote custa um SELECT para achar os emails já cadastrados, o hashing
+    das senhas em paralelo no pool de bcrypt e um único INSERT multi-linha,
+    em vez de busca, hash, INSERT e COMMIT por usuário.
+    """
+
+    def __init__(
+        self,
+        persistence_port: UserPersistencePort,
+        hasher: Optional[PasswordHasher] = None,
+    ):
+        self._persistence = persistence_port
+        self._hasher = hasher or PasswordHasher()
+
+    def import_batch(self, rows: list[ImportRow]) -> list[ImportResult]:
+        """Importa um lote e devolve um resultado por linha, na mesma ordem."""
+        results: dict[int, ImportResult] = {}
+        unique: dict[str, ImportRow] = {}
+        for row in rows:
+            if row.email in unique:
+                results[row.line] = ImportResult(
+                    line=row.line,
+                    status=ImportStatus.DUPLICATE,
+                    email=row.email,
+                    detail=f"Email repetido na linha {unique[row.email].line}",
+                )
+            else:
+                unique[row.email] = row
+
+        existing = self._persistence.find_existing_emails(list(unique))
+        pending = [row for row in unique.values() if row.email not in existing]
+        # Não segura a conexão enquanto o bcrypt roda
+        self._persistence.release_connection()
+        hashes = self._hasher.hash_many([row.password for row in pending])
+
+        users = [
+            User(
+                name=row.name,
+                email=row.email,
+                password_hash=password_hash,
+                role=row.role,
+                birth_date=row.birth_date,
+            )
+            for row, password_hash in zip(pending, hashes)
+        ]
+        inserted = self._persistence.save_many(users)
+
+        created = {
+            row.line: user for row, user in zip(pending, users) if user.id in inserted
+        }
+        for row in unique.values():
+            user = created.get(row.line)
+            # Sem INSERT: já cadastrado, inclusive por outra requisição
+            # entre o SELECT e o INSERT
+            results[row.line] = ImportResult(
+                line=row.line,
+                status=ImportStatus.CREATED if user else ImportStatus.EXISTS,
+                email=row.email,
+                id=user.id if user else None,
+            )
+        return [results[row.line] for row in rows]
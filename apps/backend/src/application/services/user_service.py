@@ -1,14 +1,25 @@
-from datetime import date
-from typing import Optional
+from datetime import date, datetime
+from typing import Iterator, Optional
 from uuid import UUID
 
 from domain import (
+    CountStrategy,
+    SearchCursor,
     User,
+    UserCursor,
+    UserPage,
     UserAlreadyExistsException,
     UserNotFoundException,
     UserPersistencePort,
+    UserQuery,
+    UserRole,
+    UserSearchPage,
+    UserSelection,
+    UserView,
 )
 
+from .token_versions import token_versions
+
 
 class UserService:
     """Serviço de aplicação para operações com usuários (use cases)."""
@@ -28,13 +39,25 @@ class UserService:
         user = User(name=name, email=email)
         return self._persistence.save(user)
 
-    def get_user(self, user_id: UUID) -> User:
-        """Busca um usuário pelo ID."""
-        user = self._persistence.find_by_id(user_id)
+    def get_user(self, user_id: UUID) -> UserView:
+        """Busca os dados públicos de um usuário pelo ID."""
+        user = self._persistence.find_view_by_id(user_id)
         if not user:
             raise UserNotFoundException(str(user_id))
         return user
 
+    def get_users(self, user_ids: list[UUID]) -> tuple[list[UserView], list[UUID]]:
+        """Busca vários usuários numa só consulta.
+
+        Retorna os encontrados na ordem pedida (sem repetições) e os ids
+        que não existem.
+        """
+        unique = list(dict.fromkeys(user_ids))
+        by_id = {user.id: user for user in self._persistence.find_views_by_ids(unique)}
+        found = [by_id[user_id] for user_id in unique if user_id in by_id]
+        missing = [user_id for user_id in unique if user_id not in by_id]
+        return found, missing
+
     def get_user_by_email(self, email: str) -> User:
         """Busca um usuário pelo email."""
         user = self._persistence.find_by_email(email)
@@ -42,9 +65,63 @@ class UserService:
             raise UserNotFoundException(email)
         return user
 
-    def list_users(self, skip: int = 0, limit: int = 100) -> list[User]:
-        """Lista todos os usuários com paginação."""
-        return self._persistence.find_all(skip=skip, limit=limit)
+    def list_users(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+        query: Optional[UserQuery] = None,
+    ) -> UserPage:
+        """Lista usuários por offset (`skip`) ou por keyset (`cursor`).
+
+        Busca um item a mais que o limite para saber se existe próxima
+        página; nesse caso `next_cursor` aponta para o último item retornado.
+        O `total` segue a estratégia de contagem informada. Filtros e
+        ordenação vêm em `query`; o cursor só vale para a mesma ordenação.
+        """
+        query = query or UserQuery()
+        if cursor is not None:
+            position = UserCursor.decode(cursor)
+            position.check(query)
+            users = self._persistence.find_views_after(position, limit + 1, query)
+        else:
+            users = self._persistence.find_all_views(
+                skip=skip, limit=limit + 1, query=query
+            )
+
+        page = UserPage(
+            users=users[:limit], total=self._persistence.count(count_strategy, query)
+        )
+        if len(users) > limit:
+            page.next_cursor = UserCursor.from_user(page.users[-1], query).encode()
+        return page
+
+    def search_users(
+        self, query: str, limit: int = 20, cursor: Optional[str] = None
+    ) -> UserSearchPage:
+        """Busca por nome ou email, por relevância, paginada por keyset.
+
+        Como na listagem, busca um item a mais para saber se há próxima página.
+        """
+        matches = self._persistence.search(
+            query.strip(),
+            limit + 1,
+            SearchCursor.decode(cursor) if cursor is not None else None,
+        )
+        next_cursor = None
+        if len(matches) > limit:
+            matches = matches[:limit]
+            next_cursor = SearchCursor.from_match(matches[-1]).encode()
+        return UserSearchPage(matches=matches, next_cursor=next_cursor)
+
+    def export_users(self, batch_size: int = 1000) -> Iterator[list[User]]:
+        """Percorre todos os usuários em lotes, para exportação em streaming."""
+        return self._persistence.stream_all(batch_size)
+
+    def get_change_version(self) -> int:
+        """Versão da tabela de usuários, que muda a cada escrita."""
+        return self._persistence.get_change_version()
 
     def update_user(
         self,
@@ -52,23 +129,52 @@ class UserService:
         name: Optional[str] = None,
         email: Optional[str] = None,
         birth_date: Optional[date] = None,
+        role: Optional[UserRole] = None,
+        expected_version: Optional[datetime] = None,
     ) -> User:
-        """Atualiza um usuário existente."""
-        user = self._persistence.find_by_id(user_id)
-        if not user:
+        """Atualiza um usuário existente.
+
+        Uma troca de role incrementa a versão de token do usuário, revogando
+        os access tokens com claims emitidos antes dela. Email repetido é
+        detectado pelo índice único, sem consulta prévia. Com
+        `expected_version`, falha se o usuário mudou desde essa versão.
+        """
+        updated = self._persistence.update(
+            user_id,
+            name=name,
+            email=email,
+            birth_date=birth_date,
+            role=role,
+            expected_version=expected_version,
+        )
+        if updated is None:
             raise UserNotFoundException(str(user_id))
+        token_versions.set(updated.id, updated.token_version)
+        return updated
 
-        if email and email != user.email:
-            existing_user = self._persistence.find_by_email(email)
-            if existing_user:
-                raise UserAlreadyExistsException(email)
+    def delete_user(
+        self, user_id: UUID, expected_version: Optional[datetime] = None
+    ) -> bool:
+        """Deleta um usuário pelo ID (só na `expected_version`, se informada)."""
+        if not self._persistence.delete(user_id, expected_version):
+            raise UserNotFoundException(str(user_id))
+        token_versions.set(user_id, None)
+        return True
 
-        user.update(name=name, email=email, birth_date=birth_date)
-        return self._persistence.update(user)
+    def update_role_many(self, selection: UserSelection, role: UserRole) -> list[UUID]:
+        """Troca a role dos usuários selecionados; retorna os ids alterados.
 
-    def delete_user(self, user_id: UUID) -> bool:
-        """Deleta um usuário pelo ID."""
-        user = self._persistence.find_by_id(user_id)
-        if not user:
-            raise UserNotFoundException(str(user_id))
-        return self._persistence.delete(user_id)
+        Como na troca individual, os tokens com claims dos alterados são
+        revogados.
+        """
+        versions = self._persistence.update_role_many(selection, role)
+        for user_id, version in versions.items():
+            token_versions.set(user_id, version)
+        return list(versions)
+
+    def delete_many(self, selection: UserSelection) -> list[UUID]:
+        """Remove os usuários selecionados; retorna os ids removidos."""
+        deleted = self._persistence.delete_many(selection)
+        for user_id in deleted:
+            token_versions.set(user_id, None)
+        return deleted
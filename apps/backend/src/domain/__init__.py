@@ -1,20 +1,56 @@
-from .entities import User, UserRole
-from .ports import UserPersistencePort
+from .entities import (
+    User,
+    UserRole,
+    UserSelection,
+    UserView,
+    CountStrategy,
+    UserCursor,
+    UserPage,
+    UserQuery,
+    UserSortField,
+    SearchCursor,
+    UserMatch,
+    UserSearchPage,
+    ImportResult,
+    ImportRow,
+    ImportStatus,
+)
+from .ports import UserPersistencePort, AsyncUserPersistencePort
 from .exceptions import (
     DomainException,
     UserNotFoundException,
     UserAlreadyExistsException,
     InvalidUserDataException,
     InvalidCredentialsException,
+    InvalidCursorException,
+    PasswordHashingUnavailableException,
+    UserVersionConflictException,
 )
 
 __all__ = [
     "User",
     "UserRole",
+    "UserSelection",
+    "UserView",
+    "CountStrategy",
+    "UserCursor",
+    "UserPage",
+    "UserQuery",
+    "UserSortField",
+    "SearchCursor",
+    "UserMatch",
+    "UserSearchPage",
+    "ImportResult",
+    "ImportRow",
+    "ImportStatus",
     "UserPersistencePort",
+    "AsyncUserPersistencePort",
     "DomainException",
     "UserNotFoundException",
     "UserAlreadyExistsException",
     "InvalidUserDataException",
     "InvalidCredentialsException",
+    "InvalidCursorException",
+    "PasswordHashingUnavailableException",
+    "UserVersionConflictException",
 ]
@@ -1,3 +1,22 @@
-from .user import User, UserRole
+from .user import User, UserRole, UserSelection, UserView
+from .pagination import CountStrategy, UserCursor, UserPage, UserQuery, UserSortField
+from .search import SearchCursor, UserMatch, UserSearchPage
+from .user_import import ImportResult, ImportRow, ImportStatus
 
-__all__ = ["User", "UserRole"]
+__all__ = [
+    "User",
+    "UserRole",
+    "UserSelection",
+    "UserView",
+    "CountStrategy",
+    "UserCursor",
+    "UserPage",
+    "UserQuery",
+    "UserSortField",
+    "SearchCursor",
+    "UserMatch",
+    "UserSearchPage",
+    "ImportResult",
+    "ImportRow",
+    "ImportStatus",
+]
@@ -0,0 +1,132 @@
+import base64
+import binascii
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from enum import Enum
+from typing import Optional, Union
+from uuid import UUID
+
+from domain.exceptions import InvalidCursorException
+
+from .user import User, UserRole, UserView
+
+
+class CountStrategy(str, Enum):
+    """Estratégia para calcular o total de usuários de uma listagem."""
+
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+
+
+class UserSortField(str, Enum):
+    """Colunas pelas quais a listagem pode ser ordenada."""
+
+    CREATED_AT = "created_at"
+    NAME = "name"
+    EMAIL = "email"
+
+
+@dataclass(frozen=True)
+class UserQuery:
+    """Filtros e ordenação da listagem, aplicados no banco.
+
+    Os filtros informados são combinados (E); os intervalos são semiabertos,
+    [from, to). O id desempata a ordenação, que fica estável para o keyset.
+    """
+
+    role: Optional[UserRole] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    birth_from: Optional[date] = None
+    birth_to: Optional[date] = None
+    sort: UserSortField = UserSortField.CREATED_AT
+    descending: bool = False
+
+    @property
+    def order(self) -> str:
+        """Ordenação no formato da API: a coluna, com `-` se decrescente."""
+        return f"-{self.sort.value}" if self.descending else self.sort.value
+
+    @property
+    def filtered(self) -> bool:
+        return any(
+            value is not None
+            for value in (
+                self.role,
+                self.created_from,
+                self.created_to,
+                self.birth_from,
+                self.birth_to,
+            )
+        )
+
+
+@dataclass(frozen=True)
+class UserCursor:
+    """Posição de paginação por keyset: (created_at, id) do último item lido.
+
+    Fora da ordem padrão, guarda também a ordenação da listagem (`order`) e
+    o valor da coluna ordenada no último item (`key`).
+    """
+
+    created_at: datetime
+    id: UUID
+    order: str = UserSortField.CREATED_AT.value
+    key: Optional[str] = None
+
+    @classmethod
+    def from_user(
+        cls, user: Union[User, UserView], query: Optional[UserQuery] = None
+    ) -> "UserCursor":
+        if query is None or query.sort == UserSortField.CREATED_AT:
+            key = None
+        else:
+            key = getattr(user, query.sort.value)
+        return cls(
+            created_at=user.created_at,
+            id=user.id,
+            order=query.order if query else UserSortField.CREATED_AT.value,
+            key=key,
+        )
+
+    def encode(self) -> str:
+        """Serializa o cursor num token opaco seguro para URLs."""
+        parts = [self.created_at.isoformat(), self.id.hex]
+        if self.order != UserSortField.CREATED_AT.value:
+            parts += [self.order, self.key or ""]
+        raw = "|".join(parts).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "UserCursor":
+        """Reconstrói o cursor a partir do token gerado por `encode`."""
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            raw = base64.urlsafe_b64decode(padded.encode()).decode()
+            # A chave vem por último: pode conter "|" (nomes são texto livre)
+            created_at, user_id, *rest = raw.split("|", 3)
+            if len(rest) == 1:
+                raise ValueError(raw)
+            order, key = rest or (UserSortField.CREATED_AT.value, None)
+            return cls(
+                created_at=datetime.fromisoformat(created_at),
+                id=UUID(user_id),
+                order=order,
+                key=key,
+            )
+        except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+            raise InvalidCursorException(token) from e
+
+    def check(self, query: UserQuery) -> None:
+        """Garante que o cursor veio de uma listagem com a mesma ordenação."""
+        if self.order != query.order:
+            raise InvalidCursorException(self.encode())
+
+
+@dataclass
+class UserPage:
+    """Página de usuários com o total e o cursor da próxima página, se houver."""
+
+    users: list[UserView] = field(default_factory=list)
+    total: int = 0
+    next_cursor: Optional[str] = None
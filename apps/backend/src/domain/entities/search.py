@@ -0,0 +1,57 @@
+import base64
+import binascii
+from dataclasses import dataclass, field
+from typing import Optional
+from uuid import UUID
+
+from domain.exceptions import InvalidCursorException
+
+from .user import User
+
+
+@dataclass
+class UserMatch:
+    """Usuário encontrado pela busca, com a relevância do resultado."""
+
+    user: User
+    score: float
+
+
+@dataclass(frozen=True)
+class SearchCursor:
+    """Posição de paginação da busca: (score, id) do último resultado lido.
+
+    Os resultados vêm por relevância decrescente e, no empate, por id.
+    """
+
+    score: float
+    id: UUID
+
+    @classmethod
+    def from_match(cls, match: UserMatch) -> "SearchCursor":
+        return cls(score=match.score, id=match.user.id)
+
+    def encode(self) -> str:
+        """Serializa o cursor num token opaco seguro para URLs."""
+        # repr preserva o float exato, necessário para a comparação no banco
+        raw = f"{self.score!r}|{self.id.hex}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "SearchCursor":
+        """Reconstrói o cursor a partir do token gerado por `encode`."""
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            raw = base64.urlsafe_b64decode(padded.encode()).decode()
+            score, user_id = raw.split("|")
+            return cls(score=float(score), id=UUID(user_id))
+        except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+            raise InvalidCursorException(token) from e
+
+
+@dataclass
+class UserSearchPage:
+    """Página de resultados da busca e o cursor da próxima, se houver."""
+
+    matches: list[UserMatch] = field(default_factory=list)
+    next_cursor: Optional[str] = None
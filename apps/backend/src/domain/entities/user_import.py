@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+from datetime import date
+from enum import Enum
+from typing import Optional
+from uuid import UUID
+
+from .user import UserRole
+
+
+class ImportStatus(str, Enum):
+    """Resultado de uma linha da importação em lote."""
+
+    CREATED = "created"
+    EXISTS = "exists"
+    DUPLICATE = "duplicate"
+    INVALID = "invalid"
+
+
+@dataclass
+class ImportRow:
+    """Linha já validada de uma importação, identificada pela posição no arquivo."""
+
+    line: int
+    name: str
+    email: str
+    password: str
+    role: UserRole = UserRole.USER
+    birth_date: Optional[date] = None
+
+
+@dataclass
+class ImportResult:
+    """Resultado de uma linha da importação, na ordem do arquivo."""
+
+    line: int
+    status: ImportStatus
+    email: Optional[str] = None
+    id: Optional[UUID] = None
+    detail: Optional[str] = None
@@ -29,3 +29,26 @@ class InvalidCredentialsException(DomainException):
 
     def __init__(self) -> None:
         super().__init__("Email ou senha inválidos")
+
+
+class PasswordHashingUnavailableException(DomainException):
+    """Exceção lançada quando o pool de hashing de senhas está saturado."""
+
+    def __init__(self) -> None:
+        super().__init__(
+            "Serviço de autenticação sobrecarregado, tente novamente em instantes"
+        )
+
+
+class InvalidCursorException(DomainException):
+    """Exceção lançada quando o cursor de paginação é inválido."""
+
+    def __init__(self, cursor: str):
+        super().__init__(f"Cursor de paginação inválido: {cursor}")
+
+
+class UserVersionConflictException(DomainException):
+    """Exceção lançada quando o usuário mudou desde a versão esperada."""
+
+    def __init__(self, identifier: str):
+        super().__init__(f"Usuário alterado desde a versão informada: {identifier}")
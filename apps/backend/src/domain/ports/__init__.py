@@ -1,3 +1,4 @@
 from .user_persistence_port import UserPersistencePort
+from .async_user_persistence_port import AsyncUserPersistencePort
 
-__all__ = ["UserPersistencePort"]
+__all__ = ["UserPersistencePort", "AsyncUserPersistencePort"]
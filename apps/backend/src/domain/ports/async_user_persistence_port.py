@@ -0,0 +1,139 @@
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from typing import Optional
+from uuid import UUID
+
+from domain.entities import (
+    CountStrategy,
+    User,
+    UserCursor,
+    UserQuery,
+    UserRole,
+    UserView,
+)
+
+
+class AsyncUserPersistencePort(ABC):
+    """Port (interface) assíncrona para persistência de usuários.
+
+    Mesmo contrato do UserPersistencePort, com métodos `async` para adapters
+    sobre drivers assíncronos (asyncpg, aiosqlite).
+    """
+
+    @abstractmethod
+    async def save(self, user: User) -> User:
+        """Persiste um novo usuário.
+
+        Raises:
+            UserAlreadyExistsException: o email já está cadastrado.
+        """
+
+    @abstractmethod
+    async def find_by_id(self, user_id: UUID) -> Optional[User]:
+        """Busca um usuário pelo ID."""
+
+    @abstractmethod
+    async def find_by_email(self, email: str) -> Optional[User]:
+        """Busca um usuário pelo email."""
+
+    @abstractmethod
+    async def find_all(
+        self, skip: int = 0, limit: int = 100, query: Optional[UserQuery] = None
+    ) -> list[User]:
+        """Lista usuários com paginação por offset.
+
+        Sem `query`, todos, ordenados por (created_at, id); com ela, só os que
+        passam nos filtros, na ordenação pedida (desempatada pelo id).
+        """
+
+    @abstractmethod
+    async def find_after(
+        self,
+        cursor: Optional[UserCursor] = None,
+        limit: int = 100,
+        query: Optional[UserQuery] = None,
+    ) -> list[User]:
+        """Lista usuários após o cursor (keyset); `query` como em `find_all`."""
+
+    @abstractmethod
+    async def find_view_by_id(self, user_id: UUID) -> Optional[UserView]:
+        """Busca os campos públicos de um usuário, sem montar a entidade."""
+
+    @abstractmethod
+    async def find_all_views(
+        self, skip: int = 0, limit: int = 100, query: Optional[UserQuery] = None
+    ) -> list[UserView]:
+        """Como `find_all`, lendo só as colunas expostas pela API."""
+
+    @abstractmethod
+    async def find_views_after(
+        self,
+        cursor: Optional[UserCursor] = None,
+        limit: int = 100,
+        query: Optional[UserQuery] = None,
+    ) -> list[UserView]:
+        """Como `find_after`, lendo só as colunas expostas pela API."""
+
+    @abstractmethod
+    async def count(
+        self,
+        strategy: CountStrategy = CountStrategy.EXACT,
+        query: Optional[UserQuery] = None,
+    ) -> int:
+        """Conta os usuários (que passam nos filtros de `query`, se houver).
+
+        `ESTIMATE` pode devolver um valor aproximado; com filtros, é exata.
+        """
+
+    @abstractmethod
+    async def get_change_version(self) -> int:
+        """Versão da tabela de usuários, incrementada a cada escrita."""
+
+    @abstractmethod
+    async def update(
+        self,
+        user_id: UUID,
+        name: Optional[str] = None,
+        email: Optional[str] = None,
+        birth_date: Optional[date] = None,
+        role: Optional[UserRole] = None,
+        expected_version: Optional[datetime] = None,
+    ) -> Optional[User]:
+        """Atualiza os campos informados (None = não altera).
+
+        Uma troca de role incrementa a versão de token do usuário. Com
+        `expected_version`, só altera se `User.version` ainda for essa.
+        Retorna o usuário atualizado, ou None se ele não existe.
+
+        Raises:
+            UserAlreadyExistsException: o novo email já está cadastrado.
+            UserVersionConflictException: o usuário mudou desde a versão.
+        """
+
+    @abstractmethod
+    async def update_password_hash(self, user_id: UUID, password_hash: str) -> None:
+        """Substitui o hash de senha do usuário (rehash no login).
+
+        Não muda a versão de alterações: o hash não aparece nas respostas,
+        então ETags e caches das listagens continuam valendo.
+        """
+
+    @abstractmethod
+    async def get_token_version(self, user_id: UUID) -> Optional[int]:
+        """Retorna a versão de token do usuário, ou None se ele não existe."""
+
+    @abstractmethod
+    async def release_connection(self) -> None:
+        """Encerra a transação corrente e devolve a conexão ao pool."""
+
+    @abstractmethod
+    async def delete(
+        self, user_id: UUID, expected_version: Optional[datetime] = None
+    ) -> bool:
+        """Remove um usuário pelo ID; retorna False se ele não existe.
+
+        Com `expected_version`, só remove se `User.version` ainda for essa.
+
+        Raises:
+            UserVersionConflictException: o usuário mudou desde a versão.
+        """
@@ -1,8 +1,19 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from datetime import date, datetime
+from typing import Iterator, Optional
 from uuid import UUID
 
-from domain.entities import User
+from domain.entities import (
+    CountStrategy,
+    SearchCursor,
+    User,
+    UserCursor,
+    UserMatch,
+    UserQuery,
+    UserRole,
+    UserSelection,
+    UserView,
+)
 
 
 class UserPersistencePort(ABC):
@@ -15,24 +26,176 @@ class UserPersistencePort(ABC):
 
     @abstractmethod
     def save(self, user: User) -> User:
-        """Persiste um novo usuário."""
+        """Persiste um novo usuário.
+
+        Raises:
+            UserAlreadyExistsException: o email já está cadastrado.
+        """
+
+    @abstractmethod
+    def save_many(self, users: list[User]) -> set[UUID]:
+        """Insere vários usuários de uma vez, ignorando emails já cadastrados.
+
+        Retorna os ids efetivamente inseridos.
+        """
 
     @abstractmethod
     def find_by_id(self, user_id: UUID) -> Optional[User]:
         """Busca um usuário pelo ID."""
 
+    @abstractmethod
+    def find_by_ids(self, user_ids: list[UUID]) -> list[User]:
+        """Busca vários usuários numa só consulta, sem ordem definida.
+
+        Ids inexistentes simplesmente não aparecem no resultado.
+        """
+
     @abstractmethod
     def find_by_email(self, email: str) -> Optional[User]:
         """Busca um usuário pelo email."""
 
     @abstractmethod
-    def find_all(self, skip: int = 0, limit: int = 100) -> list[User]:
-        """Lista todos os usuários com paginação."""
+    def find_existing_emails(self, emails: list[str]) -> set[str]:
+        """Retorna quais dos emails informados já estão cadastrados."""
+
+    @abstractmethod
+    def find_all(
+        self, skip: int = 0, limit: int = 100, query: Optional[UserQuery] = None
+    ) -> list[User]:
+        """Lista usuários com paginação por offset.
+
+        Sem `query`, todos, ordenados por (created_at, id); com ela, só os que
+        passam nos filtros, na ordenação pedida (desempatada pelo id).
+        """
+
+    @abstractmethod
+    def find_after(
+        self,
+        cursor: Optional[UserCursor] = None,
+        limit: int = 100,
+        query: Optional[UserQuery] = None,
+    ) -> list[User]:
+        """Lista usuários após o cursor (keyset); `query` como em `find_all`."""
+
+    @abstractmethod
+    def find_view_by_id(self, user_id: UUID) -> Optional[UserView]:
+        """Busca os campos públicos de um usuário, sem montar a entidade."""
+
+    @abstractmethod
+    def find_views_by_ids(self, user_ids: list[UUID]) -> list[UserView]:
+        """Como `find_by_ids`, lendo só as colunas expostas pela API."""
+
+    @abstractmethod
+    def find_all_views(
+        self, skip: int = 0, limit: int = 100, query: Optional[UserQuery] = None
+    ) -> list[UserView]:
+        """Como `find_all`, lendo só as colunas expostas pela API."""
+
+    @abstractmethod
+    def find_views_after(
+        self,
+        cursor: Optional[UserCursor] = None,
+        limit: int = 100,
+        query: Optional[UserQuery] = None,
+    ) -> list[UserView]:
+        """Como `find_after`, lendo só as colunas expostas pela API."""
+
+    @abstractmethod
+    def search(
+        self, query: str, limit: int = 20, cursor: Optional[SearchCursor] = None
+    ) -> list[UserMatch]:
+        """Busca usuários por nome ou email, do mais ao menos relevante.
+
+        Casa prefixos e trechos do texto (e, no PostgreSQL, grafias
+        parecidas, por trigramas). Com `cursor`, continua após ele.
+        """
+
+    @abstractmethod
+    def stream_all(self, batch_size: int = 1000) -> Iterator[list[User]]:
+        """Percorre todos os usuários em lotes, ordenados por (created_at, id).
+
+        Lê com cursor do lado do servidor quando o banco suporta, então a
+        memória fica limitada a um lote independentemente do tamanho da tabela.
+        """
+
+    @abstractmethod
+    def count(
+        self,
+        strategy: CountStrategy = CountStrategy.EXACT,
+        query: Optional[UserQuery] = None,
+    ) -> int:
+        """Conta os usuários (que passam nos filtros de `query`, se houver).
+
+        `ESTIMATE` pode devolver um valor aproximado; com filtros, é exata.
+        """
+
+    @abstractmethod
+    def get_change_version(self) -> int:
+        """Versão da tabela de usuários, incrementada a cada escrita."""
+
+    @abstractmethod
+    def update(
+        self,
+        user_id: UUID,
+        name: Optional[str] = None,
+        email: Optional[str] = None,
+        birth_date: Optional[date] = None,
+        role: Optional[UserRole] = None,
+        expected_version: Optional[datetime] = None,
+    ) -> Optional[User]:
+        """Atualiza os campos informados (None = não altera).
+
+        Uma troca de role incrementa a versão de token do usuário. Com
+        `expected_version`, só altera se `User.version` ainda for essa.
+        Retorna o usuário atualizado, ou None se ele não existe.
+
+        Raises:
+            UserAlreadyExistsException: o novo email já está cadastrado.
+            UserVersionConflictException: o usuário mudou desde a versão.
+        """
+
+    @abstractmethod
+    def update_role_many(
+        self, selection: UserSelection, role: UserRole
+    ) -> dict[UUID, int]:
+        """Troca a role de todos os usuários selecionados numa só transação.
+
+        Usuários que já têm a role ficam de fora. Retorna, para cada usuário
+        alterado, a nova versão de token.
+        """
+
+    @abstractmethod
+    def update_password_hash(self, user_id: UUID, password_hash: str) -> None:
+        """Substitui o hash de senha do usuário (rehash no login).
+
+        Não muda a versão de alterações: o hash não aparece nas respostas,
+        então ETags e caches das listagens continuam valendo.
+        """
+
+    @abstractmethod
+    def get_token_version(self, user_id: UUID) -> Optional[int]:
+        """Retorna a versão de token do usuário, ou None se ele não existe."""
+
+    @abstractmethod
+    def release_connection(self) -> None:
+        """Encerra a transação corrente e devolve a conexão ao pool.
+
+        Chamado antes de trabalho demorado fora do banco (como o bcrypt), para
+        que a requisição não segure uma conexão enquanto espera.
+        """
 
     @abstractmethod
-    def update(self, user: User) -> User:
-        """Atualiza um usuário existente."""
+    def delete(
+        self, user_id: UUID, expected_version: Optional[datetime] = None
+    ) -> bool:
+        """Remove um usuário pelo ID; retorna False se ele não existe.
+
+        Com `expected_version`, só remove se `User.version` ainda for essa.
+
+        Raises:
+            UserVersionConflictException: o usuário mudou desde a versão.
+        """
 
     @abstractmethod
-    def delete(self, user_id: UUID) -> bool:
-        """Remove um usuário pelo ID."""
+    def delete_many(self, selection: UserSelection) -> list[UUID]:
+        """Remove todos os usuários selecionados; retorna os ids removidos."""
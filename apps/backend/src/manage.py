@@ -0,0 +1,56 @@
+"""Comandos administrativos do backend.
+
+Uso:
+    python src/manage.py backfill-signups
+    python src/manage.py calibrate-hasher [--target-ms 250]
+"""
+
+import argparse
+
+from adapters import SessionLocal, backfill_signup_daily, settings
+from application import calibrate_bcrypt_rounds
+
+
+def backfill_signups(_args: argparse.Namespace) -> None:
+    """Reconstrói o rollup diário de cadastros a partir da tabela users."""
+    db = SessionLocal()
+    try:
+        rows = backfill_signup_daily(db)
+    finally:
+        db.close()
+    print(f"Rollup user_signup_daily reconstruído: {rows} linhas")
+
+
+def calibrate_hasher(args: argparse.Namespace) -> None:
+    """Escolhe o custo do bcrypt que atinge o tempo alvo de verificação."""
+    rounds, measurements = calibrate_bcrypt_rounds(args.target_ms / 1000)
+    for cost, seconds in measurements:
+        print(f"bcrypt rounds={cost:2d}: {seconds * 1000:8.1f} ms")
+    print(
+        f"Custo atual: {settings.password_hash_bcrypt_rounds}. "
+        f"Sugerido para {args.target_ms:.0f} ms: "
+        f"PASSWORD_HASH_BCRYPT_ROUNDS={rounds}"
+    )
+
+
+COMMANDS = {
+    "backfill-signups": backfill_signups,
+    "calibrate-hasher": calibrate_hasher,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    parser.add_argument(
+        "--target-ms",
+        type=float,
+        default=250.0,
+        help="tempo alvo de uma verificação de senha (calibrate-hasher)",
+    )
+    args = parser.parse_args()
+    COMMANDS[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
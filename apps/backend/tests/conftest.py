@@ -1,11 +1,16 @@
+from contextlib import contextmanager
+
+import httpx
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from adapters import Base, get_db
-from api.main import app
+from adapters import Base, ReadReplicas, get_async_db, get_db, get_read_replicas
+from adapters.database.postgresql_user_adapter import user_count_cache
+from api.main import app, create_app
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
 engine = create_engine(
@@ -29,12 +34,97 @@ def override_get_db():
 def db_session():
     """Fixture que cria um banco limpo para cada teste."""
     Base.metadata.create_all(bind=engine)
+    user_count_cache.invalidate()
     db = TestingSessionLocal()
     yield db
     db.close()
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(scope="function")
+async def async_session_factory():
+    """Fixture que cria um banco aiosqlite limpo para cada teste async."""
+    async_engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    user_count_cache.invalidate()
+    yield async_sessionmaker(async_engine, expire_on_commit=False)
+    await async_engine.dispose()
+
+
+@pytest.fixture(scope="function")
+async def async_client(async_session_factory):
+    """Fixture que retorna um cliente httpx para a aplicação com ASYNC_API."""
+
+    async def override_get_async_db():
+        async with async_session_factory() as db:
+            yield db
+
+    async_app = create_app(async_api=True)
+    async_app.dependency_overrides[get_async_db] = override_get_async_db
+    transport = httpx.ASGITransport(app=async_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture(scope="function")
+async def async_auth_headers(async_client):
+    """Fixture que cria um admin no app async e retorna os headers."""
+    await async_client.post(
+        "/api/auth/register",
+        json={
+            "name": "Admin User",
+            "email": "admin@example.com",
+            "password": "adminpass123",
+            "role": "admin",
+        },
+    )
+    response = await async_client.post(
+        "/api/auth/login",
+        json={"email": "admin@example.com", "password": "adminpass123"},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture(scope="function")
+def sql_statements():
+    """Fixture que registra os comandos SQL executados no engine de testes."""
+    statements: list[str] = []
+
+    def _record(_conn, _cursor, statement, _params, _context, _executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _record)
+
+
+@pytest.fixture(scope="function")
+def query_budget(sql_statements):
+    """Fixture para limitar os comandos SQL de um trecho (ex.: uma requisição).
+
+    Uso: `with query_budget(3): client.get(...)`. Falha listando os comandos
+    executados quando o orçamento é estourado, o que deixa um N+1 evidente.
+    """
+
+    @contextmanager
+    def budget(max_queries: int):
+        start = len(sql_statements)
+        yield
+        executed = sql_statements[start:]
+        assert (
+            len(executed) <= max_queries
+        ), f"{len(executed)} comandos SQL, orçamento de {max_queries}:\n" + "\n".join(
+            executed
+        )
+
+    return budget
+
+
 @pytest.fixture(scope="function")
 def client(db_session):
     """Fixture que retorna um TestClient configurado."""
@@ -67,6 +157,31 @@ def admin_token(client):
     return response.json()["access_token"]
 
 
+@pytest.fixture(scope="function")
+def claims_tokens():
+    """Fixture que habilita access tokens com claims durante o teste."""
+    from adapters import settings
+    from application.services.token_versions import token_versions
+
+    settings.auth_claims_tokens = True
+    token_versions.clear()
+    yield
+    settings.auth_claims_tokens = False
+    token_versions.clear()
+
+
+@pytest.fixture(scope="function")
+def user_cache():
+    """Fixture que habilita o cache de usuários durante o teste."""
+    from adapters import settings, user_entity_cache
+
+    settings.user_cache_enabled = True
+    user_entity_cache.clear()
+    yield user_entity_cache
+    settings.user_cache_enabled = False
+    user_entity_cache.clear()
+
+
 @pytest.fixture(scope="function")
 def user_token(client):
     """Fixture que cria um usuário comum e retorna o token."""
@@ -98,3 +213,53 @@ def auth_headers(admin_token):
 def user_auth_headers(user_token):
     """Fixture que retorna headers de autenticação para usuário comum."""
     return {"Authorization": f"Bearer {user_token}"}
+
+
+class ReplicaStandIn:
+    """Réplica de leitura de teste: um segundo SQLite, replicado sob demanda.
+
+    O relógio das verificações de lag é `now`, avançado pelo próprio teste.
+    """
+
+    def __init__(self):
+        self.engine = create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(bind=self.engine)
+        self.now = 0.0
+        self.replicas = ReadReplicas(
+            TestingSessionLocal,
+            [sessionmaker(autocommit=False, autoflush=False, bind=self.engine)],
+            max_lag=2.0,
+            check_interval=1.0,
+            clock=lambda: self.now,
+        )
+
+    def sync(self):
+        """Copia o primário inteiro para a réplica, como a replicação faria."""
+        with engine.connect() as source, self.engine.begin() as target:
+            for table in Base.metadata.sorted_tables:
+                target.execute(table.delete())
+                rows = [dict(row._mapping) for row in source.execute(table.select())]
+                if rows:
+                    target.execute(table.insert(), rows)
+
+
+@pytest.fixture(scope="function")
+def replica(client):
+    """Fixture com a réplica de leitura de teste, sobre o banco do `client`."""
+    stand_in = ReplicaStandIn()
+    yield stand_in
+    stand_in.engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def replica_client(replica):
+    """Fixture com um TestClient cujas leituras vão à réplica de teste."""
+    replica_app = create_app(read_replicas=True)
+    replica_app.dependency_overrides[get_db] = override_get_db
+    replica_app.dependency_overrides[get_read_replicas] = lambda: replica.replicas
+    with TestClient(replica_app) as c:
+        yield c
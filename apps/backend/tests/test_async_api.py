@@ -0,0 +1,374 @@
+"""Testes do stack assíncrono (ASYNC_API) contra aiosqlite."""
+
+
+async def _register(client, email, password="password123", role="user"):
+    return await client.post(
+        "/api/auth/register",
+        json={"name": email, "email": email, "password": password, "role": role},
+    )
+
+
+async def _login(client, email, password="password123"):
+    return await client.post(
+        "/api/auth/login", json={"email": email, "password": password}
+    )
+
+
+class TestAsyncAuthEndpoints:
+    """Testes para as rotas async de autenticação."""
+
+    async def test_register_and_login(self, async_client):
+        response = await _register(async_client, "john@example.com")
+        assert response.status_code == 201
+        assert response.json()["email"] == "john@example.com"
+
+        response = await _login(async_client, "john@example.com")
+        assert response.status_code == 200
+        tokens = response.json()
+        assert tokens["user"]["email"] == "john@example.com"
+
+        response = await async_client.get(
+            "/api/auth/me",
+            headers={"Authorization": f"Bearer {tokens['access_token']}"},
+        )
+        assert response.status_code == 200
+        assert response.json()["email"] == "john@example.com"
+
+    async def test_register_duplicate_email(self, async_client):
+        await _register(async_client, "john@example.com")
+        response = await _register(async_client, "john@example.com")
+        assert response.status_code == 409
+
+    async def test_login_invalid_credentials(self, async_client):
+        await _register(async_client, "john@example.com")
+        assert (await _login(async_client, "ghost@example.com")).status_code == 401
+        response = await _login(async_client, "john@example.com", "wrongpassword")
+        assert response.status_code == 401
+
+    async def test_login_rehashes_outdated_password_hash(
+        self, async_client, async_session_factory, async_auth_headers, monkeypatch
+    ):
+        from sqlalchemy import select
+
+        from adapters.database.models import UserModel
+        from application import PasswordHasher
+
+        monkeypatch.setattr(
+            "api.async_auth_routes.password_hasher", PasswordHasher(bcrypt_rounds=4)
+        )
+        await _register(async_client, "john@example.com")
+        monkeypatch.setattr(
+            "api.async_auth_routes.password_hasher", PasswordHasher(bcrypt_rounds=5)
+        )
+
+        etag = (
+            await async_client.get("/api/users", headers=async_auth_headers)
+        ).headers["ETag"]
+        assert (await _login(async_client, "john@example.com")).status_code == 200
+
+        async with async_session_factory() as db:
+            password_hash = await db.scalar(
+                select(UserModel.password_hash).filter_by(email="john@example.com")
+            )
+        assert password_hash.startswith("$2b$05$")
+        response = await async_client.get(
+            "/api/users", headers={**async_auth_headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 304
+
+    async def test_get_me_invalid_token(self, async_client):
+        response = await async_client.get(
+            "/api/auth/me", headers={"Authorization": "Bearer invalid-token"}
+        )
+        assert response.status_code == 401
+
+    async def test_refresh_token(self, async_client, async_auth_headers):
+        await _register(async_client, "john@example.com")
+        tokens = (await _login(async_client, "john@example.com")).json()
+
+        response = await async_client.post(
+            "/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+        )
+        assert response.status_code == 200
+        assert response.json()["user"]["email"] == "john@example.com"
+
+        response = await async_client.post(
+            "/api/auth/refresh", json={"refresh_token": "invalid-token"}
+        )
+        assert response.status_code == 401
+
+        # Refresh token de usuário removido não gera novo access token
+        await async_client.delete(
+            f"/api/users/{tokens['user']['id']}", headers=async_auth_headers
+        )
+        response = await async_client.post(
+            "/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+        )
+        assert response.status_code == 401
+
+
+class TestAsyncQueryHeaders:
+    """Contagem de comandos SQL por requisição no stack async."""
+
+    async def test_query_headers(self, async_session_factory):
+        import httpx
+
+        from adapters import get_async_db
+        from api.main import create_app
+
+        async def override_get_async_db():
+            async with async_session_factory() as db:
+                yield db
+
+        app = create_app(async_api=True, query_headers=True)
+        app.dependency_overrides[get_async_db] = override_get_async_db
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            await _register(c, "john@example.com")
+            response = await _login(c, "john@example.com")
+
+        # Os comandos rodam em greenlets do SQLAlchemy e ainda assim contam
+        assert response.headers["X-DB-Queries"] == "1"
+        assert float(response.headers["X-DB-Time"]) > 0
+
+
+class TestAsyncClaimsTokens:
+    """Testes para tokens com claims no stack async."""
+
+    async def test_role_change_revokes_token(
+        self, async_client, claims_tokens, async_auth_headers
+    ):
+        from application.services.token_versions import token_versions
+
+        await _register(async_client, "john@example.com")
+        tokens = (await _login(async_client, "john@example.com")).json()
+        user_headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+        # Sem a versão em memória, ela é lida do banco
+        token_versions.clear()
+        response = await async_client.get("/api/auth/me", headers=user_headers)
+        assert response.status_code == 200
+
+        response = await async_client.put(
+            f"/api/users/{tokens['user']['id']}",
+            json={"role": "admin"},
+            headers=async_auth_headers,
+        )
+        assert response.json()["role"] == "admin"
+        response = await async_client.get("/api/auth/me", headers=user_headers)
+        assert response.status_code == 401
+
+    async def test_name_change_revokes_token(
+        self, async_client, claims_tokens, async_auth_headers
+    ):
+        await _register(async_client, "john@example.com")
+        tokens = (await _login(async_client, "john@example.com")).json()
+        user_headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+        response = await async_client.put(
+            f"/api/users/{tokens['user']['id']}",
+            json={"name": "Renamed"},
+            headers=async_auth_headers,
+        )
+        assert response.json()["name"] == "Renamed"
+        response = await async_client.get("/api/auth/me", headers=user_headers)
+        assert response.status_code == 401
+
+
+class TestAsyncUserRoutes:
+    """Testes para as rotas async de usuários."""
+
+    async def test_create_and_get_user(self, async_client, async_auth_headers):
+        payload = {
+            "name": "Jane",
+            "email": "jane@example.com",
+            "password": "password123",
+            "birth_date": "1990-05-15",
+        }
+        response = await async_client.post(
+            "/api/users", json=payload, headers=async_auth_headers
+        )
+        assert response.status_code == 201
+        user_id = response.json()["id"]
+        assert response.json()["birth_date"] == "1990-05-15"
+
+        response = await async_client.post(
+            "/api/users", json=payload, headers=async_auth_headers
+        )
+        assert response.status_code == 409
+
+        response = await async_client.get(
+            f"/api/users/{user_id}", headers=async_auth_headers
+        )
+        assert response.status_code == 200
+        assert response.json()["email"] == "jane@example.com"
+
+    async def test_get_user_not_found(self, async_client, async_auth_headers):
+        response = await async_client.get(
+            "/api/users/00000000-0000-0000-0000-000000000000",
+            headers=async_auth_headers,
+        )
+        assert response.status_code == 404
+
+    async def test_create_user_requires_admin(self, async_client):
+        await _register(async_client, "john@example.com")
+        tokens = (await _login(async_client, "john@example.com")).json()
+        response = await async_client.post(
+            "/api/users",
+            json={"name": "X", "email": "x@example.com", "password": "password123"},
+            headers={"Authorization": f"Bearer {tokens['access_token']}"},
+        )
+        assert response.status_code == 403
+
+    async def test_list_users_offset_and_cursor(self, async_client, async_auth_headers):
+        for i in range(4):
+            await _register(async_client, f"user{i}@example.com")
+
+        response = await async_client.get(
+            "/api/users", params={"skip": 1, "limit": 2}, headers=async_auth_headers
+        )
+        data = response.json()
+        assert data["total"] == 5
+        assert [u["email"] for u in data["users"]] == [
+            "user0@example.com",
+            "user1@example.com",
+        ]
+
+        emails = []
+        cursor = None
+        while True:
+            params = {"limit": 2, "count": "estimate"}
+            if cursor:
+                params["cursor"] = cursor
+            data = (
+                await async_client.get(
+                    "/api/users", params=params, headers=async_auth_headers
+                )
+            ).json()
+            emails += [u["email"] for u in data["users"]]
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+        assert len(emails) == 5
+        assert data["total"] == 5
+
+        response = await async_client.get(
+            "/api/users", params={"cursor": "not-a-cursor"}, headers=async_auth_headers
+        )
+        assert response.status_code == 400
+
+    async def test_list_users_filters_and_sort(self, async_client, async_auth_headers):
+        for i in range(3):
+            await _register(async_client, f"user{i}@example.com")
+
+        params = {"role": "user", "sort": "-email", "limit": 2}
+        first = (
+            await async_client.get(
+                "/api/users", params=params, headers=async_auth_headers
+            )
+        ).json()
+        second = (
+            await async_client.get(
+                "/api/users",
+                params={**params, "cursor": first["next_cursor"]},
+                headers=async_auth_headers,
+            )
+        ).json()
+
+        emails = [u["email"] for u in first["users"] + second["users"]]
+        assert emails == ["user2@example.com", "user1@example.com", "user0@example.com"]
+        assert first["total"] == 3
+        assert second["next_cursor"] is None
+
+    async def test_update_user(self, async_client, async_auth_headers):
+        user = (await _register(async_client, "john@example.com")).json()
+        await _register(async_client, "jane@example.com")
+
+        response = await async_client.put(
+            f"/api/users/{user['id']}",
+            json={"name": "John Updated"},
+            headers=async_auth_headers,
+        )
+        assert response.status_code == 200
+        assert response.json()["name"] == "John Updated"
+
+        response = await async_client.put(
+            f"/api/users/{user['id']}",
+            json={"email": "jane@example.com"},
+            headers=async_auth_headers,
+        )
+        assert response.status_code == 409
+
+        response = await async_client.put(
+            "/api/users/00000000-0000-0000-0000-000000000000",
+            json={"name": "Nobody"},
+            headers=async_auth_headers,
+        )
+        assert response.status_code == 404
+
+    async def test_delete_user(self, async_client, async_auth_headers):
+        user = (await _register(async_client, "john@example.com")).json()
+
+        response = await async_client.delete(
+            f"/api/users/{user['id']}", headers=async_auth_headers
+        )
+        assert response.status_code == 204
+
+        response = await async_client.delete(
+            f"/api/users/{user['id']}", headers=async_auth_headers
+        )
+        assert response.status_code == 404
+
+
+class TestAsyncETags:
+    """ETags e requisições condicionais no stack async."""
+
+    async def test_conditional_requests(self, async_client, async_auth_headers):
+        user_id = (await _register(async_client, "john@example.com")).json()["id"]
+        path = f"/api/users/{user_id}"
+        etag = (await async_client.get(path, headers=async_auth_headers)).headers[
+            "ETag"
+        ]
+
+        response = await async_client.get(
+            path, headers={**async_auth_headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 304
+
+        list_etag = (
+            await async_client.get("/api/users", headers=async_auth_headers)
+        ).headers["ETag"]
+        response = await async_client.get(
+            "/api/users", headers={**async_auth_headers, "If-None-Match": list_etag}
+        )
+        assert response.status_code == 304
+
+        response = await async_client.put(
+            path,
+            json={"name": "First"},
+            headers={**async_auth_headers, "If-Match": etag},
+        )
+        assert response.status_code == 200
+        new_etag = response.headers["ETag"]
+
+        for payload in ({"name": "Second"}, {"role": "admin"}):
+            response = await async_client.put(
+                path, json=payload, headers={**async_auth_headers, "If-Match": etag}
+            )
+            assert response.status_code == 412
+        response = await async_client.delete(
+            path, headers={**async_auth_headers, "If-Match": etag}
+        )
+        assert response.status_code == 412
+
+        response = await async_client.put(
+            path,
+            json={"role": "admin"},
+            headers={**async_auth_headers, "If-Match": new_etag},
+        )
+        assert response.status_code == 200
+        response = await async_client.delete(
+            path,
+            headers={**async_auth_headers, "If-Match": response.headers["ETag"]},
+        )
+        assert response.status_code == 204
@@ -6,7 +6,7 @@ import pytest
 from adapters import PostgreSQLUserAdapter
 from adapters.database.models import UserModel
 from application import AuthService, UserService
-from domain import User, UserNotFoundException, InvalidCredentialsException
+from domain import User, UserCursor, UserNotFoundException, InvalidCredentialsException
 
 
 class TestUserModelRepr:
@@ -90,19 +90,188 @@ class TestUserServiceUpdate:
             user_service.update_user(user1.id, email="user2@example.com")
 
 
+class TestUserCursor:
+    """Testes para o cursor de paginação por keyset."""
+
+    def test_encode_decode_roundtrip(self):
+        from domain import UserCursor
+
+        cursor = UserCursor(created_at=datetime(2026, 1, 2, 3, 4, 5, 678), id=uuid4())
+        assert UserCursor.decode(cursor.encode()) == cursor
+
+    def test_decode_invalid_token(self):
+        from domain import InvalidCursorException, UserCursor
+
+        with pytest.raises(InvalidCursorException):
+            UserCursor.decode("!!!")
+
+    def test_sorted_cursor_keeps_key_and_order(self):
+        import base64
+
+        from domain import InvalidCursorException, UserCursor, UserQuery, UserSortField
+
+        query = UserQuery(sort=UserSortField.NAME, descending=True)
+        user = User(name="Ana | Lima", email="ana@example.com")
+        cursor = UserCursor.decode(UserCursor.from_user(user, query).encode())
+
+        assert (cursor.order, cursor.key, cursor.id) == ("-name", "Ana | Lima", user.id)
+        cursor.check(query)
+        with pytest.raises(InvalidCursorException):
+            cursor.check(UserQuery())
+        # Ordenação sem a chave do último item
+        raw = f"2026-01-01T00:00:00|{user.id.hex}|name".encode()
+        with pytest.raises(InvalidCursorException):
+            UserCursor.decode(base64.urlsafe_b64encode(raw).decode())
+
+    def test_find_after_breaks_created_at_ties_by_id(self, db_session):
+        from domain import UserCursor
+
+        adapter = PostgreSQLUserAdapter(db_session)
+        created_at = datetime(2026, 1, 1, 12, 0)
+        for i in range(3):
+            adapter.save(
+                User(
+                    name=f"User {i}",
+                    email=f"user{i}@example.com",
+                    password_hash="hash",
+                    created_at=created_at,
+                )
+            )
+        first_page = adapter.find_after(None, limit=2)
+        second_page = adapter.find_after(UserCursor.from_user(first_page[-1]), limit=2)
+
+        ids = [user.id for user in first_page + second_page]
+        assert len(second_page) == 1
+        assert ids == sorted(ids)
+
+
+class TestSearchCursor:
+    """Testes para o cursor de paginação da busca."""
+
+    def test_encode_decode_keeps_exact_score(self):
+        from domain import SearchCursor
+
+        cursor = SearchCursor(score=0.1 + 0.2, id=uuid4())
+        assert SearchCursor.decode(cursor.encode()) == cursor
+
+    def test_decode_invalid_token(self):
+        from domain import InvalidCursorException, SearchCursor
+
+        with pytest.raises(InvalidCursorException):
+            SearchCursor.decode("bm90LWEtY3Vyc29y")
+
+
+class TestCountCache:
+    """Testes para o cache de contagem com TTL."""
+
+    def test_caches_until_invalidated(self):
+        from adapters.database.count_cache import CountCache
+
+        cache = CountCache(ttl_seconds=60)
+        assert cache.get_or_load(lambda: 1) == 1
+        assert cache.get_or_load(lambda: 2) == 1
+
+        cache.invalidate()
+        assert cache.get_or_load(lambda: 3) == 3
+
+    def test_expires_after_ttl(self):
+        from adapters.database.count_cache import CountCache
+
+        cache = CountCache(ttl_seconds=0)
+        assert cache.get_or_load(lambda: 1) == 1
+        assert cache.get_or_load(lambda: 2) == 2
+
+    def test_discards_value_loaded_during_invalidation(self):
+        from adapters.database.count_cache import CountCache
+
+        cache = CountCache(ttl_seconds=60)
+
+        def racing_loader():
+            cache.invalidate()  # escrita concorrente durante o COUNT
+            return 1
+
+        assert cache.get_or_load(racing_loader) == 1
+        assert cache.get_or_load(lambda: 2) == 2
+
+    def test_adapter_count_invalidated_on_writes(self, db_session):
+        adapter = PostgreSQLUserAdapter(db_session)
+        assert adapter.count() == 0
+
+        user = adapter.save(
+            User(name="Test", email="test@example.com", password_hash="hash")
+        )
+        assert adapter.count() == 1
+
+        adapter.delete(user.id)
+        assert adapter.count() == 0
+
+
 class TestPostgreSQLUserAdapterUpdate:
     """Testes para PostgreSQLUserAdapter.update."""
 
-    def test_update_nonexistent_user_raises_value_error(self, db_session):
+    def test_update_nonexistent_user_returns_none(self, db_session):
+        from domain import UserRole
+
         adapter = PostgreSQLUserAdapter(db_session)
-        nonexistent_user = User(
-            name="Ghost",
-            email="ghost@example.com",
-            password_hash="hash",
-        )
 
-        with pytest.raises(ValueError, match="not found"):
-            adapter.update(nonexistent_user)
+        assert adapter.update(uuid4(), name="Ghost") is None
+        assert adapter.update(uuid4(), role=UserRole.ADMIN) is None
+
+    def test_update_is_a_single_users_statement(self, db_session, sql_statements):
+        adapter = PostgreSQLUserAdapter(db_session)
+        user = adapter.save(User(name="Test", email="test@example.com"))
+        sql_statements.clear()
+
+        updated = adapter.update(user.id, name="Renamed", email="new@example.com")
+
+        # O UPDATE ... RETURNING e o incremento da versão da tabela
+        assert [s.split()[0] for s in sql_statements] == ["UPDATE", "INSERT"]
+        assert updated.name == "Renamed"
+        assert updated.email == "new@example.com"
+        assert updated.updated_at is not None
+
+    def test_unique_violations(self, db_session):
+        from sqlalchemy.exc import IntegrityError
+
+        from domain import UserAlreadyExistsException
+
+        adapter = PostgreSQLUserAdapter(db_session)
+        user = adapter.save(User(name="Test", email="test@example.com"))
+        other = adapter.save(User(name="Other", email="other@example.com"))
+
+        with pytest.raises(UserAlreadyExistsException, match="test@example.com"):
+            adapter.save(User(name="Again", email="test@example.com"))
+        with pytest.raises(UserAlreadyExistsException, match="test@example.com"):
+            adapter.update(other.id, email="test@example.com")
+        # Só o índice de email vira exceção de domínio
+        with pytest.raises(IntegrityError):
+            adapter.save(User(id=user.id, name="Clone", email="clone@example.com"))
+        assert adapter.count() == 2
+
+    def test_email_conflict_uses_postgres_constraint_name(self):
+        from types import SimpleNamespace
+
+        from sqlalchemy.exc import IntegrityError
+
+        from adapters.database.user_statements import is_email_conflict
+
+        def psycopg_error(constraint):
+            # A mensagem cita "email", mas o que vale é a constraint
+            orig = Exception('violates unique constraint on "email"')
+            orig.diag = SimpleNamespace(constraint_name=constraint)
+            return IntegrityError("INSERT", {}, orig)
+
+        def asyncpg_error(constraint):
+            cause = Exception("duplicate key value")
+            cause.constraint_name = constraint
+            orig = Exception(str(cause))
+            orig.__cause__ = cause
+            return IntegrityError("INSERT", {}, orig)
+
+        assert is_email_conflict(psycopg_error("ix_users_email"))
+        assert not is_email_conflict(psycopg_error("users_pkey"))
+        assert is_email_conflict(asyncpg_error("ix_users_email"))
+        assert not is_email_conflict(asyncpg_error("users_pkey"))
 
 
 class TestPostgreSQLUserAdapterDelete:
@@ -114,6 +283,535 @@ class TestPostgreSQLUserAdapterDelete:
         assert result is False
 
 
+class TestPostgreSQLUserAdapterBulk:
+    """Testes para as escritas em lote do PostgreSQLUserAdapter."""
+
+    def test_selection_requires_a_criterion(self):
+        from domain import InvalidUserDataException, UserRole, UserSelection
+
+        with pytest.raises(InvalidUserDataException):
+            UserSelection()
+        assert UserSelection(ids=()).ids == ()
+        assert UserSelection(role=UserRole.USER).role == UserRole.USER
+
+    def test_bulk_writes_through_cache(self, db_session):
+        from adapters import CachedUserPersistenceAdapter, UserEntityCache
+        from domain import UserRole, UserSelection
+
+        cache = UserEntityCache()
+        adapter = CachedUserPersistenceAdapter(PostgreSQLUserAdapter(db_session), cache)
+        users = [
+            adapter.save(User(name="Test", email=f"user{i}@example.com"))
+            for i in range(2)
+        ]
+        for user in users:
+            cache.put(user)
+        everyone = UserSelection(ids=tuple(user.id for user in users))
+
+        versions = adapter.update_role_many(everyone, UserRole.ADMIN)
+
+        assert versions == {user.id: 1 for user in users}
+        assert adapter.find_by_id(users[0].id).role == UserRole.ADMIN
+        assert adapter.update_role_many(everyone, UserRole.ADMIN) == {}
+        deleted = adapter.delete_many(UserSelection(role=UserRole.ADMIN))
+        assert set(deleted) == set(everyone.ids)
+        assert adapter.find_by_id(users[1].id) is None
+        assert adapter.delete_many(everyone) == []
+        assert adapter.count() == 0
+
+
+class TestUserEntityCache:
+    """Testes para o cache de entidades User e o decorator do port."""
+
+    def _user(self, email="test@example.com"):
+        return User(name="Test", email=email, password_hash="hash")
+
+    def test_lru_eviction_and_counters(self):
+        from adapters import UserEntityCache
+
+        cache = UserEntityCache(max_entries=2)
+        users = [self._user(f"user{i}@example.com") for i in range(3)]
+        for user in users:
+            cache.put(user)
+
+        assert cache.get_by_id(users[0].id) == (False, None)
+        assert cache.get_by_id(users[2].id)[1] == users[2]
+        assert cache.stats()["evictions"] == 2
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_returns_copies(self):
+        from adapters import UserEntityCache
+
+        cache = UserEntityCache()
+        user = self._user()
+        cache.put(user)
+
+        _, cached = cache.get_by_id(user.id)
+        cached.name = "Mutated"
+        assert cache.get_by_id(user.id)[1].name == "Test"
+
+    def test_negative_entries_and_expiry(self):
+        from adapters import UserEntityCache
+
+        cache = UserEntityCache(ttl_seconds=0, negative_ttl_seconds=60)
+        missing_id = uuid4()
+        cache.put_missing_id(missing_id)
+        cache.put_missing_email("ghost@example.com")
+        assert cache.get_by_id(missing_id) == (True, None)
+        assert cache.get_by_email("ghost@example.com") == (True, None)
+        cache.set_password_hash(missing_id, "rehashed")
+        assert cache.get_by_id(missing_id) == (True, None)
+
+        user = self._user()
+        cache.put(user)  # TTL zero: expira imediatamente
+        assert cache.get_by_id(user.id) == (False, None)
+
+    def test_stale_email_index_is_a_miss(self):
+        from adapters import UserEntityCache
+
+        cache = UserEntityCache()
+        user = self._user("old@example.com")
+        cache.put(user)
+        user.email = "new@example.com"
+        cache.put(user)
+
+        assert cache.get_by_email("old@example.com") == (False, None)
+        assert cache.get_by_email("new@example.com")[1].id == user.id
+
+    def test_decorator_batch_get_loads_only_misses(self, db_session, sql_statements):
+        from adapters import CachedUserPersistenceAdapter, UserEntityCache
+
+        cache = UserEntityCache()
+        adapter = CachedUserPersistenceAdapter(PostgreSQLUserAdapter(db_session), cache)
+        cached, cold = (adapter.save(self._user(f"u{i}@example.com")) for i in range(2))
+        cache.clear()
+        cache.put(cached)
+        ghost = uuid4()
+        sql_statements.clear()
+
+        users = adapter.find_by_ids([cached.id, cold.id, ghost])
+
+        assert {user.id for user in users} == {cached.id, cold.id}
+        assert len(sql_statements) == 1
+        assert adapter.find_by_ids([cached.id, cold.id, ghost]) == users
+        assert len(sql_statements) == 1
+        assert adapter.find_by_ids([]) == []
+        assert PostgreSQLUserAdapter(db_session).find_by_ids([]) == []
+
+    def test_decorator_serves_repeated_lookups_from_cache(
+        self, db_session, sql_statements
+    ):
+        from adapters import CachedUserPersistenceAdapter, UserEntityCache
+        from domain import CountStrategy
+
+        cache = UserEntityCache()
+        adapter = CachedUserPersistenceAdapter(PostgreSQLUserAdapter(db_session), cache)
+        user = adapter.save(self._user())
+        cache.clear()
+        sql_statements.clear()
+
+        assert adapter.find_by_email("test@example.com").id == user.id
+        assert adapter.find_by_id(user.id).email == "test@example.com"
+        assert adapter.find_by_email("test@example.com").id == user.id
+        assert adapter.find_by_email("ghost@example.com") is None
+        assert adapter.find_by_email("ghost@example.com") is None
+        # Apenas as buscas frias (email existente e email ausente) vão ao banco
+        assert len(sql_statements) == 2
+        cache.invalidate(user.id)
+        assert adapter.find_by_id(user.id).id == user.id
+
+        assert adapter.update(user.id, name="Renamed").name == "Renamed"
+        assert adapter.find_by_id(user.id).name == "Renamed"
+        assert adapter.update(uuid4(), name="Ghost") is None
+
+        assert len(adapter.find_all()) == 1
+        assert len(adapter.find_after()) == 1
+        assert len(adapter.find_all_views()) == 1
+        assert len(adapter.find_views_after()) == 1
+        assert adapter.count(CountStrategy.EXACT) == 1
+        assert [m.user.id for m in adapter.search("renamed")] == [user.id]
+        # O nome vai nas claims do token: renomear revoga os tokens
+        assert adapter.get_token_version(user.id) == 1
+        # O cadastro e a alteração do nome
+        assert adapter.get_change_version() == 2
+        adapter.release_connection()
+        adapter.update_password_hash(user.id, "rehashed")
+        sql_statements.clear()
+        # O rehash atualiza a entrada em cache e não muda a versão das listagens
+        assert adapter.find_by_id(user.id).password_hash == "rehashed"
+        assert not sql_statements
+        assert adapter.get_change_version() == 2
+
+        assert adapter.delete(user.id) is True
+        assert adapter.find_by_id(user.id) is None
+        assert adapter.find_by_id(user.id) is None
+        assert cache.stats()["hits"] == 6
+
+
+class TestChangeVersions:
+    """Testes para o contador de alterações usado nos ETags das listagens."""
+
+    def test_version_is_the_sum_of_the_shards(self, db_session, monkeypatch):
+        from types import SimpleNamespace
+
+        from adapters import ChangeVersionModel
+        from adapters.database import change_versions
+
+        shards = iter([0, 3, 3, 7])
+        monkeypatch.setattr(
+            change_versions, "random", SimpleNamespace(randrange=lambda _: next(shards))
+        )
+        assert change_versions.get_version(db_session) == 0
+        for _ in range(4):
+            change_versions.bump_version(db_session)
+        db_session.commit()
+
+        assert change_versions.get_version(db_session) == 4
+        rows = db_session.query(ChangeVersionModel.shard, ChangeVersionModel.version)
+        assert sorted(rows) == [(0, 1), (3, 2), (7, 1)]
+
+
+class TestPasswordHashingPool:
+    """Testes para o pool dedicado de hashing de senhas."""
+
+    def test_hash_and_verify_in_thread_pool(self):
+        from application import PasswordHasher, PasswordHashingPool
+
+        pool = PasswordHashingPool(workers=1, use_processes=False)
+        hasher = PasswordHasher(bcrypt_rounds=4, pool=pool)
+        try:
+            hashed = hasher.hash("password123")
+            assert hasher.verify_and_update("password123", hashed) == (True, None)
+            assert hasher.verify_and_update("wrongpassword", hashed) == (False, None)
+        finally:
+            pool.shutdown()
+
+    def test_fails_fast_when_saturated(self):
+        import threading
+        import time
+
+        from application import PasswordHasher, PasswordHashingPool
+        from domain import PasswordHashingUnavailableException
+
+        pool = PasswordHashingPool(workers=1, max_pending=0, use_processes=False)
+        hasher = PasswordHasher(bcrypt_rounds=4, pool=pool)
+        busy = threading.Thread(target=pool.run, args=(time.sleep, 0.3))
+        busy.start()
+        time.sleep(0.05)
+        try:
+            with pytest.raises(PasswordHashingUnavailableException):
+                hasher.hash("password123")
+        finally:
+            busy.join()
+            pool.shutdown()
+        # Com o slot liberado o pool volta a aceitar trabalho
+        assert hasher.verify_and_update("password123", hasher.hash("password123"))[0]
+        pool.shutdown()
+
+    def test_releases_slot_when_submit_fails(self):
+        from application import PasswordHasher, PasswordHashingPool
+
+        pool = PasswordHashingPool(workers=1, max_pending=0, use_processes=False)
+        hasher = PasswordHasher(bcrypt_rounds=4, pool=pool)
+        pool.shutdown()
+        pool._get_executor().shutdown()
+        with pytest.raises(RuntimeError):
+            hasher.hash("password123")
+        pool.shutdown()
+        assert hasher.verify_and_update("password123", hasher.hash("password123"))[0]
+        pool.shutdown()
+
+
+class TestPasswordHasher:
+    """Testes para o hasher compartilhado e o rehash de hashes antigos."""
+
+    def test_outdated_cost_is_rehashed(self):
+        from application import PasswordHasher
+
+        old_hash = PasswordHasher(bcrypt_rounds=4).hash("password123")
+        valid, new_hash = PasswordHasher(bcrypt_rounds=5).verify_and_update(
+            "password123", old_hash
+        )
+
+        assert valid
+        assert new_hash is not None and new_hash.startswith("$2b$05$")
+
+    def test_deprecated_scheme_is_accepted_and_migrated(self):
+        from application import PasswordHasher
+
+        old_hash = PasswordHasher(schemes=["pbkdf2_sha256"]).hash("password123")
+        hasher = PasswordHasher(schemes=["bcrypt", "pbkdf2_sha256"], bcrypt_rounds=4)
+
+        valid, new_hash = hasher.verify_and_update("password123", old_hash)
+        assert valid
+        assert new_hash is not None and new_hash.startswith("$2b$04$")
+        assert hasher.verify_and_update("wrongpassword", old_hash) == (False, None)
+
+    def test_authenticate_persists_rehash(self, db_session):
+        from application import PasswordHasher
+
+        adapter = PostgreSQLUserAdapter(db_session)
+        AuthService(adapter, hasher=PasswordHasher(bcrypt_rounds=4)).register_user(
+            name="Test User", email="test@example.com", password="password123"
+        )
+        service = AuthService(adapter, hasher=PasswordHasher(bcrypt_rounds=5))
+
+        user = service.authenticate("test@example.com", "password123")
+
+        assert user.password_hash.startswith("$2b$05$")
+        stored = adapter.find_by_email("test@example.com")
+        assert stored is not None and stored.password_hash == user.password_hash
+
+    def test_hash_many_splits_batch_across_workers(self):
+        from application import PasswordHasher, PasswordHashingPool
+
+        passwords = [f"password{i}" for i in range(5)]
+        pool = PasswordHashingPool(workers=2, max_pending=0, use_processes=False)
+        try:
+            for hasher in (
+                PasswordHasher(bcrypt_rounds=4, pool=pool),
+                PasswordHasher(bcrypt_rounds=4),
+            ):
+                hashes = hasher.hash_many(passwords)
+                assert len(hashes) == 5
+                for password, hashed in zip(passwords, hashes):
+                    assert hasher.verify_and_update(password, hashed) == (True, None)
+            # Lote vazio não ocupa o pool
+            assert PasswordHasher(bcrypt_rounds=4, pool=pool).hash_many([]) == []
+        finally:
+            pool.shutdown()
+
+    def test_calibrate_bcrypt_rounds(self):
+        from application import calibrate_bcrypt_rounds
+
+        rounds, measurements = calibrate_bcrypt_rounds(0)
+        assert rounds == 4
+        assert [cost for cost, _ in measurements] == [4]
+
+        rounds, measurements = calibrate_bcrypt_rounds(60, max_rounds=5)
+        assert rounds == 5
+        assert [cost for cost, _ in measurements] == [4, 5]
+
+
+class TestVerifiedTokenCache:
+    """Testes para o cache de tokens JWT verificados."""
+
+    def test_hit_until_token_expiry(self):
+        import time
+
+        from application.services.token_cache import VerifiedTokenCache
+
+        cache = VerifiedTokenCache()
+        cache.put("valid", {"sub": "1", "exp": time.time() + 60})
+        cache.put("expired", {"sub": "2", "exp": time.time() - 1})
+        cache.put("no-exp", {"sub": "3"})
+
+        assert cache.get("valid")["sub"] == "1"
+        assert cache.get("expired") is None
+        assert cache.get("no-exp") is None
+        assert cache.stats()["entries"] == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 2
+
+    def test_lru_eviction(self):
+        import time
+
+        from application.services.token_cache import VerifiedTokenCache
+
+        cache = VerifiedTokenCache(max_entries=1)
+        cache.put("first", {"exp": time.time() + 60})
+        cache.put("second", {"exp": time.time() + 60})
+
+        assert cache.get("first") is None
+        assert cache.get("second") is not None
+        assert cache.stats()["evictions"] == 1
+
+        cache.clear()
+        assert cache.stats()["entries"] == 0
+
+    def test_auth_service_decodes_each_token_once(self, db_session, monkeypatch):
+        from application.services import auth_service
+        from application.services.token_cache import VerifiedTokenCache
+
+        service = AuthService(
+            PostgreSQLUserAdapter(db_session), token_cache=VerifiedTokenCache()
+        )
+        user_id = uuid4()
+        token = service.create_access_token(user_id)
+
+        decode_calls = []
+        original_decode = auth_service.jwt.decode
+
+        def counting_decode(*args, **kwargs):
+            decode_calls.append(args[0])
+            return original_decode(*args, **kwargs)
+
+        monkeypatch.setattr(auth_service.jwt, "decode", counting_decode)
+        for _ in range(3):
+            assert service.verify_token(token) == user_id
+        assert service.verify_token(token, "refresh") is None
+
+        assert decode_calls == [token]
+
+    def test_auth_service_without_cache(self, db_session):
+        service = AuthService(PostgreSQLUserAdapter(db_session), token_cache=None)
+        user_id = uuid4()
+        assert service.verify_token(service.create_access_token(user_id)) == user_id
+
+
+class TestTokenVersionCache:
+    """Testes para o mapa de versões de token."""
+
+    def test_loads_once_until_expiry(self):
+        from application.services.token_versions import TokenVersionCache
+
+        calls = []
+
+        def loader(user_id):
+            calls.append(user_id)
+            return 3
+
+        cache = TokenVersionCache(ttl_seconds=60)
+        user_id = uuid4()
+        assert cache.get(user_id, loader) == 3
+        assert cache.get(user_id, loader) == 3
+        assert calls == [user_id]
+
+        expired = TokenVersionCache(ttl_seconds=0)
+        expired.get(user_id, loader)
+        expired.get(user_id, loader)
+        assert len(calls) == 3
+
+    def test_evicts_oldest_entry_when_full(self):
+        from application.services.token_versions import TokenVersionCache
+
+        cache = TokenVersionCache(ttl_seconds=60, max_entries=2)
+        first, second, third = uuid4(), uuid4(), uuid4()
+        cache.set(first, 1)
+        cache.set(second, 1)
+        cache.set(third, 1)
+
+        assert cache.get(first, lambda _user_id: None) is None
+        assert cache.get(third, lambda _user_id: None) == 1
+
+    def test_role_change_moves_rollup_and_bumps_version(self, db_session):
+        from domain import UserRole
+
+        adapter = PostgreSQLUserAdapter(db_session)
+        user = adapter.save(
+            User(name="Test", email="test@example.com", password_hash="hash")
+        )
+        # Mesma role: nada muda no rollup nem na versão
+        assert adapter.update(user.id, role=UserRole.USER).token_version == 0
+        updated = adapter.update(user.id, role=UserRole.ADMIN)
+
+        assert updated.role == UserRole.ADMIN
+        assert updated.token_version == 1
+        assert adapter.get_token_version(user.id) == 1
+        assert adapter.get_token_version(uuid4()) is None
+        assert TestSignupRollup()._rollup(db_session) == {
+            (user.created_at.date(), "user"): 0,
+            (user.created_at.date(), "admin"): 1,
+        }
+
+
+class TestSignupRollup:
+    """Testes para o rollup diário de cadastros."""
+
+    def _rollup(self, db_session):
+        from adapters.database.models import UserSignupDailyModel
+
+        return {
+            (row.day, row.role): row.count
+            for row in db_session.query(UserSignupDailyModel).all()
+        }
+
+    def test_save_and_delete_maintain_rollup(self, db_session):
+        adapter = PostgreSQLUserAdapter(db_session)
+        created_at = datetime(2026, 3, 10, 15, 30)
+        users = [
+            adapter.save(
+                User(
+                    name=f"User {i}",
+                    email=f"user{i}@example.com",
+                    password_hash="hash",
+                    created_at=created_at,
+                )
+            )
+            for i in range(2)
+        ]
+        assert self._rollup(db_session) == {(created_at.date(), "user"): 2}
+
+        adapter.delete(users[0].id)
+        assert self._rollup(db_session) == {(created_at.date(), "user"): 1}
+
+    def test_backfill_rebuilds_from_users(self, db_session):
+        from collections import Counter
+
+        from adapters import backfill_signup_daily
+        from adapters.database.signup_rollup import record_signups
+
+        for i, day in enumerate([1, 1, 2]):
+            db_session.add(
+                UserModel(
+                    id=uuid4(),
+                    name=f"User {i}",
+                    email=f"user{i}@example.com",
+                    password_hash="hash",
+                    role="admin" if i == 2 else "user",
+                    created_at=datetime(2026, 3, day, 8, 0),
+                )
+            )
+        db_session.commit()
+        # Deltas nulos não geram escrita
+        record_signups(db_session, Counter({(datetime(2026, 3, 1).date(), "user"): 0}))
+
+        assert backfill_signup_daily(db_session) == 2
+        assert self._rollup(db_session) == {
+            (datetime(2026, 3, 1).date(), "user"): 2,
+            (datetime(2026, 3, 2).date(), "admin"): 1,
+        }
+
+
+class TestManageCommands:
+    """Testes para os comandos administrativos de src/manage.py."""
+
+    def _run(self, monkeypatch, *argv: str) -> None:
+        import manage
+
+        monkeypatch.setattr("sys.argv", ["manage.py", *argv])
+        manage.main()
+
+    def test_backfill_signups(self, db_session, monkeypatch, capsys):
+        from sqlalchemy import delete
+        from sqlalchemy.orm import Session
+
+        from adapters.database.models import UserSignupDailyModel
+
+        adapter = PostgreSQLUserAdapter(db_session)
+        adapter.save(User(name="Test", email="test@example.com"))
+        adapter.save(User(name="Other", email="other@example.com"))
+        db_session.execute(delete(UserSignupDailyModel))
+        db_session.commit()
+        monkeypatch.setattr(
+            "manage.SessionLocal", lambda: Session(bind=db_session.get_bind())
+        )
+
+        self._run(monkeypatch, "backfill-signups")
+
+        assert "reconstruído: 1 linhas" in capsys.readouterr().out
+        assert db_session.query(UserSignupDailyModel).one().count == 2
+
+    def test_calibrate_hasher(self, monkeypatch, capsys):
+        # Alvo abaixo do custo mínimo: mede só rounds=4
+        self._run(monkeypatch, "calibrate-hasher", "--target-ms", "0.001")
+
+        output = capsys.readouterr().out
+        assert "bcrypt rounds= 4" in output
+        assert "PASSWORD_HASH_BCRYPT_ROUNDS=4" in output
+
+
 class TestAuthService:
     """Testes para AuthService."""
 
@@ -216,6 +914,128 @@ class TestAuthService:
         assert result is None
 
 
+class TestUserExport:
+    """Testes para a leitura de usuários em lotes."""
+
+    def test_stream_all_in_batches(self, db_session):
+        from adapters import CachedUserPersistenceAdapter, UserEntityCache
+
+        adapter = PostgreSQLUserAdapter(db_session)
+        for i in range(5):
+            adapter.save(User(name=f"User {i}", email=f"user{i}@example.com"))
+        service = UserService(CachedUserPersistenceAdapter(adapter, UserEntityCache()))
+
+        chunks = list(service.export_users(batch_size=2))
+
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        assert [user.email for chunk in chunks for user in chunk] == [
+            f"user{i}@example.com" for i in range(5)
+        ]
+
+    async def test_duplex_response_reports_disconnect(self):
+        from starlette.requests import ClientDisconnect
+
+        from api.responses import DuplexStreamingResponse
+
+        async def send(_message):
+            raise OSError("connection reset")
+
+        response = DuplexStreamingResponse(iter(["line\n"]))
+        with pytest.raises(ClientDisconnect):
+            await response({"type": "http"}, None, send)
+
+    def test_csv_export_of_empty_table_has_header(self):
+        from api.bulk_routes import _export_csv
+
+        assert list(_export_csv(iter([]))) == [
+            "id,name,email,role,birth_date,created_at,updated_at\r\n"
+        ]
+
+
+class TestUserImportService:
+    """Testes para a importação de usuários em lote."""
+
+    def _row(self, line, email, **kwargs):
+        from domain import ImportRow
+
+        return ImportRow(
+            line=line, name=email, email=email, password="password123", **kwargs
+        )
+
+    def _service(self, adapter):
+        from application import PasswordHasher, UserImportService
+
+        return UserImportService(adapter, hasher=PasswordHasher(bcrypt_rounds=4))
+
+    def test_import_batch(self, db_session, sql_statements):
+        from domain import ImportStatus, UserRole
+
+        adapter = PostgreSQLUserAdapter(db_session)
+        service = self._service(adapter)
+        service.import_batch([self._row(1, "old@example.com")])
+        sql_statements.clear()
+
+        results = service.import_batch(
+            [
+                self._row(2, "new@example.com", role=UserRole.ADMIN),
+                self._row(3, "old@example.com"),
+                self._row(4, "new@example.com"),
+            ]
+        )
+
+        assert [r.status for r in results] == [
+            ImportStatus.CREATED,
+            ImportStatus.EXISTS,
+            ImportStatus.DUPLICATE,
+        ]
+        assert [r.line for r in results] == [2, 3, 4]
+        created = adapter.find_by_id(results[0].id)
+        assert created is not None and created.role == UserRole.ADMIN
+        # Um SELECT dos emails, o INSERT multi-linha e o upsert do rollup
+        assert [s.split()[0] for s in sql_statements[:3]] == [
+            "SELECT",
+            "INSERT",
+            "INSERT",
+        ]
+        assert service.import_batch([]) == []
+
+    def test_email_registered_concurrently_is_reported_as_existing(
+        self, db_session, monkeypatch
+    ):
+        from domain import ImportStatus
+
+        adapter = PostgreSQLUserAdapter(db_session)
+        service = self._service(adapter)
+        service.import_batch([self._row(1, "john@example.com")])
+        # Simula outro cadastro entre o SELECT dos emails e o INSERT
+        monkeypatch.setattr(adapter, "find_existing_emails", lambda emails: set())
+
+        results = service.import_batch(
+            [self._row(1, "john@example.com"), self._row(2, "jane@example.com")]
+        )
+
+        assert [r.status for r in results] == [
+            ImportStatus.EXISTS,
+            ImportStatus.CREATED,
+        ]
+        assert adapter.count() == 2
+
+    def test_cached_adapter_forgets_missing_emails(self, db_session):
+        from adapters import CachedUserPersistenceAdapter, UserEntityCache
+
+        adapter = CachedUserPersistenceAdapter(
+            PostgreSQLUserAdapter(db_session), UserEntityCache()
+        )
+        assert adapter.find_by_email("john@example.com") is None
+
+        self._service(adapter).import_batch([self._row(1, "john@example.com")])
+
+        assert adapter.find_existing_emails(["john@example.com"]) == {
+            "john@example.com"
+        }
+        assert adapter.find_by_email("john@example.com") is not None
+
+
 class TestUserEntity:
     """Testes para a entidade User."""
 
@@ -238,6 +1058,16 @@ class TestUserEntity:
         assert admin.is_admin() is True
         assert user.is_admin() is False
 
+    def test_user_update_fields(self):
+        from domain import UserRole
+
+        user = User(name="Test User", email="test@example.com")
+
+        user.update(name="Renamed", email="new@example.com", role=UserRole.ADMIN)
+
+        assert (user.name, user.email) == ("Renamed", "new@example.com")
+        assert user.is_admin()
+
     def test_user_update_with_birth_date(self):
         from datetime import date
 
@@ -254,3 +1084,402 @@ class TestUserEntity:
 
         assert user.birth_date == new_birth_date
         assert user.updated_at is not None
+
+    def test_user_is_slotted(self, db_session):
+        from dataclasses import replace
+
+        user = PostgreSQLUserAdapter(db_session).save(
+            User(name="Test User", email="test@example.com")
+        )
+        loaded = PostgreSQLUserAdapter(db_session).find_by_id(user.id)
+
+        assert not hasattr(loaded, "__dict__")
+        assert loaded == user and replace(loaded) == user
+        with pytest.raises(AttributeError):
+            loaded.nickname = "Tester"
+
+
+class TestAsyncStack:
+    """Testes para o adapter e os serviços assíncronos (aiosqlite)."""
+
+    def test_async_url_switches_postgres_driver(self):
+        from adapters.database.config import _async_url
+
+        assert _async_url("postgresql://u:p@db:5432/users") == (
+            "postgresql+asyncpg://u:p@db:5432/users"
+        )
+        assert _async_url("sqlite:///app.db") == "sqlite:///app.db"
+
+    async def test_adapter_update_and_delete_missing_user(self, async_session_factory):
+        from adapters import AsyncPostgreSQLUserAdapter
+        from domain import UserRole
+
+        async with async_session_factory() as db:
+            adapter = AsyncPostgreSQLUserAdapter(db)
+            assert await adapter.update(uuid4(), name="Ghost") is None
+            assert await adapter.update(uuid4(), role=UserRole.ADMIN) is None
+            assert await adapter.delete(uuid4()) is False
+            assert await adapter.get_token_version(uuid4()) is None
+
+    async def test_adapter_unique_violations(self, async_session_factory):
+        from sqlalchemy.exc import IntegrityError
+
+        from adapters import AsyncPostgreSQLUserAdapter
+        from domain import UserAlreadyExistsException
+
+        async with async_session_factory() as db:
+            adapter = AsyncPostgreSQLUserAdapter(db)
+            user = await adapter.save(User(name="Test", email="test@example.com"))
+            other = await adapter.save(User(name="Other", email="other@example.com"))
+
+            with pytest.raises(UserAlreadyExistsException):
+                await adapter.save(User(name="Again", email="test@example.com"))
+            with pytest.raises(UserAlreadyExistsException):
+                await adapter.update(other.id, email="test@example.com")
+            with pytest.raises(IntegrityError):
+                await adapter.save(
+                    User(id=user.id, name="Clone", email="clone@example.com")
+                )
+            assert await adapter.count() == 2
+
+    async def test_adapter_lists_users_and_views(self, async_session_factory):
+        from adapters import AsyncPostgreSQLUserAdapter
+        from domain import UserView
+
+        async with async_session_factory() as db:
+            adapter = AsyncPostgreSQLUserAdapter(db)
+            user = await adapter.save(User(name="Test", email="test@example.com"))
+
+            assert [u.id for u in await adapter.find_all()] == [user.id]
+            assert [u.id for u in await adapter.find_after()] == [user.id]
+            assert await adapter.find_all_views() == [UserView.from_user(user)]
+            assert await adapter.find_view_by_id(uuid4()) is None
+
+    async def test_user_service_get_by_email(self, async_session_factory):
+        from adapters import AsyncPostgreSQLUserAdapter
+        from application import AsyncUserService
+
+        async with async_session_factory() as db:
+            adapter = AsyncPostgreSQLUserAdapter(db)
+            user = await adapter.save(User(name="Test", email="test@example.com"))
+            service = AsyncUserService(adapter)
+
+            assert (await service.get_user_by_email("test@example.com")).id == user.id
+            with pytest.raises(UserNotFoundException):
+                await service.get_user_by_email("ghost@example.com")
+
+    async def test_hasher_async_without_pool(self):
+        from application import PasswordHasher
+
+        hasher = PasswordHasher(bcrypt_rounds=4)
+        hashed = await hasher.hash_async("password123")
+        assert await hasher.verify_and_update_async("password123", hashed) == (
+            True,
+            None,
+        )
+
+    async def test_hasher_async_fails_fast_when_saturated(self):
+        import asyncio
+
+        from application import PasswordHasher, PasswordHashingPool
+        from domain import PasswordHashingUnavailableException
+
+        pool = PasswordHashingPool(workers=1, max_pending=0, use_processes=False)
+        hasher = PasswordHasher(bcrypt_rounds=4, pool=pool)
+        busy = asyncio.ensure_future(pool.run_async(time_sleep, 0.2))
+        await asyncio.sleep(0.05)
+        try:
+            with pytest.raises(PasswordHashingUnavailableException):
+                await hasher.hash_async("password123")
+        finally:
+            await busy
+            pool.shutdown()
+
+
+def time_sleep(seconds: float) -> None:
+    import time
+
+    time.sleep(seconds)
+
+
+class TestReadReplicas:
+    """Testes para a escolha e a verificação das réplicas de leitura."""
+
+    def test_settings_accept_one_or_many_read_urls(self):
+        from adapters.database.config import Settings
+
+        many = Settings(database_read_url="sqlite:///a.db, sqlite:///b.db")
+        listed = Settings(database_read_urls=["sqlite:///c.db"])
+
+        assert many.database_read_urls == ["sqlite:///a.db", "sqlite:///b.db"]
+        assert listed.database_read_urls == ["sqlite:///c.db"]
+
+    def test_refresh_in_progress_keeps_previous_result(self, db_session):
+        from sqlalchemy.orm import sessionmaker
+
+        from adapters import ReadReplicas
+
+        factory = sessionmaker(bind=db_session.get_bind())
+        replicas = ReadReplicas(factory, [factory], check_interval=0)
+        replica = replicas.session()
+        assert replica.info["replica"] is True
+        replica.close()
+
+        # Outra thread revalidando: segue com a última verificação, sem esperar
+        with replicas._lock:
+            replica = replicas.session()
+        assert replica is not None
+        replica.close()
+        assert ReadReplicas(factory, []).session() is None
+
+
+class TestPoolMetrics:
+    """Testes para o histograma e a telemetria do pool de conexões."""
+
+    def test_histogram_is_cumulative(self):
+        from adapters.metrics import Histogram
+
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+        assert snapshot["buckets"] == {"0.1": 2, "1": 3, "+Inf": 4}
+        assert snapshot["count"] == 4
+        assert snapshot["sum"] == pytest.approx(3.65)
+
+    def test_pool_events_wait_time_and_timeouts(self, tmp_path):
+        from sqlalchemy import create_engine, exc, text
+
+        from adapters.metrics import InstrumentedQueuePool, instrument_pool
+
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05,
+        )
+        metrics = instrument_pool(engine)
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            assert metrics.snapshot(engine.pool)["checked_out"] == 1
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+
+        snapshot = metrics.snapshot(engine.pool)
+        assert snapshot["checked_out"] == 0
+        assert snapshot["checkouts"] == 1
+        assert snapshot["connections_opened"] == 1
+        assert snapshot["timeouts"] == 1
+        assert snapshot["open"] == 1 and snapshot["idle"] == 1
+        assert snapshot["wait_seconds"]["count"] == 2
+
+        # dispose() recria o pool, que continua alimentando a mesma telemetria
+        engine.dispose()
+        with engine.connect() as conn:
+            conn.invalidate()
+        snapshot = metrics.snapshot(engine.pool)
+        assert snapshot["checkouts"] == 2
+        assert snapshot["invalidations"] == 1
+        assert snapshot["wait_seconds"]["count"] == 3
+
+
+class TestMetricsRegistry:
+    """Testes para o registro de métricas no formato do Prometheus."""
+
+    def test_render_counters_gauges_histograms_and_collectors(self):
+        from adapters.metrics import MetricsRegistry
+
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requisições.", ["path"])
+        in_flight = registry.gauge("in_flight", "Em andamento.")
+        latency = registry.histogram("latency_seconds", "Latência.", buckets=(0.5,))
+        registry.add_collector(lambda: ["custom_metric 7"])
+
+        requests.inc('/a"b\\c\n')
+        requests.inc('/a"b\\c\n', amount=2)
+        in_flight.inc()
+        in_flight.set(value=3)
+        in_flight.dec()
+        latency.observe(0.25)
+        latency.observe(0.75)
+
+        lines = registry.render().splitlines()
+        assert "# TYPE requests_total counter" in lines
+        assert 'requests_total{path="/a\\"b\\\\c\\n"} 3' in lines
+        assert "# TYPE in_flight gauge" in lines
+        assert "in_flight 2" in lines
+        assert 'latency_seconds_bucket{le="0.5"} 1' in lines
+        assert 'latency_seconds_bucket{le="+Inf"} 2' in lines
+        assert "latency_seconds_sum 1.0" in lines
+        assert "latency_seconds_count 2" in lines
+        assert lines[-1] == "custom_metric 7"
+
+    def test_statement_operation_labels(self):
+        from adapters.database.instrumentation import _operation
+
+        assert _operation("SELECT users.id FROM users") == "SELECT"
+        assert _operation("insert\nINTO users") == "INSERT"
+        assert _operation("PRAGMA table_info(users)") == "OTHER"
+        assert _operation("") == "OTHER"
+
+    def test_track_queries_is_scoped(self, db_session):
+        from sqlalchemy import text
+
+        from adapters import track_queries
+
+        with track_queries() as outer:
+            db_session.execute(text("SELECT 1"))
+            with track_queries() as inner:
+                db_session.execute(text("SELECT 1"))
+                db_session.execute(text("SELECT 1"))
+            db_session.execute(text("SELECT 1"))
+        db_session.execute(text("SELECT 1"))
+
+        assert inner.queries == 2
+        assert outer.queries == 2
+        assert outer.seconds > 0
+
+    def test_failed_statement_releases_its_start_time(self, db_session):
+        from sqlalchemy import text
+        from sqlalchemy.exc import OperationalError
+
+        from adapters import track_queries
+
+        with track_queries() as stats:
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    db_session.execute(text("SELECT * FROM missing_table"))
+                db_session.rollback()
+
+        assert stats.queries == 3
+        assert not db_session.connection().info.get("metrics_started")
+
+    def test_listeners_installed_only_when_measurements_are_read(self):
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+
+        from adapters.database import instrumentation
+        from api.main import create_app
+
+        listeners = {
+            "before_cursor_execute": instrumentation._before_cursor_execute,
+            "after_cursor_execute": instrumentation._after_cursor_execute,
+            "handle_error": instrumentation._handle_error,
+        }
+        for identifier, listener in listeners.items():
+            event.remove(Engine, identifier, listener)
+        try:
+            create_app(metrics=False, query_headers=False)
+            assert not event.contains(
+                Engine, "before_cursor_execute", instrumentation._before_cursor_execute
+            )
+        finally:
+            create_app(metrics=True)
+        for identifier, listener in listeners.items():
+            assert event.contains(Engine, identifier, listener)
+
+    def test_password_hasher_reports_timings(self):
+        from application import PasswordHasher
+
+        observed = []
+        hasher = PasswordHasher(
+            bcrypt_rounds=4, observer=lambda op, secs: observed.append((op, secs))
+        )
+        hasher.verify_and_update("password123", hasher.hash("password123"))
+
+        assert [op for op, _ in observed] == ["hash", "verify"]
+        assert all(secs > 0 for _, secs in observed)
+
+
+class TestFastJSONResponse:
+    """Testes para a resposta JSON codificada pelo pydantic-core."""
+
+    def test_matches_json_response(self):
+        from datetime import date
+
+        from fastapi.encoders import jsonable_encoder
+        from fastapi.responses import JSONResponse
+
+        from api.responses import FastJSONResponse
+        from api.schemas import UserListResponse, UserResponse, UserRoleEnum
+
+        user = UserResponse.model_construct(
+            id=uuid4(),
+            name="José",
+            email="jose@example.com",
+            role=UserRoleEnum.ADMIN,
+            birth_date=date(1990, 5, 15),
+            created_at=datetime(2026, 1, 2, 3, 4, 5, 678),
+            updated_at=None,
+        )
+        page = UserListResponse.model_construct(users=[user], total=1, next_cursor=None)
+
+        assert FastJSONResponse(page).body == JSONResponse(jsonable_encoder(page)).body
+        assert FastJSONResponse({"detail": "inválido"}).body == (
+            JSONResponse({"detail": "inválido"}).body
+        )
+
+    def test_user_view_serializes_like_user_response(self):
+        from datetime import date
+
+        from api.responses import FastJSONResponse
+        from api.routes import _user_to_response
+        from domain import UserView
+
+        user = User(
+            name="José",
+            email="jose@example.com",
+            birth_date=date(1990, 5, 15),
+            updated_at=datetime(2026, 1, 2, 3, 4, 5, 678),
+        )
+        view = UserView.from_user(user)
+
+        assert not hasattr(view, "__dict__")
+        assert view.version == user.version
+        assert FastJSONResponse(view).body == (
+            FastJSONResponse(_user_to_response(user)).body
+        )
+
+
+class TestUserViews:
+    """Testes para a leitura por projeção de colunas (UserView)."""
+
+    def test_views_read_only_public_columns(self, db_session, sql_statements):
+        from domain import UserQuery, UserView
+
+        adapter = PostgreSQLUserAdapter(db_session)
+        users = [
+            adapter.save(User(name=f"U{i}", email=f"u{i}@example.com"))
+            for i in range(3)
+        ]
+        sql_statements.clear()
+
+        page = adapter.find_all_views(limit=2, query=UserQuery())
+        rest = adapter.find_views_after(UserCursor.from_user(page[-1]), limit=10)
+        view = adapter.find_view_by_id(users[0].id)
+
+        assert page + rest == [UserView.from_user(user) for user in users]
+        assert view == page[0]
+        assert adapter.find_view_by_id(uuid4()) is None
+        assert adapter.find_views_by_ids([]) == []
+        assert len(sql_statements) == 4
+        assert not any("password_hash" in s for s in sql_statements)
+        assert not db_session.identity_map
+
+    def test_cached_views_come_from_cached_users(self, db_session, sql_statements):
+        from adapters import CachedUserPersistenceAdapter, UserEntityCache
+        from domain import UserView
+
+        adapter = CachedUserPersistenceAdapter(
+            PostgreSQLUserAdapter(db_session), UserEntityCache()
+        )
+        user = adapter.save(User(name="Test", email="test@example.com"))
+        sql_statements.clear()
+
+        assert adapter.find_view_by_id(user.id) == UserView.from_user(user)
+        assert adapter.find_views_by_ids([user.id]) == [UserView.from_user(user)]
+        assert adapter.find_view_by_id(uuid4()) is None
+        assert len(sql_statements) == 1
@@ -22,11 +22,13 @@ export interface UserUpdate {
   name?: string;
   email?: string;
   birth_date?: string | null;
+  role?: UserRole;
 }
 
 export interface UserListResponse {
   users: User[];
   total: number;
+  next_cursor?: string | null;
 }
 
 export interface LoginRequest {